@@ -0,0 +1,23 @@
+"""
+可选原生扩展的构建声明
+
+项目元数据均在 pyproject.toml 中；此文件仅在 macOS 上声明 src/platforms/_macos_fast.c
+扩展。扩展为可选: 编译失败 (如缺少 Xcode 命令行工具) 时跳过，运行时回退到 pyobjc 实现
+"""
+
+import sys
+
+from setuptools import Extension, setup
+
+ext_modules = []
+if sys.platform == "darwin":
+    ext_modules.append(
+        Extension(
+            "src.platforms._macos_fast",
+            sources=["src/platforms/_macos_fast.c"],
+            extra_link_args=["-framework", "ApplicationServices"],
+            optional=True,
+        )
+    )
+
+setup(ext_modules=ext_modules)
@@ -82,6 +82,7 @@ from .core.types import (
     CoordinateType,
     MouseButton,
     Point,
+    RawScreenshot,
     Rect,
     ScreenElement,
     ScreenState,
@@ -89,15 +90,7 @@ from .core.types import (
 )
 from .platforms import get_controller
 
-# 日志和调试
-from .utils.debug import (
-    DebugAgent,
-    DebugViewer,
-    annotate_screenshot,
-    create_debug_agent,
-    quick_screenshot_debug,
-    save_debug_screenshot,
-)
+# 日志 (调试工具见文件末尾的按需导入)
 from .utils.logger import (
     get_action_logger,
     get_logger,
@@ -131,6 +124,7 @@ __all__ = [
     "Point",
     "Size",
     "Rect",
+    "RawScreenshot",
     "MouseButton",
     "Action",
     "ActionType",
@@ -190,3 +184,22 @@ __all__ = [
     "create_debug_agent",
     "quick_screenshot_debug",
 ]
+
+# 调试工具按需导入 (PEP 562)，不使用时不加载 src.utils.debug
+_DEBUG_EXPORTS = frozenset({
+    "DebugViewer",
+    "DebugAgent",
+    "save_debug_screenshot",
+    "annotate_screenshot",
+    "create_debug_agent",
+    "quick_screenshot_debug",
+})
+
+
+def __getattr__(name):
+    if name in _DEBUG_EXPORTS:
+        from .utils import debug
+        value = getattr(debug, name)
+        globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
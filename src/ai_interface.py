@@ -19,6 +19,7 @@ AI Interface - AI模型接口
     agent.run("打开Chrome浏览器并搜索Python")
 """
 
+import base64
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
@@ -147,9 +148,9 @@ class ComputerAgent:
         Returns:
             ScreenState对象，包含截屏和元素信息
         """
-        # 截屏
+        # 截屏 (只截一次，base64 由同一帧编码得到)
         screenshot_bytes = self.controller.screenshot()
-        screenshot_base64 = self.controller.screenshot_base64()
+        screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
 
         # 检测元素
         elements = self.detector.detect(screenshot_bytes)
@@ -166,6 +167,7 @@ class ComputerAgent:
         # 构建状态
         return ScreenState(
             screenshot_base64=screenshot_base64,
+            screenshot_bytes=screenshot_bytes,
             annotated_screenshot_base64=annotated_base64,
             elements=elements,
             label_to_rect=label_map,
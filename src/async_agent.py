@@ -20,6 +20,7 @@ Async AI Agent - 异步 AI 代理
 """
 
 import asyncio
+import base64
 import time
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
@@ -152,7 +153,8 @@ class AsyncComputerAgent:
         """异步捕获屏幕状态"""
         # 在线程中执行截屏 (避免阻塞事件循环)
         screenshot_bytes = await self._run_in_thread(self.controller.screenshot)
-        screenshot_base64 = await self._run_in_thread(self.controller.screenshot_base64)
+        # base64 由同一帧编码得到，无需再截一次屏
+        screenshot_base64 = base64.b64encode(screenshot_bytes).decode('utf-8')
 
         # 检测元素
         elements = await self._run_in_thread(self.detector.detect, screenshot_bytes)
@@ -170,6 +172,7 @@ class AsyncComputerAgent:
 
         return ScreenState(
             screenshot_base64=screenshot_base64,
+            screenshot_bytes=screenshot_bytes,
             annotated_screenshot_base64=annotated_base64,
             elements=elements,
             label_to_rect=label_map,
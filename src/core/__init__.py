@@ -34,6 +34,7 @@ from .types import (
     CoordinateType,
     MouseButton,
     Point,
+    RawScreenshot,
     Rect,
     ScreenElement,
     ScreenState,
@@ -45,6 +46,7 @@ __all__ = [
     "Point",
     "Size",
     "Rect",
+    "RawScreenshot",
     "MouseButton",
     "Action",
     "ActionType",
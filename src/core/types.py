@@ -97,6 +97,8 @@ class Size:
 @dataclass
 class Rect:
     """矩形区域"""
+    __slots__ = ("left", "top", "right", "bottom")
+
     left: int
     top: int
     right: int
@@ -128,6 +130,20 @@ class Rect:
         )
 
 
+@dataclass
+class RawScreenshot:
+    """
+    原始截屏像素 - 跳过 PNG 编码的截屏结果
+
+    适合直接交给 OpenCV / PIL / 模型预处理使用
+    """
+    data: bytes                 # 像素数据 (按行排列，每行 stride 字节)
+    width: int                  # 宽度 (像素)
+    height: int                 # 高度 (像素)
+    stride: int                 # 每行字节数 (可能大于 width * 4)
+    pixel_format: str = "BGRA"  # 像素格式
+
+
 @dataclass
 class ScreenElement:
     """
@@ -235,6 +251,9 @@ class ScreenState:
     # 时间戳
     timestamp: float = 0.0
 
+    # 原始截屏 PNG 字节 (与 screenshot_base64 为同一帧，供本地使用，避免重新解码)
+    screenshot_bytes: Optional[bytes] = field(default=None, repr=False)
+
     def get_element_by_label(self, label: str) -> Optional[ScreenElement]:
         """通过标签获取元素"""
         for elem in self.elements:
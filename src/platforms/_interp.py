@@ -0,0 +1,49 @@
+"""
+鼠标平滑移动的路径插值
+
+安装 numba 时插值循环以 @njit 编译 (cache=True 将编译结果缓存到磁盘，
+后续进程不再重复编译)；未安装时使用纯 Python 实现，两者结果一致。
+"""
+
+from typing import List, Sequence
+
+try:
+    import numba
+    import numpy as np
+except ImportError:
+    numba = None
+
+HAS_NUMBA = numba is not None
+
+
+def _interp_move_py(sx: int, sy: int, ex: int, ey: int, steps: int) -> List[Sequence[int]]:
+    """纯 Python 实现"""
+    dx, dy = ex - sx, ey - sy
+    return [(sx + dx * i // steps, sy + dy * i // steps) for i in range(1, steps + 1)]
+
+
+if HAS_NUMBA:
+    @numba.njit("int32[:, :](int64, int64, int64, int64, int64)", cache=True)
+    def _interp_move_jit(sx, sy, ex, ey, steps):
+        out = np.empty((steps, 2), np.int32)
+        dx = ex - sx
+        dy = ey - sy
+        for i in range(steps):
+            out[i, 0] = sx + dx * (i + 1) // steps
+            out[i, 1] = sy + dy * (i + 1) // steps
+        return out
+
+
+def interp_move(sx: int, sy: int, ex: int, ey: int, steps: int) -> List[Sequence[int]]:
+    """
+    计算从 (sx, sy) 到 (ex, ey) 的 steps 个整数路径点 (不含起点，含终点)
+
+    第 i 个点为 start + delta * i // steps (向下取整)
+
+    Returns:
+        [(x, y), ...] 列表，坐标均为 Python int，可直接传给 ctypes
+    """
+    steps = max(int(steps), 1)
+    if HAS_NUMBA:
+        return _interp_move_jit(sx, sy, ex, ey, steps).tolist()
+    return _interp_move_py(sx, sy, ex, ey, steps)
@@ -6,6 +6,7 @@ Linux平台控制器实现
 - xdotool: 主要控制方式 (X11)
 - python-xlib: 原生 X11 API (可选)
 - pyautogui: 备选方案
+- XShm (MIT-SHM 共享内存) / mss: 截屏 (优先)
 - scrot/gnome-screenshot/grim: 截屏
 
 特性:
@@ -14,15 +15,18 @@ Linux平台控制器实现
 - 内置重试机制
 """
 
+import ctypes
+import ctypes.util
 import logging
 import os
 import platform
 import subprocess
 import tempfile
 import time
-from functools import wraps
+from functools import cached_property, lru_cache, wraps
 from io import BytesIO
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from ..core.base import ComputerController
 from ..core.types import CoordinateType, MouseButton, Point, Rect, Size
@@ -31,6 +35,23 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# 传递给 xdotool / xclip 子进程的环境变量 (其余变量不继承)
+_CHILD_ENV_KEYS = (
+    "DISPLAY",
+    "WAYLAND_DISPLAY",
+    "XAUTHORITY",
+    "XDG_RUNTIME_DIR",
+    "HOME",
+    "PATH",
+    "LANG",
+    "LC_ALL",
+    "LC_CTYPE",
+)
+
+# 只依赖 X 连接的高频命令使用精简环境变量；截屏工具等还需要
+# DBUS_SESSION_BUS_ADDRESS、XDG_CURRENT_DESKTOP 等变量，继承完整环境
+_MINIMAL_ENV_COMMANDS = frozenset({"xdotool", "xclip"})
+
 
 def retry_on_failure(max_attempts: int = 3, delay: float = 0.1) -> Callable:
     """重试装饰器"""
@@ -51,6 +72,330 @@ def retry_on_failure(max_attempts: int = 3, delay: float = 0.1) -> Callable:
     return decorator
 
 
+@lru_cache(maxsize=1)
+def _detect_display_server() -> str:
+    """
+    检测显示服务器类型
+
+    结果在进程内缓存。环境变量缺失时 (例如 su 切换后的会话)
+    回退到检查 X11 / Wayland 的 socket 文件。
+    """
+    env = os.environ
+    xdg_session = env.get("XDG_SESSION_TYPE", "").lower()
+    if xdg_session == "wayland":
+        return "wayland"
+    elif xdg_session == "x11":
+        return "x11"
+
+    # 检查 WAYLAND_DISPLAY
+    if env.get("WAYLAND_DISPLAY"):
+        return "wayland"
+
+    # 检查 DISPLAY
+    if env.get("DISPLAY"):
+        return "x11"
+
+    # 回退: 检查 socket 文件
+    try:
+        if os.path.isdir("/tmp/.X11-unix") and os.listdir("/tmp/.X11-unix"):
+            return "x11"
+    except OSError:
+        pass
+
+    runtime_dir = env.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.exists(os.path.join(runtime_dir, "wayland-0")):
+        return "wayland"
+
+    return "unknown"
+
+
+# ==================== 按键映射 ====================
+
+# 按键名 -> xdotool keysym
+_XDOTOOL_KEY_MAP = MappingProxyType({
+    'enter': 'Return',
+    'return': 'Return',
+    'tab': 'Tab',
+    'space': 'space',
+    'backspace': 'BackSpace',
+    'delete': 'Delete',
+    'escape': 'Escape',
+    'esc': 'Escape',
+    'shift': 'shift',
+    'shiftleft': 'shift',
+    'shiftright': 'shift',
+    'ctrl': 'ctrl',
+    'control': 'ctrl',
+    'ctrlleft': 'ctrl',
+    'ctrlright': 'ctrl',
+    'alt': 'alt',
+    'altleft': 'alt',
+    'altright': 'alt',
+    'win': 'super',
+    'super': 'super',
+    'command': 'super',
+    'cmd': 'super',
+    'left': 'Left',
+    'right': 'Right',
+    'up': 'Up',
+    'down': 'Down',
+    'home': 'Home',
+    'end': 'End',
+    'pageup': 'Page_Up',
+    'pgup': 'Page_Up',
+    'pagedown': 'Page_Down',
+    'pgdn': 'Page_Down',
+    'insert': 'Insert',
+    'f1': 'F1', 'f2': 'F2', 'f3': 'F3', 'f4': 'F4',
+    'f5': 'F5', 'f6': 'F6', 'f7': 'F7', 'f8': 'F8',
+    'f9': 'F9', 'f10': 'F10', 'f11': 'F11', 'f12': 'F12',
+})
+
+
+@lru_cache(maxsize=256)
+def _xdotool_key_name(key: str) -> str:
+    """转换按键名为 xdotool 格式"""
+    return _XDOTOOL_KEY_MAP.get(key.lower(), key)
+
+
+@lru_cache(maxsize=256)
+def _xdotool_key_combo(keys: Tuple[str, ...]) -> str:
+    """转换组合键为 xdotool 格式 (如 ctrl+c)"""
+    return "+".join(_xdotool_key_name(k) for k in keys)
+
+
+# ==================== XShm 截屏 ====================
+
+class _XImage(ctypes.Structure):
+    """XImage 结构体 (只声明用到的前半部分字段)"""
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+# X 错误处理函数是进程全局的，回调对象放在模块级，
+# 保证 Xlib 持有的函数指针在任何截屏器释放后仍然有效
+_x_error_occurred = False
+
+
+def _on_x_error(display, event) -> int:
+    global _x_error_occurred
+    _x_error_occurred = True
+    return 0
+
+
+_X_ERROR_HANDLER = _XErrorHandler(_on_x_error)
+
+
+class _XShmGrabber:
+    """
+    基于 MIT-SHM 扩展的 X11 截屏
+
+    初始化时分配一块覆盖整个根窗口的共享内存并 XShmAttach 一次，
+    之后每次截屏由 X server 直接写入共享内存，不经过 socket 传输
+    """
+
+    _ZPIXMAP = 2
+    _IPC_PRIVATE = 0
+    _IPC_CREAT = 0o1000
+    _IPC_RMID = 0
+    _ALL_PLANES = ctypes.c_ulong(-1).value
+
+    def __init__(self):
+        x11_path = ctypes.util.find_library("X11")
+        xext_path = ctypes.util.find_library("Xext")
+        if not x11_path or not xext_path:
+            raise RuntimeError("未找到 libX11 / libXext")
+
+        x11 = ctypes.CDLL(x11_path)
+        xext = ctypes.CDLL(xext_path)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo),
+            ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+            ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        self._x11 = x11
+        self._xext = xext
+        self._libc = libc
+        self._image = None
+        self._shminfo = _XShmSegmentInfo()
+        self._shminfo.shmid = -1
+        self._display = None
+
+        # 默认的 X 错误处理会直接退出进程，这里改为记录错误，close() 时恢复原处理函数
+        self._prev_error_handler = x11.XSetErrorHandler(
+            ctypes.cast(_X_ERROR_HANDLER, ctypes.c_void_p)
+        )
+        self._handler_installed = True
+
+        self._display = x11.XOpenDisplay(None)
+        if not self._display:
+            self.close()
+            raise RuntimeError("无法连接 X display")
+
+        try:
+            self._setup()
+        except Exception:
+            self.close()
+            raise
+
+    def _setup(self) -> None:
+        global _x_error_occurred
+        x11, xext, libc = self._x11, self._xext, self._libc
+        display = self._display
+
+        if not xext.XShmQueryExtension(display):
+            raise RuntimeError("X server 不支持 MIT-SHM")
+
+        screen = x11.XDefaultScreen(display)
+        self._root = x11.XRootWindow(display, screen)
+        self.width = x11.XDisplayWidth(display, screen)
+        self.height = x11.XDisplayHeight(display, screen)
+
+        image = xext.XShmCreateImage(
+            display,
+            x11.XDefaultVisual(display, screen),
+            x11.XDefaultDepth(display, screen),
+            self._ZPIXMAP,
+            None,
+            ctypes.byref(self._shminfo),
+            self.width,
+            self.height,
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage 失败")
+        self._image = image
+        if image.contents.bits_per_pixel != 32:
+            raise RuntimeError(f"不支持的像素格式: {image.contents.bits_per_pixel} bpp")
+
+        self._size = image.contents.bytes_per_line * image.contents.height
+        shmid = libc.shmget(self._IPC_PRIVATE, self._size, self._IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise OSError(ctypes.get_errno(), "shmget 失败")
+        self._shminfo.shmid = shmid
+
+        addr = libc.shmat(shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "shmat 失败")
+        self._shminfo.shmaddr = addr
+        self._shminfo.readOnly = 0
+        image.contents.data = addr
+
+        _x_error_occurred = False
+        if not xext.XShmAttach(display, ctypes.byref(self._shminfo)):
+            raise RuntimeError("XShmAttach 失败")
+        x11.XSync(display, 0)
+        if _x_error_occurred:
+            raise RuntimeError("XShmAttach 失败")
+
+        # 两端都 attach 后即可标记删除，进程退出时由内核回收
+        libc.shmctl(shmid, self._IPC_RMID, None)
+
+    def grab(self, region: Optional[Rect] = None) -> Tuple[memoryview, int, int, int]:
+        """
+        截取屏幕到共享内存
+
+        Returns:
+            (BGRX 像素的 memoryview, 宽, 高, 每行字节数)
+            memoryview 指向共享内存，下一次 grab 前有效
+        """
+        global _x_error_occurred
+        image = self._image.contents
+        if region:
+            left, top, width, height = region.left, region.top, region.width, region.height
+            if (
+                left < 0 or top < 0 or width <= 0 or height <= 0
+                or left + width > self.width or top + height > self.height
+            ):
+                raise ValueError(f"截屏区域超出屏幕范围: {region}")
+        else:
+            left, top, width, height = 0, 0, self.width, self.height
+
+        stride = width * 4
+        image.width, image.height, image.bytes_per_line = width, height, stride
+        _x_error_occurred = False
+        ok = self._xext.XShmGetImage(
+            self._display, self._root, self._image, left, top, self._ALL_PLANES
+        )
+        if not ok or _x_error_occurred:
+            raise RuntimeError("XShmGetImage 失败")
+
+        buffer = (ctypes.c_char * (stride * height)).from_address(self._shminfo.shmaddr)
+        return memoryview(buffer).cast("B"), width, height, stride
+
+    def close(self) -> None:
+        """释放共享内存和 X 连接"""
+        if self._display:
+            if self._shminfo.shmaddr:
+                self._xext.XShmDetach(self._display, ctypes.byref(self._shminfo))
+                self._x11.XSync(self._display, 0)
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+        if self._shminfo.shmaddr:
+            self._libc.shmdt(self._shminfo.shmaddr)
+            self._shminfo.shmaddr = None
+        if self._shminfo.shmid >= 0:
+            self._libc.shmctl(self._shminfo.shmid, self._IPC_RMID, None)
+            self._shminfo.shmid = -1
+        if self._handler_installed:
+            self._x11.XSetErrorHandler(self._prev_error_handler)
+            self._handler_installed = False
+
+
 class LinuxController(ComputerController):
     """
     Linux控制器
@@ -64,6 +409,12 @@ class LinuxController(ComputerController):
     - 内置重试机制
     """
 
+    # 剪贴板读取缓存有效期 (秒)，无法监听剪贴板变化时使用
+    CLIPBOARD_CACHE_TTL = 0.05
+
+    # 记录的鼠标位置有效期 (秒)，超时后重新查询真实位置
+    MOUSE_POSITION_MAX_AGE = 1.0
+
     def __init__(self, retry_attempts: int = 3):
         """
         初始化 Linux 控制器
@@ -78,51 +429,32 @@ class LinuxController(ComputerController):
 
         self._retry_attempts = retry_attempts
 
+        # 子进程使用的精简环境变量
+        self._minimal_env = {k: os.environ[k] for k in _CHILD_ENV_KEYS if k in os.environ}
+
         # 检测显示服务器类型
-        self._display_server = self._detect_display_server()
+        self._display_server = _detect_display_server()
         logger.info(f"检测到显示服务器: {self._display_server}")
 
         # 检查可用工具
         self._has_xdotool = self._check_command("xdotool")
         self._has_xclip = self._check_command("xclip")
 
+        # 最近一次移动到的鼠标位置
+        self._last_mouse_pos: Optional[Point] = None
+        self._last_mouse_time = 0.0
+
+        # 剪贴板缓存
+        self._clipboard_cache: Optional[str] = None
+        self._clipboard_cache_time = 0.0
+        self._clipboard_watcher: Any = None
+
         # 检测截屏工具 (按优先级)
         self._screenshot_tools = self._detect_screenshot_tools()
         logger.info(f"可用截屏工具: {self._screenshot_tools}")
 
-        # 尝试导入 python-xlib
-        self._has_xlib = False
-        try:
-            from Xlib import X, display
-            self._xlib_display = display
-            self._xlib_X = X
-            self._has_xlib = True
-            logger.info("python-xlib 已加载")
-        except ImportError:
-            logger.debug("python-xlib 未安装")
-
-        # 导入pyautogui作为备选
-        self._has_pyautogui = False
-        try:
-            import pyautogui
-            self._pyautogui = pyautogui
-            self._pyautogui.FAILSAFE = False
-            self._has_pyautogui = True
-            logger.debug("pyautogui 已加载")
-        except ImportError:
-            pass
-
-        # 导入 mss 用于高性能截屏
-        self._has_mss = False
-        try:
-            import mss
-            self._mss = mss
-            self._has_mss = True
-            logger.debug("mss 已加载")
-        except ImportError:
-            pass
-
-        # 验证必要工具
+        # python-xlib / pyautogui / mss 均为备选依赖，在首次使用时才导入
+        # 验证必要工具 (xdotool 可用时不会触发备选依赖的导入)
         if not self._has_xdotool and not self._has_pyautogui and not self._has_xlib:
             raise RuntimeError(
                 "需要至少安装以下工具之一: xdotool, pyautogui, python-xlib\n"
@@ -138,23 +470,64 @@ class LinuxController(ComputerController):
         self._screen_size = self.get_screen_size()
         logger.info(f"Linux 控制器初始化完成，屏幕尺寸: {self._screen_size}")
 
-    def _detect_display_server(self) -> str:
-        """检测显示服务器类型"""
-        xdg_session = os.environ.get("XDG_SESSION_TYPE", "").lower()
-        if xdg_session == "wayland":
-            return "wayland"
-        elif xdg_session == "x11":
-            return "x11"
+    # ==================== 可选依赖 (延迟导入) ====================
 
-        # 检查 WAYLAND_DISPLAY
-        if os.environ.get("WAYLAND_DISPLAY"):
-            return "wayland"
+    @cached_property
+    def _xlib_display(self) -> Any:
+        """python-xlib 的 display 模块，未安装时为 None"""
+        try:
+            from Xlib import display
+            logger.info("python-xlib 已加载")
+            return display
+        except ImportError:
+            logger.debug("python-xlib 未安装")
+            return None
 
-        # 检查 DISPLAY
-        if os.environ.get("DISPLAY"):
-            return "x11"
+    @cached_property
+    def _pyautogui(self) -> Any:
+        """pyautogui 模块，未安装时为 None"""
+        try:
+            import pyautogui
+            pyautogui.FAILSAFE = False
+            logger.debug("pyautogui 已加载")
+            return pyautogui
+        except ImportError:
+            return None
 
-        return "unknown"
+    @cached_property
+    def _mss(self) -> Any:
+        """mss 模块，未安装时为 None"""
+        try:
+            import mss
+            logger.debug("mss 已加载")
+            return mss
+        except ImportError:
+            return None
+
+    @cached_property
+    def _xshm(self) -> Optional[_XShmGrabber]:
+        """XShm 截屏器，仅 X11 下可用，不可用时为 None"""
+        if self._display_server != "x11":
+            return None
+        try:
+            grabber = _XShmGrabber()
+            logger.debug("XShm 截屏已启用")
+            return grabber
+        except Exception as e:
+            logger.debug(f"XShm 截屏不可用: {e}")
+            return None
+
+    @property
+    def _has_xlib(self) -> bool:
+        return self._xlib_display is not None
+
+    @property
+    def _has_pyautogui(self) -> bool:
+        return self._pyautogui is not None
+
+    @property
+    def _has_mss(self) -> bool:
+        return self._mss is not None
 
     def _check_command(self, cmd: str) -> bool:
         """检查命令是否可用"""
@@ -194,12 +567,23 @@ class LinuxController(ComputerController):
         return tools
 
     def _run_command(self, cmd: List[str], timeout: int = 10) -> subprocess.CompletedProcess:
-        """运行命令并返回结果"""
+        """
+        运行命令并返回结果
+
+        调用的都是短生命周期的工具，不需要关闭继承的 fd (close_fds=False)，
+        也不需要 stdin；xdotool / xclip 只传递精简的环境变量以减少子进程启动开销，
+        其余命令继承当前完整环境
+        """
+        env = self._minimal_env if cmd[0] in _MINIMAL_ENV_COMMANDS else None
         return subprocess.run(
             cmd,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
             text=True,
-            timeout=timeout
+            timeout=timeout,
+            check=False,
+            close_fds=False,
+            env=env,
         )
 
     def _run_xdotool(self, *args, timeout: int = 5) -> str:
@@ -293,7 +677,23 @@ class LinuxController(ComputerController):
 
         自动选择最佳截屏工具
         """
-        # 方法1: mss (最快，跨平台)
+        # 方法0: XShm (X11 下最快，像素通过共享内存传输)
+        if self._xshm is not None:
+            try:
+                from PIL import Image
+                data, width, height, stride = self._xshm.grab(region)
+                pil_img = Image.frombuffer("RGB", (width, height), data, "raw", "BGRX", stride, 1)
+                buffer = BytesIO()
+                pil_img.save(buffer, format='PNG')
+                return buffer.getvalue()
+            except ValueError as e:
+                logger.debug(f"XShm 截屏跳过: {e}")
+            except Exception as e:
+                logger.debug(f"XShm 截屏失败，停用: {e}")
+                self._xshm.close()
+                self._xshm = None
+
+        # 方法1: mss (跨平台)
         if self._has_mss:
             try:
                 from PIL import Image
@@ -331,18 +731,12 @@ class LinuxController(ComputerController):
                             cmd = ["scrot", "-a", f"{region.left},{region.top},{region.width},{region.height}", tmp_path]
                         else:
                             cmd = ["scrot", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
 
                     elif tool == "maim":
                         if region:
                             cmd = ["maim", "-g", f"{region.width}x{region.height}+{region.left}+{region.top}", tmp_path]
                         else:
                             cmd = ["maim", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
 
                     elif tool == "import":
                         if region:
@@ -350,31 +744,29 @@ class LinuxController(ComputerController):
                             cmd = ["import", "-window", "root", "-crop", geometry, tmp_path]
                         else:
                             cmd = ["import", "-window", "root", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
 
                     elif tool == "gnome-screenshot":
                         # gnome-screenshot 不太支持精确区域
                         cmd = ["gnome-screenshot", "-f", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
 
                     elif tool == "grim":  # Wayland
                         if region:
                             cmd = ["grim", "-g", f"{region.left},{region.top} {region.width}x{region.height}", tmp_path]
                         else:
                             cmd = ["grim", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
 
                     elif tool == "spectacle":
                         cmd = ["spectacle", "-b", "-n", "-o", tmp_path]
-                        self._run_command(cmd)
-                        screenshot_taken = True
-                        break
+
+                    else:
+                        continue
+
+                    result = self._run_command(cmd)
+                    if result.returncode != 0:
+                        logger.debug(f"{tool} 截屏失败 (返回码 {result.returncode}): {result.stderr.strip()}")
+                        continue
+                    screenshot_taken = True
+                    break
 
                 except Exception as e:
                     logger.debug(f"{tool} 截屏失败: {e}")
@@ -404,12 +796,25 @@ class LinuxController(ComputerController):
 
     # ==================== 鼠标控制 ====================
 
+    def _mouse_start_position(self) -> Point:
+        """
+        获取平滑移动的起点
+
+        优先使用最近一次移动到的位置，避免额外的 xdotool 调用
+        """
+        if (
+            self._last_mouse_pos is not None
+            and time.monotonic() - self._last_mouse_time < self.MOUSE_POSITION_MAX_AGE
+        ):
+            return self._last_mouse_pos
+        return self.get_mouse_position()
+
     @retry_on_failure(max_attempts=3)
     def mouse_move(self, x: int, y: int, duration: float = 0.0) -> None:
         """移动鼠标"""
         if duration > 0:
             # 平滑移动
-            start = self.get_mouse_position()
+            start = self._mouse_start_position()
             steps = max(int(duration * 60), 1)
 
             for i in range(1, steps + 1):
@@ -429,6 +834,9 @@ class LinuxController(ComputerController):
             elif self._has_pyautogui:
                 self._pyautogui.moveTo(x, y, _pause=False)
 
+        self._last_mouse_pos = Point(x, y, CoordinateType.ABSOLUTE)
+        self._last_mouse_time = time.monotonic()
+
     @retry_on_failure(max_attempts=3)
     def mouse_click(
         self,
@@ -530,48 +938,6 @@ class LinuxController(ComputerController):
 
     # ==================== 键盘控制 ====================
 
-    def _xdotool_key_name(self, key: str) -> str:
-        """转换按键名为 xdotool 格式"""
-        key_map = {
-            'enter': 'Return',
-            'return': 'Return',
-            'tab': 'Tab',
-            'space': 'space',
-            'backspace': 'BackSpace',
-            'delete': 'Delete',
-            'escape': 'Escape',
-            'esc': 'Escape',
-            'shift': 'shift',
-            'shiftleft': 'shift',
-            'shiftright': 'shift',
-            'ctrl': 'ctrl',
-            'control': 'ctrl',
-            'ctrlleft': 'ctrl',
-            'ctrlright': 'ctrl',
-            'alt': 'alt',
-            'altleft': 'alt',
-            'altright': 'alt',
-            'win': 'super',
-            'super': 'super',
-            'command': 'super',
-            'cmd': 'super',
-            'left': 'Left',
-            'right': 'Right',
-            'up': 'Up',
-            'down': 'Down',
-            'home': 'Home',
-            'end': 'End',
-            'pageup': 'Page_Up',
-            'pgup': 'Page_Up',
-            'pagedown': 'Page_Down',
-            'pgdn': 'Page_Down',
-            'insert': 'Insert',
-            'f1': 'F1', 'f2': 'F2', 'f3': 'F3', 'f4': 'F4',
-            'f5': 'F5', 'f6': 'F6', 'f7': 'F7', 'f8': 'F8',
-            'f9': 'F9', 'f10': 'F10', 'f11': 'F11', 'f12': 'F12',
-        }
-        return key_map.get(key.lower(), key)
-
     @retry_on_failure(max_attempts=3)
     def type_text(self, text: str, interval: float = 0.0) -> None:
         """输入文本"""
@@ -587,7 +953,7 @@ class LinuxController(ComputerController):
     def key_press(self, key: str) -> None:
         """按键"""
         if self._has_xdotool:
-            xkey = self._xdotool_key_name(key)
+            xkey = _xdotool_key_name(key)
             self._run_xdotool("key", xkey)
         elif self._has_pyautogui:
             self._pyautogui.press(key)
@@ -596,7 +962,7 @@ class LinuxController(ComputerController):
     def key_down(self, key: str) -> None:
         """按下按键"""
         if self._has_xdotool:
-            xkey = self._xdotool_key_name(key)
+            xkey = _xdotool_key_name(key)
             self._run_xdotool("keydown", xkey)
         elif self._has_pyautogui:
             self._pyautogui.keyDown(key)
@@ -605,7 +971,7 @@ class LinuxController(ComputerController):
     def key_up(self, key: str) -> None:
         """释放按键"""
         if self._has_xdotool:
-            xkey = self._xdotool_key_name(key)
+            xkey = _xdotool_key_name(key)
             self._run_xdotool("keyup", xkey)
         elif self._has_pyautogui:
             self._pyautogui.keyUp(key)
@@ -614,9 +980,7 @@ class LinuxController(ComputerController):
         """组合键"""
         if self._has_xdotool:
             # xdotool格式: key ctrl+c
-            xkeys = [self._xdotool_key_name(k) for k in keys]
-            key_combo = "+".join(xkeys)
-            self._run_xdotool("key", key_combo)
+            self._run_xdotool("key", _xdotool_key_combo(keys))
         elif self._has_pyautogui:
             self._pyautogui.hotkey(*keys)
 
@@ -695,11 +1059,84 @@ class LinuxController(ComputerController):
 
         return windows
 
+    def _get_clipboard_watcher(self) -> Any:
+        """
+        获取剪贴板变化监听连接
+
+        使用 XFixes 扩展订阅 CLIPBOARD 所有权变化，不可用时返回 None
+        """
+        if self._clipboard_watcher is None:
+            self._clipboard_watcher = False
+            if self._has_xlib:
+                try:
+                    from Xlib.ext import xfixes
+
+                    d = self._xlib_display.Display()
+                    if d.has_extension("XFIXES"):
+                        d.xfixes_query_version()
+                        atom = d.intern_atom("CLIPBOARD")
+                        d.screen().root.xfixes_select_selection_input(
+                            atom, xfixes.XFixesSetSelectionOwnerNotifyMask
+                        )
+                        d.flush()
+                        self._clipboard_watcher = d
+                    else:
+                        d.close()
+                except Exception as e:
+                    logger.debug(f"XFixes 剪贴板监听不可用: {e}")
+        return self._clipboard_watcher or None
+
+    def _drain_clipboard_events(self) -> Optional[bool]:
+        """
+        取出所有待处理的剪贴板所有权变化事件
+
+        Returns:
+            自上次调用以来剪贴板是否变化，无法监听时返回 None
+        """
+        watcher = self._get_clipboard_watcher()
+        if watcher is None:
+            return None
+        try:
+            changed = False
+            while watcher.pending_events():
+                watcher.next_event()
+                changed = True
+            return changed
+        except Exception as e:
+            logger.debug(f"读取剪贴板事件失败: {e}")
+            self._clipboard_watcher = False
+            return None
+
+    def _clipboard_cache_valid(self) -> bool:
+        """检查剪贴板缓存是否仍然有效"""
+        if self._clipboard_cache is None:
+            return False
+
+        changed = self._drain_clipboard_events()
+        if changed is not None:
+            return not changed
+
+        return time.monotonic() - self._clipboard_cache_time < self.CLIPBOARD_CACHE_TTL
+
     def get_clipboard(self) -> Optional[str]:
-        """获取剪贴板内容"""
+        """
+        获取剪贴板内容
+
+        结果会被缓存: 有 XFixes 时直到剪贴板所有权变化前一直有效，
+        否则在 CLIPBOARD_CACHE_TTL 内有效
+        """
         if self._has_xclip:
+            if self._clipboard_cache_valid():
+                return self._clipboard_cache
+            # 读取前先订阅并清空已有事件，读取之后的变化在下次检查时才能被发现
+            self._drain_clipboard_events()
             try:
                 result = self._run_command(["xclip", "-selection", "clipboard", "-o"])
+                if result.returncode == 0:
+                    self._clipboard_cache = result.stdout
+                    self._clipboard_cache_time = time.monotonic()
+                else:
+                    self._clipboard_cache = None
                 return result.stdout
             except Exception:
                 pass
@@ -708,6 +1145,7 @@ class LinuxController(ComputerController):
     def set_clipboard(self, text: str) -> bool:
         """设置剪贴板内容"""
         if self._has_xclip:
+            self._clipboard_cache = None
             try:
                 process = subprocess.Popen(
                     ["xclip", "-selection", "clipboard"],
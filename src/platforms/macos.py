@@ -4,20 +4,281 @@ macOS平台控制器实现
 
 使用技术栈:
 - Quartz (CoreGraphics): 底层事件注入
-- AppKit: 鼠标位置等系统信息
-- screencapture: 截屏命令
+- _macos_fast: 直接调用 CoreGraphics 的 C 扩展 (可选，加速高频事件)
+- AppKit: 图像编码等系统接口
+- CoreGraphics: 进程内截屏
+- ScreenCaptureKit: 常驻截屏流 (可选)
+- screencapture: 截屏命令 (备选)
 - pyautogui: 作为备选方案
 """
 
+import ctypes
+import logging
 import os
 import platform
 import subprocess
-import tempfile
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from types import MappingProxyType
+from typing import Callable, List, Optional, Tuple, Union
 
 from ..core.base import ComputerController
-from ..core.types import CoordinateType, MouseButton, Point, Rect, Size
+from ..core.types import CoordinateType, MouseButton, Point, RawScreenshot, Rect, Size
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== ScreenCaptureKit 常驻截屏流 ====================
+
+_SCK_OUTPUT_CLASS = None
+
+
+def _sck_output_class():
+    """
+    获取 SCStreamOutput 代理类
+
+    Objective-C 类只能注册一次，因此延迟到首次使用时定义并缓存
+    """
+    global _SCK_OUTPUT_CLASS
+    if _SCK_OUTPUT_CLASS is None:
+        import objc
+        from Foundation import NSObject
+
+        class CCFStreamOutput(NSObject, protocols=[objc.protocolNamed("SCStreamOutput")]):
+            def initWithCallback_(self, callback):
+                self = objc.super(CCFStreamOutput, self).init()
+                if self is None:
+                    return None
+                self._callback = callback
+                return self
+
+            def stream_didOutputSampleBuffer_ofType_(self, stream, sample_buffer, output_type):
+                self._callback(sample_buffer, output_type)
+
+        _SCK_OUTPUT_CLASS = CCFStreamOutput
+    return _SCK_OUTPUT_CLASS
+
+
+class _SCKStream:
+    """
+    ScreenCaptureKit 常驻截屏流
+
+    启动一个长期运行的 SCStream，回调中只保存最新一帧的 CVPixelBuffer。
+    截屏时直接读取最新帧，避免每次重新创建 ShareableContent / Filter / Configuration
+    """
+
+    def __init__(self, fps: int = 30, timeout: float = 5.0):
+        import CoreMedia
+        import libdispatch
+        import Quartz
+        import ScreenCaptureKit as SCK
+
+        self._quartz = Quartz
+        self._core_media = CoreMedia
+        self._screen_type = SCK.SCStreamOutputTypeScreen
+        self._lock = threading.Lock()
+        self._latest = None
+        self._first_frame = threading.Event()
+
+        content, error = self._wait(
+            SCK.SCShareableContent.getShareableContentWithCompletionHandler_, timeout
+        )
+        if content is None:
+            raise RuntimeError(f"获取 SCShareableContent 失败: {error}")
+
+        main_id = Quartz.CGMainDisplayID()
+        displays = content.displays()
+        display = next((d for d in displays if d.displayID() == main_id), displays[0])
+
+        mode = Quartz.CGDisplayCopyDisplayMode(display.displayID())
+        pixel_width = Quartz.CGDisplayModeGetPixelWidth(mode)
+        pixel_height = Quartz.CGDisplayModeGetPixelHeight(mode)
+        self.scale = pixel_width / display.width()
+
+        config = SCK.SCStreamConfiguration.alloc().init()
+        config.setWidth_(pixel_width)
+        config.setHeight_(pixel_height)
+        config.setPixelFormat_(Quartz.kCVPixelFormatType_32BGRA)
+        config.setMinimumFrameInterval_(CoreMedia.CMTimeMake(1, fps))
+        config.setShowsCursor_(True)
+        config.setQueueDepth_(3)
+
+        content_filter = SCK.SCContentFilter.alloc().initWithDisplay_excludingWindows_(display, [])
+        self._stream = SCK.SCStream.alloc().initWithFilter_configuration_delegate_(
+            content_filter, config, None
+        )
+        self._output = _sck_output_class().alloc().initWithCallback_(self._on_sample)
+        self._queue = libdispatch.dispatch_queue_create(b"ccf.screencapturekit", None)
+
+        ok, error = self._stream.addStreamOutput_type_sampleHandlerQueue_error_(
+            self._output, self._screen_type, self._queue, None
+        )
+        if not ok:
+            raise RuntimeError(f"添加 SCStream 输出失败: {error}")
+
+        (error,) = self._wait(self._stream.startCaptureWithCompletionHandler_, timeout)
+        if error is not None:
+            raise RuntimeError(f"启动 SCStream 失败: {error}")
+
+        if not self._first_frame.wait(timeout):
+            self.stop()
+            raise RuntimeError("等待 SCStream 首帧超时")
+
+    @staticmethod
+    def _wait(start: Callable, timeout: float) -> tuple:
+        """调用带 completion handler 的异步 API 并同步等待结果"""
+        done = threading.Event()
+        result: list = []
+
+        def handler(*args):
+            result.extend(args)
+            done.set()
+
+        start(handler)
+        if not done.wait(timeout):
+            raise TimeoutError("ScreenCaptureKit 调用超时")
+        return tuple(result)
+
+    def _on_sample(self, sample_buffer, output_type) -> None:
+        """SCStream 回调 (在 dispatch queue 线程上执行)"""
+        if output_type != self._screen_type:
+            return
+        pixel_buffer = self._core_media.CMSampleBufferGetImageBuffer(sample_buffer)
+        if pixel_buffer is None:
+            # 画面无变化时的空帧
+            return
+        with self._lock:
+            self._latest = pixel_buffer
+        self._first_frame.set()
+
+    def frame(self) -> Tuple[bytes, int, int, int]:
+        """
+        读取最新一帧
+
+        Returns:
+            (BGRA 像素, 宽, 高, 每行字节数)
+        """
+        with self._lock:
+            pixel_buffer = self._latest
+        if pixel_buffer is None:
+            raise RuntimeError("SCStream 尚无可用帧")
+
+        q = self._quartz
+        q.CVPixelBufferLockBaseAddress(pixel_buffer, q.kCVPixelBufferLock_ReadOnly)
+        try:
+            width = q.CVPixelBufferGetWidth(pixel_buffer)
+            height = q.CVPixelBufferGetHeight(pixel_buffer)
+            stride = q.CVPixelBufferGetBytesPerRow(pixel_buffer)
+            base = q.CVPixelBufferGetBaseAddress(pixel_buffer)
+            data = bytes(base.as_buffer(stride * height))
+        finally:
+            q.CVPixelBufferUnlockBaseAddress(pixel_buffer, q.kCVPixelBufferLock_ReadOnly)
+        return data, width, height, stride
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止截屏流"""
+        try:
+            self._wait(self._stream.stopCaptureWithCompletionHandler_, timeout)
+        except TimeoutError:
+            pass
+        with self._lock:
+            self._latest = None
+
+
+# ==================== 精确等待 ====================
+
+class _MachTimebaseInfo(ctypes.Structure):
+    _fields_ = [("numer", ctypes.c_uint32), ("denom", ctypes.c_uint32)]
+
+
+class _MachTimer:
+    """
+    基于 mach_absolute_time / mach_wait_until 的截止时间等待
+
+    time.sleep 经 nanosleep 有约 1ms 的抖动且误差逐次累积；按绝对截止时间等待
+    误差在 100µs 以内，且不会累积。ctypes 调用期间释放 GIL
+    """
+
+    def __init__(self):
+        lib = ctypes.CDLL(None)
+
+        self._now = lib.mach_absolute_time
+        self._now.argtypes = []
+        self._now.restype = ctypes.c_uint64
+
+        self._wait_until = lib.mach_wait_until
+        self._wait_until.argtypes = [ctypes.c_uint64]
+        self._wait_until.restype = ctypes.c_int
+
+        info = _MachTimebaseInfo()
+        lib.mach_timebase_info(ctypes.byref(info))
+        self._ticks_per_second = 1e9 * info.denom / info.numer
+
+    def now(self) -> int:
+        """当前时刻 (mach 时钟 tick)"""
+        return self._now()
+
+    def ticks(self, seconds: float) -> int:
+        """秒数换算为 tick"""
+        return int(seconds * self._ticks_per_second)
+
+    def wait_until(self, deadline: int) -> None:
+        """阻塞直到指定 tick，已过期则立即返回"""
+        self._wait_until(deadline)
+
+
+# ==================== 按键映射 ====================
+
+# macOS按键码映射 (来自 pyautogui/_pyautogui_osx.py)
+_KEY_MAP = MappingProxyType({
+    'a': 0x00, 's': 0x01, 'd': 0x02, 'f': 0x03, 'h': 0x04,
+    'g': 0x05, 'z': 0x06, 'x': 0x07, 'c': 0x08, 'v': 0x09,
+    'b': 0x0b, 'q': 0x0c, 'w': 0x0d, 'e': 0x0e, 'r': 0x0f,
+    'y': 0x10, 't': 0x11, '1': 0x12, '2': 0x13, '3': 0x14,
+    '4': 0x15, '6': 0x16, '5': 0x17, '=': 0x18, '9': 0x19,
+    '7': 0x1a, '-': 0x1b, '8': 0x1c, '0': 0x1d, ']': 0x1e,
+    'o': 0x1f, 'u': 0x20, '[': 0x21, 'i': 0x22, 'p': 0x23,
+    'l': 0x25, 'j': 0x26, "'": 0x27, 'k': 0x28, ';': 0x29,
+    '\\': 0x2a, ',': 0x2b, '/': 0x2c, 'n': 0x2d, 'm': 0x2e,
+    '.': 0x2f, '`': 0x32, ' ': 0x31, 'space': 0x31,
+    'enter': 0x24, 'return': 0x24, '\n': 0x24, '\r': 0x24,
+    'tab': 0x30, '\t': 0x30,
+    'backspace': 0x33, 'delete': 0x75, 'del': 0x75,
+    'escape': 0x35, 'esc': 0x35,
+    'command': 0x37, 'cmd': 0x37, 'win': 0x37,
+    'shift': 0x38, 'shiftleft': 0x38, 'shiftright': 0x3c,
+    'capslock': 0x39,
+    'option': 0x3a, 'alt': 0x3a, 'altleft': 0x3a, 'altright': 0x3d,
+    'ctrl': 0x3b, 'control': 0x3b, 'ctrlleft': 0x3b, 'ctrlright': 0x3e,
+    'fn': 0x3f,
+    'f1': 0x7a, 'f2': 0x78, 'f3': 0x63, 'f4': 0x76,
+    'f5': 0x60, 'f6': 0x61, 'f7': 0x62, 'f8': 0x64,
+    'f9': 0x65, 'f10': 0x6d, 'f11': 0x67, 'f12': 0x6f,
+    'home': 0x73, 'end': 0x77,
+    'pageup': 0x74, 'pgup': 0x74,
+    'pagedown': 0x79, 'pgdn': 0x79,
+    'left': 0x7b, 'right': 0x7c, 'down': 0x7d, 'up': 0x7e,
+})
+
+
+def _build_ascii_keycodes() -> Tuple[Optional[int], ...]:
+    """按 ASCII 码索引的按键码表，大写字母映射到对应小写字母的按键码"""
+    table: List[Optional[int]] = [None] * 128
+    for key, code in _KEY_MAP.items():
+        if len(key) == 1 and ord(key) < 128:
+            table[ord(key)] = code
+            if key.isalpha():
+                table[ord(key.upper())] = code
+    return tuple(table)
+
+
+# 单字符按键的快速查找表，按 ord() 直接索引，免去哈希
+_ASCII_KEYCODES = _build_ascii_keycodes()
+
+# 需要以真实按键码输入的控制字符 (Unicode 字符串事件在多数应用中不会触发回车/Tab)
+_CONTROL_CHARS = frozenset('\n\r\t')
 
 
 class MacOSController(ComputerController):
@@ -27,7 +288,20 @@ class MacOSController(ComputerController):
     优先使用Quartz框架进行底层控制，提供最佳性能和兼容性
     """
 
-    def __init__(self):
+    # 平滑移动 / 拖拽时每秒发送的鼠标事件数
+    MOVE_FPS = 60
+    # 记录的鼠标位置在该时间 (秒) 内视为有效，超时后重新查询 (用户可能手动移动了鼠标)
+    MOUSE_POSITION_MAX_AGE = 1.0
+
+    def __init__(self, use_sck: bool = False, sck_fps: int = 30):
+        """
+        初始化 macOS 控制器
+
+        Args:
+            use_sck: 是否使用常驻的 ScreenCaptureKit 截屏流 (macOS 12.3+)，
+                适合需要反复截屏的场景，首次截屏时启动，close() 时停止
+            sck_fps: 截屏流的最大帧率
+        """
         super().__init__()
 
         if platform.system() != "Darwin":
@@ -53,17 +327,109 @@ class MacOSController(ComputerController):
                     "Install pyobjc-framework-Quartz or pyautogui."
                 ) from e
 
+        if self._use_quartz:
+            # 预先解析 Quartz 函数与常量，避免每次事件都做模块属性查找
+            q = self._quartz
+            self._post = q.CGEventPost
+            self._new_mouse = q.CGEventCreateMouseEvent
+            self._new_key = q.CGEventCreateKeyboardEvent
+            self._new_scroll = q.CGEventCreateScrollWheelEvent
+            self._set_location = q.CGEventSetLocation
+            self._set_unicode = q.CGEventKeyboardSetUnicodeString
+            self._ev_create = q.CGEventCreate
+            self._get_pos = q.CGEventGetLocation
+            # 按键 / 按钮事件走 HID 层，全局热键监听等仍能观察到；
+            # 高频的移动、拖拽、滚轮事件走会话层，跳过 HID 合成流程
+            self._tap = q.kCGHIDEventTap
+            self._move_tap = q.kCGSessionEventTap
+            self._scroll_unit_line = q.kCGScrollEventUnitLine
+            self._ev_move = q.kCGEventMouseMoved
+
+            # 所有事件共用一个 HID 事件源，由系统保证顺序与时间戳，无需额外 sleep 同步
+            self._src = q.CGEventSourceCreate(q.kCGEventSourceStateHIDSystemState)
+
+            # 按钮 -> (按下, 释放, 按钮常量) / 拖拽事件 / 按钮常量
+            self._click_events = {
+                MouseButton.LEFT: (
+                    q.kCGEventLeftMouseDown, q.kCGEventLeftMouseUp, q.kCGMouseButtonLeft
+                ),
+                MouseButton.RIGHT: (
+                    q.kCGEventRightMouseDown, q.kCGEventRightMouseUp, q.kCGMouseButtonRight
+                ),
+                MouseButton.MIDDLE: (
+                    q.kCGEventOtherMouseDown, q.kCGEventOtherMouseUp, q.kCGMouseButtonCenter
+                ),
+            }
+            self._drag_events = {
+                MouseButton.LEFT: q.kCGEventLeftMouseDragged,
+                MouseButton.RIGHT: q.kCGEventRightMouseDragged,
+                MouseButton.MIDDLE: q.kCGEventOtherMouseDragged,
+            }
+            self._btn_const = {
+                MouseButton.LEFT: q.kCGMouseButtonLeft,
+                MouseButton.RIGHT: q.kCGMouseButtonRight,
+                MouseButton.MIDDLE: q.kCGMouseButtonCenter,
+            }
+
+            # 可选的 C 扩展: 移动/拖拽/输入循环在 C 中完成，未编译时使用 pyobjc
+            try:
+                from . import _macos_fast
+                self._fast = _macos_fast
+            except ImportError:
+                self._fast = None
+
+            # 用于 type_text 等待间隔的 mach 精确计时
+            try:
+                self._mach_timer: Optional[_MachTimer] = _MachTimer()
+            except (OSError, AttributeError):
+                self._mach_timer = None
+
+            # 主显示器信息，显示器配置变化时由回调刷新
+            self._refresh_display_info()
+            self._display_callback = self._on_display_reconfigured
+            q.CGDisplayRegisterReconfigurationCallback(self._display_callback, None)
+
+            # 截屏常量
+            self._win_list_on_screen = self._quartz.kCGWindowListOptionOnScreenOnly
+            self._null_window_id = self._quartz.kCGNullWindowID
+            self._win_image_default = self._quartz.kCGWindowImageDefault
+            self._png_file_type = self._appkit.NSBitmapImageFileTypePNG
+        else:
+            self._fast = None
+            self._mach_timer = None
+            self._display_callback = None
+
+        # 最近一次由本控制器移动到的鼠标位置
+        self._last_x: Optional[int] = None
+        self._last_y: Optional[int] = None
+        self._last_mouse_time = 0.0
+
+        self._use_sck = use_sck and self._use_quartz
+        self._sck_fps = sck_fps
+        self._sck: Optional[_SCKStream] = None
+
         # 缓存屏幕尺寸
         self._screen_size = self.get_screen_size()
 
     # ==================== 屏幕信息 ====================
 
+    def _refresh_display_info(self) -> None:
+        """重新读取主显示器 ID 与像素尺寸"""
+        self._main_display = self._quartz.CGMainDisplayID()
+        self._screen_width_px = self._quartz.CGDisplayPixelsWide(self._main_display)
+        self._screen_height_px = self._quartz.CGDisplayPixelsHigh(self._main_display)
+
+    def _on_display_reconfigured(self, display, flags, user_info) -> None:
+        """CGDisplay 配置变化回调，配置完成后刷新缓存的显示器信息"""
+        if flags & self._quartz.kCGDisplayBeginConfigurationFlag:
+            return
+        self._refresh_display_info()
+        self._screen_size = Size(self._screen_width_px, self._screen_height_px)
+
     def get_screen_size(self) -> Size:
         """获取屏幕尺寸"""
         if self._use_quartz:
-            width = self._quartz.CGDisplayPixelsWide(self._quartz.CGMainDisplayID())
-            height = self._quartz.CGDisplayPixelsHigh(self._quartz.CGMainDisplayID())
-            return Size(width, height)
+            return Size(self._screen_width_px, self._screen_height_px)
         else:
             w, h = self._pyautogui.size()
             return Size(w, h)
@@ -71,43 +437,227 @@ class MacOSController(ComputerController):
     def get_mouse_position(self) -> Point:
         """获取当前鼠标位置"""
         if self._use_quartz:
-            loc = self._appkit.NSEvent.mouseLocation()
-            # macOS坐标系Y轴是从下往上的，需要转换
-            screen_height = self._quartz.CGDisplayPixelsHigh(0)
-            return Point(int(loc.x), int(screen_height - loc.y), CoordinateType.ABSOLUTE)
+            # CGEvent 坐标系原点在左上角，与 NSEvent.mouseLocation 不同，无需翻转 Y 轴，
+            # 且不经过 AppKit
+            loc = self._get_pos(self._ev_create(None))
+            return Point(int(loc.x), int(loc.y), CoordinateType.ABSOLUTE)
         else:
             x, y = self._pyautogui.position()
             return Point(x, y, CoordinateType.ABSOLUTE)
 
     # ==================== 截屏功能 ====================
 
-    def screenshot(self, region: Optional[Rect] = None) -> bytes:
+    def screenshot(
+        self,
+        region: Optional[Rect] = None,
+        format: str = "png",
+    ) -> Union[bytes, RawScreenshot]:
         """
         截取屏幕
 
-        使用macOS原生screencapture命令，支持Retina显示
+        Quartz 可用时在进程内通过 CoreGraphics 截屏并编码 PNG，
+        否则使用 macOS 原生 screencapture 命令 (经 stdout 读取)。均支持 Retina 显示
+
+        Args:
+            region: 截取区域，None表示全屏
+            format: "png" 返回 PNG 字节; "raw" 返回 RawScreenshot (BGRA 像素)，
+                跳过 PNG 编码，适合直接交给 CV / 模型预处理
         """
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            tmp_path = tmp.name
+        if format not in ("png", "raw"):
+            raise ValueError(f"不支持的截屏格式: {format}")
+        raw = format == "raw"
 
-        try:
-            if region:
-                # 截取指定区域
-                x, y, w, h = region.left, region.top, region.width, region.height
-                cmd = ["screencapture", "-x", "-R", f"{x},{y},{w},{h}", tmp_path]
-            else:
-                # 全屏截图 -C 包含鼠标指针
-                cmd = ["screencapture", "-x", "-C", tmp_path]
+        if self._use_sck:
+            stream = self._get_sck_stream()
+            if stream is not None:
+                if raw:
+                    return self._sck_raw_screenshot(stream, region)
+                return self._sck_screenshot(stream, region)
+
+        if self._use_quartz:
+            image = self._capture_cgimage(region)
+            if raw:
+                q = self._quartz
+                data = q.CGDataProviderCopyData(q.CGImageGetDataProvider(image))
+                return RawScreenshot(
+                    data=bytes(data),
+                    width=q.CGImageGetWidth(image),
+                    height=q.CGImageGetHeight(image),
+                    stride=q.CGImageGetBytesPerRow(image),
+                )
+            rep = self._appkit.NSBitmapImageRep.alloc().initWithCGImage_(image)
+            data = rep.representationUsingType_properties_(self._png_file_type, {})
+            return bytes(data)
+
+        if raw:
+            from PIL import Image
+
+            image = Image.open(BytesIO(self.screenshot(region))).convert("RGBA")
+            return RawScreenshot(
+                data=image.tobytes("raw", "BGRA"),
+                width=image.width,
+                height=image.height,
+                stride=image.width * 4,
+            )
 
-            subprocess.run(cmd, check=True, capture_output=True)
+        # "-" 让 screencapture 把 PNG 直接写到 stdout，省去临时文件的创建/读取/删除
+        if region:
+            # 截取指定区域
+            x, y, w, h = region.left, region.top, region.width, region.height
+            cmd = ["screencapture", "-x", "-t", "png", "-R", f"{x},{y},{w},{h}", "-"]
+        else:
+            # 全屏截图 -C 包含鼠标指针
+            cmd = ["screencapture", "-x", "-t", "png", "-C", "-"]
 
-            with open(tmp_path, 'rb') as f:
-                return f.read()
-        finally:
+        result = subprocess.run(
+            cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        return result.stdout
+
+    def _get_sck_stream(self) -> Optional[_SCKStream]:
+        """获取 (必要时启动) ScreenCaptureKit 截屏流，失败时停用"""
+        if self._sck is None:
             try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+                self._sck = _SCKStream(fps=self._sck_fps)
+            except Exception as e:
+                logger.warning(f"ScreenCaptureKit 不可用，改用 CoreGraphics 截屏: {e}")
+                self._use_sck = False
+                return None
+        return self._sck
+
+    def screenshot_ndarray(self, region: Optional[Rect] = None):
+        """
+        截取屏幕为 NumPy 数组
+
+        CGImage 直接绘制进 NumPy 分配的缓冲区 (CGBitmapContextCreate)，不经过 PNG 编解码，
+        适合直接交给 OpenCV 等下游处理。需要安装 numpy
+
+        Returns:
+            形状为 (height, width, 4) 的 uint8 数组，BGRA 像素 (Retina 下为物理像素)
+        """
+        import numpy as np
+
+        if not self._use_quartz:
+            raw = self.screenshot(region, format="raw")
+            rows = np.frombuffer(raw.data, np.uint8).reshape(raw.height, raw.stride)
+            return rows[:, :raw.width * 4].reshape(raw.height, raw.width, 4)
+
+        q = self._quartz
+        image = self._capture_cgimage(region)
+        width = q.CGImageGetWidth(image)
+        height = q.CGImageGetHeight(image)
+
+        buf = np.empty((height, width, 4), np.uint8)
+        context = q.CGBitmapContextCreate(
+            buf, width, height, 8, width * 4,
+            q.CGColorSpaceCreateDeviceRGB(),
+            q.kCGImageAlphaPremultipliedFirst | q.kCGBitmapByteOrder32Little,
+        )
+        q.CGContextDrawImage(context, q.CGRectMake(0, 0, width, height), image)
+        return buf
+
+    def screenshot_batch(self, regions: List[Rect]) -> List[bytes]:
+        """
+        批量截取多个区域，返回与 regions 顺序一致的 PNG 列表
+
+        启用 ScreenCaptureKit 时所有区域取自同一帧，裁剪与 PNG 编码在线程池中并行
+        (编码期间释放 GIL)；否则逐个调用 screenshot()
+        """
+        if not regions:
+            return []
+
+        if self._use_sck:
+            stream = self._get_sck_stream()
+            if stream is not None:
+                image = self._sck_frame_image(stream)
+                workers = min(len(regions), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(
+                        lambda region: self._encode_png(image, stream.scale, region),
+                        regions,
+                    ))
+
+        return [self.screenshot(region) for region in regions]
+
+    def _sck_screenshot(self, stream: _SCKStream, region: Optional[Rect]) -> bytes:
+        """从截屏流的最新帧生成 PNG"""
+        return self._encode_png(self._sck_frame_image(stream), stream.scale, region)
+
+    @staticmethod
+    def _sck_frame_image(stream: _SCKStream):
+        """将截屏流的最新帧解码为 PIL 图像"""
+        from PIL import Image
+
+        data, width, height, stride = stream.frame()
+        image = Image.frombuffer("RGB", (width, height), data, "raw", "BGRX", stride, 1)
+        # 立即解码，避免多个线程并发裁剪时重复触发延迟加载
+        image.load()
+        return image
+
+    @staticmethod
+    def _encode_png(image, scale: float, region: Optional[Rect]) -> bytes:
+        """按逻辑坐标区域裁剪帧图像并编码为 PNG"""
+        if region:
+            image = image.crop((
+                int(region.left * scale), int(region.top * scale),
+                int(region.right * scale), int(region.bottom * scale),
+            ))
+
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    @staticmethod
+    def _sck_raw_screenshot(stream: _SCKStream, region: Optional[Rect]) -> RawScreenshot:
+        """
+        从截屏流的最新帧裁剪原始 BGRA 像素
+
+        区域部分超出帧时裁剪到帧内，与帧没有交集时抛出 ValueError
+        """
+        data, width, height, stride = stream.frame()
+        if not region:
+            return RawScreenshot(data=data, width=width, height=height, stride=stride)
+
+        scale = stream.scale
+        x0 = max(int(region.left * scale), 0)
+        y0 = max(int(region.top * scale), 0)
+        x1 = min(int(region.right * scale), width)
+        y1 = min(int(region.bottom * scale), height)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"截屏区域超出屏幕范围: {region}")
+        rows = [data[y * stride + x0 * 4:y * stride + x1 * 4] for y in range(y0, y1)]
+        return RawScreenshot(
+            data=b"".join(rows),
+            width=x1 - x0,
+            height=y1 - y0,
+            stride=(x1 - x0) * 4,
+        )
+
+    def close(self) -> None:
+        """释放截屏流、显示器回调等常驻资源"""
+        if self._sck is not None:
+            self._sck.stop()
+            self._sck = None
+        if self._display_callback is not None:
+            self._quartz.CGDisplayRemoveReconfigurationCallback(self._display_callback, None)
+            self._display_callback = None
+
+    def _capture_cgimage(self, region: Optional[Rect] = None):
+        """截取屏幕为 CGImage"""
+        if region:
+            rect = self._quartz.CGRectMake(region.left, region.top, region.width, region.height)
+        else:
+            rect = self._quartz.CGRectInfinite
+
+        image = self._quartz.CGWindowListCreateImage(
+            rect,
+            self._win_list_on_screen,
+            self._null_window_id,
+            self._win_image_default,
+        )
+        if image is None:
+            raise RuntimeError("CGWindowListCreateImage 失败，请检查屏幕录制权限")
+        return image
 
     # ==================== 鼠标控制 ====================
 
@@ -116,20 +666,11 @@ class MacOSController(ComputerController):
         if self._use_quartz:
             if duration > 0:
                 # 平滑移动
-                start = self.get_mouse_position()
-                steps = max(int(duration * 60), 1)  # 60fps
-                for i in range(steps + 1):
-                    t = i / steps
-                    cur_x = int(start.x + (x - start.x) * t)
-                    cur_y = int(start.y + (y - start.y) * t)
-                    self._send_mouse_event(
-                        self._quartz.kCGEventMouseMoved, cur_x, cur_y, 0
-                    )
-                    time.sleep(duration / steps)
+                start_x, start_y = self._current_pos()
+                self._post_path(self._ev_move, 0, start_x, start_y, x, y, duration)
             else:
-                self._send_mouse_event(
-                    self._quartz.kCGEventMouseMoved, x, y, 0
-                )
+                self._send_mouse_event(self._ev_move, x, y, 0, tap=self._move_tap)
+            self._remember_pos(x, y)
             time.sleep(0.01)  # macOS需要一点时间同步
         else:
             self._pyautogui.moveTo(x, y, duration=duration)
@@ -147,8 +688,10 @@ class MacOSController(ComputerController):
             self.mouse_move(x, y)
 
         if self._use_quartz:
-            pos = self.get_mouse_position()
-            px, py = int(pos.x), int(pos.y)
+            if x is not None and y is not None:
+                px, py = x, y
+            else:
+                px, py = self._current_pos()
 
             down_event, up_event, btn = self._get_click_events(button)
 
@@ -164,18 +707,18 @@ class MacOSController(ComputerController):
     def mouse_down(self, button: MouseButton = MouseButton.LEFT) -> None:
         """按下鼠标"""
         if self._use_quartz:
-            pos = self.get_mouse_position()
+            px, py = self._current_pos()
             down_event, _, btn = self._get_click_events(button)
-            self._send_mouse_event(down_event, int(pos.x), int(pos.y), btn)
+            self._send_mouse_event(down_event, px, py, btn)
         else:
             self._pyautogui.mouseDown(button=button.value)
 
     def mouse_up(self, button: MouseButton = MouseButton.LEFT) -> None:
         """释放鼠标"""
         if self._use_quartz:
-            pos = self.get_mouse_position()
+            px, py = self._current_pos()
             _, up_event, btn = self._get_click_events(button)
-            self._send_mouse_event(up_event, int(pos.x), int(pos.y), btn)
+            self._send_mouse_event(up_event, px, py, btn)
         else:
             self._pyautogui.mouseUp(button=button.value)
 
@@ -191,31 +734,31 @@ class MacOSController(ComputerController):
             self.mouse_move(x, y)
 
         if self._use_quartz:
-            # 每次滚动10单位，分多次执行
-            direction = 1 if clicks >= 0 else -1
-            remaining = abs(clicks)
-
-            while remaining > 0:
-                scroll_amount = min(remaining, 10) * direction
-
+            # CGEventCreateScrollWheelEvent 不限制单次滚动量，一个事件即可
+            if self._fast is not None:
                 if horizontal:
-                    event = self._quartz.CGEventCreateScrollWheelEvent(
-                        None,
-                        self._quartz.kCGScrollEventUnitLine,
-                        2,  # wheelCount
-                        0,  # vertical
-                        scroll_amount  # horizontal
-                    )
+                    self._fast.post_scroll(2, 0, clicks, self._move_tap)
                 else:
-                    event = self._quartz.CGEventCreateScrollWheelEvent(
-                        None,
-                        self._quartz.kCGScrollEventUnitLine,
-                        1,  # wheelCount
-                        scroll_amount  # vertical
-                    )
-
-                self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-                remaining -= 10
+                    self._fast.post_scroll(1, clicks, 0, self._move_tap)
+                return
+
+            if horizontal:
+                event = self._new_scroll(
+                    self._src,
+                    self._scroll_unit_line,
+                    2,  # wheelCount
+                    0,  # vertical
+                    clicks  # horizontal
+                )
+            else:
+                event = self._new_scroll(
+                    self._src,
+                    self._scroll_unit_line,
+                    1,  # wheelCount
+                    clicks  # vertical
+                )
+
+            self._post(self._move_tap, event)
         else:
             if horizontal:
                 self._pyautogui.hscroll(clicks, x, y)
@@ -242,16 +785,10 @@ class MacOSController(ComputerController):
             time.sleep(0.1)
 
             # 拖拽移动
-            steps = max(int(duration * 60), 1)
             drag_event = self._get_drag_event(button)
             btn = self._get_button_const(button)
-
-            for i in range(steps + 1):
-                t = i / steps
-                cur_x = int(start_x + (end_x - start_x) * t)
-                cur_y = int(start_y + (end_y - start_y) * t)
-                self._send_mouse_event(drag_event, cur_x, cur_y, btn)
-                time.sleep(duration / steps)
+            self._post_path(drag_event, btn, start_x, start_y, end_x, end_y, duration)
+            self._remember_pos(end_x, end_y)
 
             time.sleep(0.1)
             # 释放
@@ -265,10 +802,30 @@ class MacOSController(ComputerController):
     def type_text(self, text: str, interval: float = 0.0) -> None:
         """输入文本"""
         if self._use_quartz:
-            for char in text:
-                self._type_character(char)
-                if interval > 0:
+            if interval > 0 and self._mach_timer is not None:
+                # 按截止时间对齐每个字符，避免逐次 sleep 的误差累积
+                timer = self._mach_timer
+                step = timer.ticks(interval)
+                deadline = timer.now()
+                for char in text:
+                    self._type_character(char)
+                    deadline += step
+                    timer.wait_until(deadline)
+            elif interval > 0:
+                for char in text:
+                    self._type_character(char)
                     time.sleep(interval)
+            elif self._fast is not None:
+                self._fast.type_unicode(text, self._tap)
+            else:
+                # 先构造全部事件，再集中发送
+                events = []
+                for char in text:
+                    events.extend(self._char_events(char))
+                post = self._post
+                tap = self._tap
+                for event in events:
+                    post(tap, event)
         else:
             self._pyautogui.write(text, interval=interval)
 
@@ -283,9 +840,7 @@ class MacOSController(ComputerController):
         if self._use_quartz:
             key_code = self._get_key_code(key)
             if key_code is not None:
-                event = self._quartz.CGEventCreateKeyboardEvent(None, key_code, True)
-                self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-                time.sleep(0.01)
+                self._post(self._tap, self._new_key(self._src, key_code, True))
         else:
             self._pyautogui.keyDown(key)
 
@@ -294,116 +849,135 @@ class MacOSController(ComputerController):
         if self._use_quartz:
             key_code = self._get_key_code(key)
             if key_code is not None:
-                event = self._quartz.CGEventCreateKeyboardEvent(None, key_code, False)
-                self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-                time.sleep(0.01)
+                self._post(self._tap, self._new_key(self._src, key_code, False))
         else:
             self._pyautogui.keyUp(key)
 
     # ==================== 内部方法 ====================
 
-    def _send_mouse_event(self, event_type: int, x: int, y: int, button: int) -> None:
-        """发送鼠标事件"""
-        event = self._quartz.CGEventCreateMouseEvent(None, event_type, (x, y), button)
-        self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
+    def _current_pos(self) -> Tuple[int, int]:
+        """
+        获取当前鼠标位置
+
+        优先使用最近一次移动到的位置，过期后才重新查询
+        """
+        if (
+            self._last_x is not None
+            and time.monotonic() - self._last_mouse_time < self.MOUSE_POSITION_MAX_AGE
+        ):
+            return self._last_x, self._last_y
+        pos = self.get_mouse_position()
+        return int(pos.x), int(pos.y)
+
+    def _remember_pos(self, x: int, y: int) -> None:
+        """记录最近一次移动到的鼠标位置"""
+        self._last_x = x
+        self._last_y = y
+        self._last_mouse_time = time.monotonic()
+
+    def _send_mouse_event(
+        self, event_type: int, x: int, y: int, button: int, tap: Optional[int] = None
+    ) -> None:
+        """发送鼠标事件，tap 默认为 HID 层"""
+        if tap is None:
+            tap = self._tap
+        if self._fast is not None:
+            self._fast.post_mouse(event_type, x, y, button, tap)
+            return
+        event = self._new_mouse(self._src, event_type, (x, y), button)
+        self._post(tap, event)
+
+    def _post_path(
+        self,
+        event_type: int,
+        button: int,
+        start_x: int,
+        start_y: int,
+        end_x: int,
+        end_y: int,
+        duration: float,
+    ) -> None:
+        """
+        按 MOVE_FPS 沿直线发送一串鼠标事件
+
+        按绝对截止时间调度每一步而不是累加 sleep，避免 sleep 抖动累积导致总时长漂移；
+        落后超过一帧时跳过中间步骤，终点总会发送。整条路径复用同一个 CGEvent，
+        每步只修改其坐标
+        """
+        steps = max(int(duration * self.MOVE_FPS), 1)
+        if self._fast is not None:
+            self._fast.smooth_move(
+                event_type, button, start_x, start_y, end_x, end_y,
+                steps, duration, self._move_tap,
+            )
+            return
+
+        frame = duration / steps
+        # 整数 DDA: 累加位移，按步数整除得到当前坐标，全程无浮点运算
+        dx = end_x - start_x
+        dy = end_y - start_y
+        ax = ay = 0
+        event = self._new_mouse(self._src, event_type, (start_x, start_y), button)
+        set_location = self._set_location
+        post = self._post
+        tap = self._move_tap
+        t0 = time.perf_counter()
+        for i in range(steps + 1):
+            target = t0 + i * frame
+            cur_x = start_x + ax // steps
+            cur_y = start_y + ay // steps
+            ax += dx
+            ay += dy
+            remaining = target - time.perf_counter()
+            if remaining < -frame and i < steps:
+                continue
+            set_location(event, (cur_x, cur_y))
+            post(tap, event)
+            remaining = target + frame - time.perf_counter()
+            if remaining > 0 and i < steps:
+                time.sleep(remaining)
 
     def _get_click_events(self, button: MouseButton):
         """获取点击事件类型"""
-        if button == MouseButton.LEFT:
-            return (
-                self._quartz.kCGEventLeftMouseDown,
-                self._quartz.kCGEventLeftMouseUp,
-                self._quartz.kCGMouseButtonLeft
-            )
-        elif button == MouseButton.RIGHT:
-            return (
-                self._quartz.kCGEventRightMouseDown,
-                self._quartz.kCGEventRightMouseUp,
-                self._quartz.kCGMouseButtonRight
-            )
-        else:  # MIDDLE
-            return (
-                self._quartz.kCGEventOtherMouseDown,
-                self._quartz.kCGEventOtherMouseUp,
-                self._quartz.kCGMouseButtonCenter
-            )
+        return self._click_events[button]
 
     def _get_drag_event(self, button: MouseButton) -> int:
         """获取拖拽事件类型"""
-        if button == MouseButton.LEFT:
-            return self._quartz.kCGEventLeftMouseDragged
-        elif button == MouseButton.RIGHT:
-            return self._quartz.kCGEventRightMouseDragged
-        else:
-            return self._quartz.kCGEventOtherMouseDragged
+        return self._drag_events[button]
 
     def _get_button_const(self, button: MouseButton) -> int:
         """获取按钮常量"""
-        if button == MouseButton.LEFT:
-            return self._quartz.kCGMouseButtonLeft
-        elif button == MouseButton.RIGHT:
-            return self._quartz.kCGMouseButtonRight
-        else:
-            return self._quartz.kCGMouseButtonCenter
+        return self._btn_const[button]
+
+    def _char_events(self, char: str) -> Tuple:
+        """
+        构造输入单个字符的按下/释放事件
+
+        通过 CGEventKeyboardSetUnicodeString 直接携带字符，大小写与符号无需 Shift，
+        也支持键码表之外的任意 Unicode 字符；控制字符仍使用真实按键码
+        """
+        if char in _CONTROL_CHARS:
+            key_code = _KEY_MAP[char]
+            return (
+                self._new_key(self._src, key_code, True),
+                self._new_key(self._src, key_code, False),
+            )
+
+        length = len(char.encode("utf-16-le")) // 2
+        down = self._new_key(self._src, 0, True)
+        self._set_unicode(down, length, char)
+        up = self._new_key(self._src, 0, False)
+        self._set_unicode(up, length, char)
+        return down, up
 
     def _type_character(self, char: str) -> None:
         """输入单个字符"""
-        # 这里简化处理，实际需要更完整的键码映射
-        key_code = self._get_key_code(char.lower())
-        if key_code is not None:
-            # 检查是否需要Shift
-            needs_shift = char.isupper() or char in '~!@#$%^&*()_+{}|:"<>?'
-
-            if needs_shift:
-                shift_code = self._get_key_code('shift')
-                if shift_code:
-                    event = self._quartz.CGEventCreateKeyboardEvent(None, shift_code, True)
-                    self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-
-            # 按键
-            event = self._quartz.CGEventCreateKeyboardEvent(None, key_code, True)
-            self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-            event = self._quartz.CGEventCreateKeyboardEvent(None, key_code, False)
-            self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-
-            if needs_shift:
-                shift_code = self._get_key_code('shift')
-                if shift_code:
-                    event = self._quartz.CGEventCreateKeyboardEvent(None, shift_code, False)
-                    self._quartz.CGEventPost(self._quartz.kCGHIDEventTap, event)
-
-            time.sleep(0.01)
+        for event in self._char_events(char):
+            self._post(self._tap, event)
 
     def _get_key_code(self, key: str) -> Optional[int]:
         """获取按键码"""
-        # macOS按键码映射 (来自 pyautogui/_pyautogui_osx.py)
-        key_map = {
-            'a': 0x00, 's': 0x01, 'd': 0x02, 'f': 0x03, 'h': 0x04,
-            'g': 0x05, 'z': 0x06, 'x': 0x07, 'c': 0x08, 'v': 0x09,
-            'b': 0x0b, 'q': 0x0c, 'w': 0x0d, 'e': 0x0e, 'r': 0x0f,
-            'y': 0x10, 't': 0x11, '1': 0x12, '2': 0x13, '3': 0x14,
-            '4': 0x15, '6': 0x16, '5': 0x17, '=': 0x18, '9': 0x19,
-            '7': 0x1a, '-': 0x1b, '8': 0x1c, '0': 0x1d, ']': 0x1e,
-            'o': 0x1f, 'u': 0x20, '[': 0x21, 'i': 0x22, 'p': 0x23,
-            'l': 0x25, 'j': 0x26, "'": 0x27, 'k': 0x28, ';': 0x29,
-            '\\': 0x2a, ',': 0x2b, '/': 0x2c, 'n': 0x2d, 'm': 0x2e,
-            '.': 0x2f, '`': 0x32, ' ': 0x31, 'space': 0x31,
-            'enter': 0x24, 'return': 0x24, '\n': 0x24, '\r': 0x24,
-            'tab': 0x30, '\t': 0x30,
-            'backspace': 0x33, 'delete': 0x75, 'del': 0x75,
-            'escape': 0x35, 'esc': 0x35,
-            'command': 0x37, 'cmd': 0x37, 'win': 0x37,
-            'shift': 0x38, 'shiftleft': 0x38, 'shiftright': 0x3c,
-            'capslock': 0x39,
-            'option': 0x3a, 'alt': 0x3a, 'altleft': 0x3a, 'altright': 0x3d,
-            'ctrl': 0x3b, 'control': 0x3b, 'ctrlleft': 0x3b, 'ctrlright': 0x3e,
-            'fn': 0x3f,
-            'f1': 0x7a, 'f2': 0x78, 'f3': 0x63, 'f4': 0x76,
-            'f5': 0x60, 'f6': 0x61, 'f7': 0x62, 'f8': 0x64,
-            'f9': 0x65, 'f10': 0x6d, 'f11': 0x67, 'f12': 0x6f,
-            'home': 0x73, 'end': 0x77,
-            'pageup': 0x74, 'pgup': 0x74,
-            'pagedown': 0x79, 'pgdn': 0x79,
-            'left': 0x7b, 'right': 0x7c, 'down': 0x7d, 'up': 0x7e,
-        }
-        return key_map.get(key.lower())
+        if len(key) == 1:
+            c = ord(key)
+            return _ASCII_KEYCODES[c] if c < 128 else None
+        return _KEY_MAP.get(key.lower())
@@ -14,24 +14,40 @@ Windows平台控制器实现
 - 内置重试机制
 """
 
+import ctypes
 import logging
 import platform
+import threading
 import time
-from functools import wraps
+from array import array
+from collections import deque
+from ctypes import wintypes
+from functools import cached_property, lru_cache, wraps
+from importlib.util import find_spec
 from io import BytesIO
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
 
 from ..core.base import ComputerController
-from ..core.types import CoordinateType, MouseButton, Point, Rect, Size
+from ..core.types import CoordinateType, MouseButton, Point, RawScreenshot, Rect, Size
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# screenshot() 支持的输出格式
+_SCREENSHOT_FORMATS = ("png", "webp", "raw", "lz4")
+
+# 窗口标题缓冲区长度 (宽字符数)
+_TITLE_BUFFER_SIZE = 512
+
 
 def retry_on_failure(max_attempts: int = 3, delay: float = 0.1) -> Callable:
-    """重试装饰器"""
+    """重试装饰器，max_attempts 为 1 时原样返回函数，不增加任何开销"""
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        if max_attempts <= 1:
+            return func
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             last_error = None
@@ -48,6 +64,298 @@ def retry_on_failure(max_attempts: int = 3, delay: float = 0.1) -> Callable:
     return decorator
 
 
+# ==================== SendInput 结构体 ====================
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),  # ULONG_PTR
+    ]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),  # ULONG_PTR
+    ]
+
+
+class _HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT), ("hi", _HARDWAREINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+def _key_input(vk: int, down: bool) -> _INPUT:
+    """构造键盘 INPUT"""
+    inp = _INPUT(type=INPUT_KEYBOARD)
+    inp.ki.wVk = vk
+    inp.ki.dwFlags = 0 if down else KEYEVENTF_KEYUP
+    return inp
+
+
+def _mouse_input(flags: int, data: int = 0) -> _INPUT:
+    """构造鼠标 INPUT (相对当前位置，不移动)"""
+    inp = _INPUT(type=INPUT_MOUSE)
+    inp.mi.dwFlags = flags
+    inp.mi.mouseData = data  # 滚轮的负值按 DWORD 回绕，与 winuser.h 一致
+    return inp
+
+
+# ==================== 按键映射 ====================
+
+# Windows 虚拟键码映射
+_VK_MAP = MappingProxyType({
+    # 特殊键
+    'enter': 0x0D, 'return': 0x0D,
+    'tab': 0x09,
+    'space': 0x20, ' ': 0x20,
+    'backspace': 0x08, 'back': 0x08,
+    'delete': 0x2E, 'del': 0x2E,
+    'escape': 0x1B, 'esc': 0x1B,
+
+    # 修饰键
+    'shift': 0x10, 'shiftleft': 0xA0, 'shiftright': 0xA1,
+    'ctrl': 0x11, 'control': 0x11, 'ctrlleft': 0xA2, 'ctrlright': 0xA3,
+    'alt': 0x12, 'altleft': 0xA4, 'altright': 0xA5,
+    'win': 0x5B, 'winleft': 0x5B, 'winright': 0x5C,
+    'command': 0x5B, 'cmd': 0x5B,  # Windows 键作为 Command
+
+    # 功能键
+    'f1': 0x70, 'f2': 0x71, 'f3': 0x72, 'f4': 0x73,
+    'f5': 0x74, 'f6': 0x75, 'f7': 0x76, 'f8': 0x77,
+    'f9': 0x78, 'f10': 0x79, 'f11': 0x7A, 'f12': 0x7B,
+
+    # 方向键
+    'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
+
+    # 其他
+    'home': 0x24, 'end': 0x23,
+    'pageup': 0x21, 'pgup': 0x21,
+    'pagedown': 0x22, 'pgdn': 0x22,
+    'insert': 0x2D,
+    'capslock': 0x14,
+    'numlock': 0x90,
+    'printscreen': 0x2C, 'prtsc': 0x2C,
+})
+
+
+def _build_ascii_vk() -> array:
+    """按 ASCII 码索引的虚拟键码表，规则与 _get_vk_code 的通用路径一致"""
+    return array('h', (
+        _VK_MAP.get(chr(c).lower(), ord(chr(c).upper())) for c in range(128)
+    ))
+
+
+# 单字符按键的快速查找表，按 ord() 直接索引
+_ASCII_VK = _build_ascii_vk()
+
+
+# ==================== UI 自动化 ====================
+
+# get_ui_elements 收集的可交互控件类型 (UIA 控件类型名)
+_UIA_INTERACTIVE_TYPES = (
+    "Button", "Edit", "Hyperlink", "ListItem", "MenuItem",
+    "CheckBox", "RadioButton", "TabItem", "TreeItem",
+)
+
+
+@lru_cache(maxsize=1)
+def _structure_handler_class() -> type:
+    """UIA 结构变化事件处理器类 (依赖 comtypes，首次使用时构造)"""
+    import comtypes
+    from pywinauto.uia_defines import IUIA
+
+    interface = IUIA().UIA_dll.IUIAutomationStructureChangedEventHandler
+
+    class StructureChangedHandler(comtypes.COMObject):
+        _com_interfaces_ = [interface]
+
+        def __init__(self, callback: Callable[[], None]):
+            super().__init__()
+            self._callback = callback
+
+        def HandleStructureChangedEvent(self, sender, change_type, runtime_id):
+            # 在 UIA 的事件线程中调用
+            self._callback()
+
+    return StructureChangedHandler
+
+
+# ==================== GDI 截屏 ====================
+
+SRCCOPY = 0x00CC0020
+CAPTUREBLT = 0x40000000  # 同时捕获分层窗口
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+
+class _BITMAPINFO(ctypes.Structure):
+    _fields_ = [
+        ("bmiHeader", _BITMAPINFOHEADER),
+        ("bmiColors", wintypes.DWORD * 3),
+    ]
+
+
+class _GdiCapture:
+    """
+    基于 CreateDIBSection 的 GDI 截屏
+
+    DIB 位于系统内存，BitBlt 直接写入 Python 可访问的像素缓冲区，
+    省去 GetDIBits 的同步与额外复制。屏幕/内存 DC 常驻，DIB 仅在截取尺寸变化时重建。
+    grab() 返回的缓冲区在下次截屏时被覆盖，调用方须在持有 lock 期间使用完毕
+    """
+
+    def __init__(self, user32: Any):
+        self._user32 = user32
+        self._gdi32 = ctypes.WinDLL("gdi32")
+        self._declare_prototypes()
+        self.lock = threading.Lock()
+
+        self._screen_dc = user32.GetDC(None)
+        if not self._screen_dc:
+            raise OSError("GetDC 失败")
+        self._mem_dc = self._gdi32.CreateCompatibleDC(self._screen_dc)
+        if not self._mem_dc:
+            user32.ReleaseDC(None, self._screen_dc)
+            raise OSError("CreateCompatibleDC 失败")
+
+        self._bitmap = None
+        self._old_bitmap = None
+        self._pixels = None
+        self._size = (0, 0)
+
+    def _declare_prototypes(self) -> None:
+        """声明用到的 GDI 函数原型"""
+        u, g = self._user32, self._gdi32
+        u.GetDC.argtypes = [wintypes.HWND]
+        u.GetDC.restype = wintypes.HDC
+        u.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+        u.ReleaseDC.restype = ctypes.c_int
+        g.CreateCompatibleDC.argtypes = [wintypes.HDC]
+        g.CreateCompatibleDC.restype = wintypes.HDC
+        g.DeleteDC.argtypes = [wintypes.HDC]
+        g.DeleteDC.restype = wintypes.BOOL
+        g.CreateDIBSection.argtypes = [
+            wintypes.HDC, ctypes.POINTER(_BITMAPINFO), wintypes.UINT,
+            ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD,
+        ]
+        g.CreateDIBSection.restype = wintypes.HBITMAP
+        g.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+        g.SelectObject.restype = wintypes.HGDIOBJ
+        g.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+        g.DeleteObject.restype = wintypes.BOOL
+        g.BitBlt.argtypes = [
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+            wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD,
+        ]
+        g.BitBlt.restype = wintypes.BOOL
+        g.GdiFlush.argtypes = []
+        g.GdiFlush.restype = wintypes.BOOL
+
+    def _ensure_dib(self, width: int, height: int) -> None:
+        """确保已选入 width x height 的 32 位自顶向下 DIB"""
+        if self._size == (width, height):
+            return
+        self._release_dib()
+
+        bmi = _BITMAPINFO()
+        header = bmi.bmiHeader
+        header.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height  # 负高度: 自顶向下，行序与图像一致
+        header.biPlanes = 1
+        header.biBitCount = 32
+        header.biCompression = BI_RGB
+
+        bits = ctypes.c_void_p()
+        bitmap = self._gdi32.CreateDIBSection(
+            self._mem_dc, ctypes.byref(bmi), DIB_RGB_COLORS, ctypes.byref(bits), None, 0
+        )
+        if not bitmap or not bits.value:
+            raise OSError("CreateDIBSection 失败")
+
+        self._old_bitmap = self._gdi32.SelectObject(self._mem_dc, bitmap)
+        self._bitmap = bitmap
+        self._pixels = (ctypes.c_char * (width * height * 4)).from_address(bits.value)
+        self._size = (width, height)
+
+    def grab(self, left: int, top: int, width: int, height: int) -> Any:
+        """
+        截取屏幕区域到 DIB，返回 BGRA 像素缓冲区 (行距 width * 4)
+
+        调用方须持有 lock
+        """
+        self._ensure_dib(width, height)
+        if not self._gdi32.BitBlt(
+            self._mem_dc, 0, 0, width, height,
+            self._screen_dc, left, top, SRCCOPY | CAPTUREBLT,
+        ):
+            raise OSError("BitBlt 失败")
+        # 等待 GDI 批处理完成后再读取 DIB 内存
+        self._gdi32.GdiFlush()
+        return self._pixels
+
+    def _release_dib(self) -> None:
+        if self._bitmap:
+            self._gdi32.SelectObject(self._mem_dc, self._old_bitmap)
+            self._gdi32.DeleteObject(self._bitmap)
+        self._bitmap = None
+        self._old_bitmap = None
+        self._pixels = None
+        self._size = (0, 0)
+
+    def close(self) -> None:
+        """释放 DIB 与设备上下文"""
+        with self.lock:
+            self._release_dib()
+            if self._mem_dc:
+                self._gdi32.DeleteDC(self._mem_dc)
+                self._mem_dc = None
+            if self._screen_dc:
+                self._user32.ReleaseDC(None, self._screen_dc)
+                self._screen_dc = None
+
+
 class WindowsController(ComputerController):
     """
     Windows控制器
@@ -62,6 +370,9 @@ class WindowsController(ComputerController):
     - UI 自动化
     """
 
+    # 顶层窗口列表的缓存有效期 (秒)，相邻调用之间窗口列表很少变化
+    UIA_WINDOWS_TTL = 0.25
+
     def __init__(self, use_native: bool = True, retry_attempts: int = 3):
         """
         初始化 Windows 控制器
@@ -82,21 +393,35 @@ class WindowsController(ComputerController):
         # 尝试导入原生 API
         if use_native:
             try:
-                import ctypes
                 self._ctypes = ctypes
-                self._user32 = ctypes.windll.user32
+                # 私有的 WinDLL 实例: 下面声明的函数原型不会影响 pyautogui/pywinauto
+                # 共用的 ctypes.windll.user32
+                self._user32 = ctypes.WinDLL("user32")
                 self._kernel32 = ctypes.windll.kernel32
+                self._declare_prototypes()
                 self._native_available = True
                 logger.info("Windows 原生 API 已加载")
             except Exception as e:
                 logger.warning(f"无法加载原生 API，将使用 pyautogui: {e}")
 
+        # 将系统计时器精度提高到 1ms (默认约 15.6ms)，使 time.sleep 的短间隔不被放大。
+        # 该设置作用于整个进程，close() 时恢复
+        self._winmm = None
+        if self._native_available:
+            try:
+                winmm = ctypes.WinDLL("winmm")
+                if winmm.timeBeginPeriod(1) == 0:  # TIMERR_NOERROR
+                    self._winmm = winmm
+            except OSError as e:
+                logger.debug(f"无法设置计时器精度: {e}")
+
         # 导入pyautogui
         try:
             import pyautogui
             self._pyautogui = pyautogui
             self._pyautogui.FAILSAFE = False
-            self._pyautogui.PAUSE = 0.01  # 减少默认暂停
+            # 取消 pyautogui 每次调用后的全局暂停；需要动作间隔的调用方自行 sleep
+            self._pyautogui.PAUSE = 0
             self._has_pyautogui = True
         except ImportError as e:
             if not self._native_available:
@@ -105,44 +430,213 @@ class WindowsController(ComputerController):
                 ) from e
             self._has_pyautogui = False
 
-        # 尝试导入pywinauto (可选)
-        self._has_pywinauto = False
+        # 可选依赖只检查是否安装，首次使用时才导入
+        # (pywinauto 导入时会加载 comtypes 并注册 UIA，耗时可达数百毫秒)
+        self._has_pywinauto = find_spec("pywinauto") is not None
+        if not self._has_pywinauto:
+            logger.debug("pywinauto 未安装，部分高级功能不可用")
+
+        # DXGI Desktop Duplication (dxcam，Windows 8+)，相机在首次截屏时创建
+        self._has_dxcam = find_spec("dxcam") is not None
+        self._dxcam = None
+        self._dx_lock = threading.Lock()
+        self._dx_last = None  # (bbox, frame): 屏幕无变化时复用的最近一帧
+
+        # 常驻 DC + DIB Section 的原生截屏
+        self._gdi = None
+        if self._native_available:
+            try:
+                self._gdi = _GdiCapture(self._user32)
+            except OSError as e:
+                logger.debug(f"GDI 截屏初始化失败: {e}")
+
+        # mss 用于高性能截屏 (mss 实例首次截屏时创建并复用)
+        self._has_mss = find_spec("mss") is not None
+        self._sct = None
+        self._sct_lock = threading.Lock()
+
+        self._uia_windows_cache = None  # (获取时间, 顶层窗口列表)
+
+        # get_ui_elements 的结果缓存: 活动窗口子树的结构变化事件将其标记为失效
+        self._ui_cache: List[Dict[str, Any]] = []
+        self._ui_cache_key = None  # (窗口句柄, 窗口矩形, max_depth, max_elements)
+        self._ui_cache_dirty = True
+        self._ui_watch = None  # (窗口句柄, 根元素, 事件处理器)
+
+        # PIL ImageGrab 用于截屏备选
+        self._has_pil = find_spec("PIL") is not None
+
+        self.refresh_screen_size()
+        logger.info(f"Windows 控制器初始化完成，屏幕尺寸: {self._screen_size}")
+
+    @cached_property
+    def _pywinauto(self) -> Any:
+        """pywinauto 模块，导入失败时为 None"""
         try:
             import pywinauto
-            from pywinauto.keyboard import send_keys
-            self._pywinauto = pywinauto
-            self._send_keys = send_keys
-            self._has_pywinauto = True
             logger.info("pywinauto 已加载")
+            return pywinauto
+        except ImportError as e:
+            logger.warning(f"pywinauto 导入失败: {e}")
+            self._has_pywinauto = False
+            return None
+
+    @cached_property
+    def _interp_move(self) -> Callable:
+        """平滑移动的路径插值函数，首次平滑移动时才导入 (安装 numba 时为编译版本)"""
+        from ._interp import HAS_NUMBA, interp_move
+        if HAS_NUMBA:
+            logger.debug("numba 已加载，平滑移动插值使用编译版本")
+        return interp_move
+
+    @cached_property
+    def _send_keys(self) -> Optional[Callable]:
+        """pywinauto.keyboard.send_keys，导入失败时为 None"""
+        if self._pywinauto is None:
+            return None
+        from pywinauto.keyboard import send_keys
+        return send_keys
+
+    @cached_property
+    def _uia_errors(self) -> tuple:
+        """
+        UIA 调用预期会抛出的异常 (COM 调用失败、元素已失效、找不到元素)
+
+        COMError / ElementNotFoundError 不可导入时退回 (OSError, AttributeError)
+        """
+        errors = [OSError, AttributeError]
+        try:
+            from _ctypes import COMError
+            errors.append(COMError)
         except ImportError:
-            logger.debug("pywinauto 未安装，部分高级功能不可用")
+            pass
+        try:
+            from pywinauto.findwindows import ElementNotFoundError
+            errors.append(ElementNotFoundError)
+        except ImportError:
+            pass
+        return tuple(errors)
+
+    @cached_property
+    def _uia_desktop(self) -> Any:
+        """
+        复用的 pywinauto UIA Desktop 根对象，避免每次调用重新创建 COM 根元素
 
-        # 导入 mss 用于高性能截屏
-        self._has_mss = False
+        关闭 magic lookup: 属性访问不会被当作按标题查找子窗口
+        """
+        from pywinauto import Desktop
+        return Desktop(backend="uia", allow_magic_lookup=False)
+
+    def _uia_windows(self) -> List[Any]:
+        """顶层窗口列表，UIA_WINDOWS_TTL 秒内的重复调用直接返回缓存"""
+        now = time.monotonic()
+        cached = self._uia_windows_cache
+        if cached is not None and now - cached[0] < self.UIA_WINDOWS_TTL:
+            return cached[1]
+        windows = self._uia_desktop.windows()
+        self._uia_windows_cache = (now, windows)
+        return windows
+
+    @cached_property
+    def _mss(self) -> Any:
+        """mss 模块，导入失败时为 None"""
         try:
             import mss
-            self._mss = mss
-            self._has_mss = True
             logger.debug("mss 已加载，使用高性能截屏")
-        except ImportError:
-            pass
+            return mss
+        except ImportError as e:
+            logger.warning(f"mss 导入失败: {e}")
+            self._has_mss = False
+            return None
 
-        # 导入PIL用于截屏备选
-        self._has_pil = False
+    @cached_property
+    def _image_grab(self) -> Any:
+        """PIL.ImageGrab 模块，导入失败时为 None"""
         try:
             from PIL import ImageGrab
-            self._image_grab = ImageGrab
-            self._has_pil = True
-        except ImportError:
-            pass
+            return ImageGrab
+        except ImportError as e:
+            logger.warning(f"PIL.ImageGrab 导入失败: {e}")
+            self._has_pil = False
+            return None
 
-        self._screen_size = self.get_screen_size()
-        logger.info(f"Windows 控制器初始化完成，屏幕尺寸: {self._screen_size}")
+    @cached_property
+    def _pil_image(self) -> Any:
+        """PIL.Image 模块，导入失败时为 None (只在首次访问时导入，不占截屏热路径)"""
+        try:
+            from PIL import Image
+            return Image
+        except ImportError as e:
+            logger.warning(f"PIL.Image 导入失败: {e}")
+            return None
+
+    def _declare_prototypes(self) -> None:
+        """
+        为用到的 user32 函数声明 argtypes/restype，并绑定高频函数
+
+        有原型的 ctypes 调用不必每次根据 Python 实参推断参数类型
+        """
+        # 读取窗口标题的复用缓冲区，超长标题会被截断
+        self._wbuf = ctypes.create_unicode_buffer(_TITLE_BUFFER_SIZE)
+        # 读取光标位置时复用的 POINT
+        self._cursor_pt = wintypes.POINT()
+
+        u = self._user32
+        u.GetSystemMetrics.argtypes = [ctypes.c_int]
+        u.GetSystemMetrics.restype = ctypes.c_int
+        u.SetCursorPos.argtypes = [ctypes.c_int, ctypes.c_int]
+        u.SetCursorPos.restype = wintypes.BOOL
+        u.GetCursorPos.argtypes = [ctypes.POINTER(wintypes.POINT)]
+        u.GetCursorPos.restype = wintypes.BOOL
+        u.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int]
+        u.SendInput.restype = wintypes.UINT
+        u.WindowFromPoint.argtypes = [wintypes.POINT]
+        u.WindowFromPoint.restype = wintypes.HWND
+        u.GetForegroundWindow.argtypes = []
+        u.GetForegroundWindow.restype = wintypes.HWND
+        u.FindWindowW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR]
+        u.FindWindowW.restype = wintypes.HWND
+        u.GetTopWindow.argtypes = [wintypes.HWND]
+        u.GetTopWindow.restype = wintypes.HWND
+        u.GetWindow.argtypes = [wintypes.HWND, wintypes.UINT]
+        u.GetWindow.restype = wintypes.HWND
+        u.SetForegroundWindow.argtypes = [wintypes.HWND]
+        u.SetForegroundWindow.restype = wintypes.BOOL
+        u.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        u.GetWindowTextW.restype = ctypes.c_int
+        u.GetWindowRect.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.RECT)]
+        u.GetWindowRect.restype = wintypes.BOOL
+        u.ShowWindow.argtypes = [wintypes.HWND, ctypes.c_int]
+        u.ShowWindow.restype = wintypes.BOOL
+
+        self._SetCursorPos = u.SetCursorPos
+        self._GetCursorPos = u.GetCursorPos
+        self._SendInput = u.SendInput
+        self._GetWindowTextW = u.GetWindowTextW
 
     # ==================== 屏幕信息 ====================
 
-    def get_screen_size(self) -> Size:
-        """获取屏幕尺寸"""
+    def get_screen_size(self, refresh: bool = False) -> Size:
+        """
+        获取屏幕尺寸
+
+        结果在首次查询后缓存；显示器配置变化后传入 refresh=True
+        或调用 refresh_screen_size() 更新
+
+        Args:
+            refresh: 忽略缓存，重新向系统查询
+        """
+        if self._screen_size is not None and not refresh:
+            return self._screen_size
+        return self.refresh_screen_size()
+
+    def refresh_screen_size(self) -> Size:
+        """重新查询并缓存屏幕尺寸"""
+        self._screen_size = self._query_screen_size()
+        return self._screen_size
+
+    def _query_screen_size(self) -> Size:
+        """向系统查询屏幕尺寸"""
         if self._native_available:
             try:
                 width = self._user32.GetSystemMetrics(0)  # SM_CXSCREEN
@@ -161,10 +655,9 @@ class WindowsController(ComputerController):
         """获取当前鼠标位置"""
         if self._native_available:
             try:
-                from ctypes import byref, wintypes
-                point = wintypes.POINT()
-                self._user32.GetCursorPos(byref(point))
-                return Point(point.x, point.y, CoordinateType.ABSOLUTE)
+                pt = self._cursor_pt
+                self._GetCursorPos(ctypes.byref(pt))
+                return Point(pt.x, pt.y, CoordinateType.ABSOLUTE)
             except Exception as e:
                 logger.debug(f"原生获取鼠标位置失败: {e}")
 
@@ -177,17 +670,51 @@ class WindowsController(ComputerController):
     # ==================== 截屏功能 ====================
 
     @retry_on_failure(max_attempts=3)
-    def screenshot(self, region: Optional[Rect] = None) -> bytes:
+    def screenshot(
+        self,
+        region: Optional[Rect] = None,
+        format: str = "png",
+        compress_level: int = 1,
+    ) -> Union[bytes, RawScreenshot]:
         """
         截取屏幕
 
-        优先使用 mss (更快)，备选 PIL/pyautogui
+        整屏优先使用 DXGI Desktop Duplication (需要 dxcam，Windows 8+)；
+        区域截屏与备选依次为原生 GDI (DIB Section，零额外复制)、mss、PIL、pyautogui，
+        均只 BitBlt 所需的矩形
+
+        Args:
+            region: 截取区域，None表示全屏
+            format: "png" 返回 PNG 字节; "webp" 返回无损 WebP 字节 (编码比 PNG 快，体积相近);
+                "raw" 返回 RawScreenshot (BGRA 像素)，mss 路径下直接复用其像素缓冲区，
+                不做任何编码与复制; "lz4" 返回 LZ4 block 压缩的 BGRA 像素 (需要安装 lz4)，
+                压缩极快，适合传输后立即解码的场景 (不含宽高，由 region 或屏幕尺寸得知)
+            compress_level: PNG 的 zlib 压缩级别 (0-9)。截图通常解码后即丢弃，
+                默认 1 换取远低于默认级别 6 的编码耗时，体积略大
         """
-        # 方法1: mss (最快)
-        if self._has_mss:
+        if format not in _SCREENSHOT_FORMATS:
+            raise ValueError(f"不支持的截屏格式: {format}")
+
+        # 方法1: DXGI Desktop Duplication
+        # 只用于整屏: 它总是复制整帧再裁剪，小区域交给下面按区域 BitBlt 的方法
+        if self._has_dxcam and self._is_full_screen(region):
             try:
-                from PIL import Image
-                with self._mss.mss() as sct:
+                return self._dxcam_screenshot(region, format, compress_level)
+            except Exception as e:
+                logger.debug(f"dxcam 截屏失败: {e}")
+
+        # 方法2: 原生 GDI
+        if self._gdi is not None:
+            try:
+                return self._gdi_screenshot(region, format, compress_level)
+            except Exception as e:
+                logger.debug(f"GDI 截屏失败: {e}")
+
+        # 方法3: mss
+        if self._has_mss and self._mss is not None:
+            try:
+                with self._sct_lock:
+                    sct = self._get_sct()
                     if region:
                         monitor = {
                             "left": region.left,
@@ -196,20 +723,30 @@ class WindowsController(ComputerController):
                             "height": region.height
                         }
                     else:
-                        monitor = sct.monitors[0]  # 主显示器
+                        # monitors[0] 是所有显示器拼接的虚拟屏幕，[1] 才是主显示器，
+                        # 与 get_screen_size() 的尺寸一致
+                        monitor = sct.monitors[1]
 
                     img = sct.grab(monitor)
 
-                    # 转换为 PNG
-                    pil_img = Image.frombytes("RGB", img.size, img.bgra, "raw", "BGRX")
-                    buffer = BytesIO()
-                    pil_img.save(buffer, format='PNG')
-                    return buffer.getvalue()
+                width, height = img.size
+                if format == "raw":
+                    return RawScreenshot(
+                        data=img.raw, width=width, height=height, stride=width * 4
+                    )
+                if format == "lz4":
+                    import lz4.block
+                    return lz4.block.compress(img.raw)
+
+                # 直接引用 mss 的 BGRA 缓冲区，省去 img.bgra 的整帧复制
+                pil_img = self._pil_image.frombuffer("RGB", img.size, img.raw, "raw", "BGRX", 0, 1)
+                return self._encode_image(pil_img, format, compress_level)
             except Exception as e:
                 logger.debug(f"mss 截屏失败: {e}")
+                self._close_sct()
 
-        # 方法2: PIL ImageGrab
-        if self._has_pil:
+        # 方法4: PIL ImageGrab
+        if self._has_pil and self._image_grab is not None:
             try:
                 if region:
                     bbox = (region.left, region.top, region.right, region.bottom)
@@ -217,13 +754,11 @@ class WindowsController(ComputerController):
                 else:
                     img = self._image_grab.grab()
 
-                buffer = BytesIO()
-                img.save(buffer, format='PNG')
-                return buffer.getvalue()
+                return self._encode_image(img, format, compress_level)
             except Exception as e:
                 logger.debug(f"PIL 截屏失败: {e}")
 
-        # 方法3: pyautogui
+        # 方法5: pyautogui
         if self._has_pyautogui:
             if region:
                 bbox = (region.left, region.top, region.width, region.height)
@@ -231,48 +766,221 @@ class WindowsController(ComputerController):
             else:
                 img = self._pyautogui.screenshot()
 
-            buffer = BytesIO()
-            img.save(buffer, format='PNG')
-            return buffer.getvalue()
+            return self._encode_image(img, format, compress_level)
 
         raise RuntimeError("无可用的截屏方法")
 
+    def _is_full_screen(self, region: Optional[Rect]) -> bool:
+        """region 是否为整个主显示器"""
+        if region is None:
+            return True
+        size = self.get_screen_size()
+        return (region.left, region.top, region.right, region.bottom) == (
+            0, 0, size.width, size.height
+        )
+
+    def _get_dxcam(self):
+        """获取 (必要时创建) dxcam 相机，调用方需持有 _dx_lock；创建失败后不再尝试"""
+        if self._dxcam is None:
+            try:
+                import dxcam
+                camera = dxcam.create(output_color="BGRA")
+            except Exception:
+                self._has_dxcam = False
+                raise
+            if camera is None:
+                self._has_dxcam = False
+                raise RuntimeError("dxcam 相机创建失败")
+            self._dxcam = camera
+        return self._dxcam
+
+    def _dxcam_screenshot(
+        self, region: Optional[Rect], format: str, compress_level: int
+    ) -> Union[bytes, RawScreenshot]:
+        """通过 DXGI Desktop Duplication 截取主显示器"""
+        if region:
+            bbox = (region.left, region.top, region.right, region.bottom)
+        else:
+            size = self.get_screen_size()
+            bbox = (0, 0, size.width, size.height)
+
+        with self._dx_lock:
+            frame = self._get_dxcam().grab(region=bbox)
+            if frame is None:
+                # 自上一帧以来屏幕没有变化，复用同一区域的最近一帧
+                if self._dx_last is None or self._dx_last[0] != bbox:
+                    raise RuntimeError("dxcam 暂无新帧")
+                frame = self._dx_last[1]
+            else:
+                # 区域截取得到的是整帧的切片视图，转为连续内存以便按缓冲区读取
+                if not frame.flags.c_contiguous:
+                    frame = frame.copy()
+                self._dx_last = (bbox, frame)
+
+        height, width = frame.shape[:2]
+        if format == "raw":
+            return RawScreenshot(
+                data=frame.tobytes(), width=width, height=height, stride=width * 4
+            )
+        if format == "lz4":
+            import lz4.block
+            return lz4.block.compress(frame)
+
+        img = self._pil_image.frombuffer("RGB", (width, height), frame, "raw", "BGRX", 0, 1)
+        return self._encode_image(img, format, compress_level)
+
+    def _gdi_screenshot(
+        self, region: Optional[Rect], format: str, compress_level: int
+    ) -> Union[bytes, RawScreenshot]:
+        """通过常驻 DIB Section 截屏并编码"""
+        if region:
+            left, top, width, height = region.left, region.top, region.width, region.height
+        else:
+            size = self.get_screen_size()
+            left, top, width, height = 0, 0, size.width, size.height
+
+        gdi = self._gdi
+        with gdi.lock:
+            pixels = gdi.grab(left, top, width, height)
+            # 像素缓冲区下次截屏即被覆盖，须在锁内完成复制或编码
+            if format == "raw":
+                return RawScreenshot(
+                    data=bytes(pixels), width=width, height=height, stride=width * 4
+                )
+            if format == "lz4":
+                import lz4.block
+                return lz4.block.compress(pixels)
+
+            img = self._pil_image.frombuffer(
+                "RGB", (width, height), pixels, "raw", "BGRX", 0, 1
+            )
+            return self._encode_image(img, format, compress_level)
+
+    @staticmethod
+    def _encode_image(img, format: str, compress_level: int = 1) -> Union[bytes, RawScreenshot]:
+        """将 PIL 图像编码为指定格式"""
+        if format in ("raw", "lz4"):
+            data = img.convert("RGBA").tobytes("raw", "BGRA")
+            if format == "lz4":
+                import lz4.block
+                return lz4.block.compress(data)
+            return RawScreenshot(
+                data=data,
+                width=img.width,
+                height=img.height,
+                stride=img.width * 4,
+            )
+
+        buffer = BytesIO()
+        if format == "webp":
+            img.save(buffer, format='WEBP', lossless=True, quality=0)
+        else:
+            img.save(buffer, format='PNG', compress_level=compress_level, optimize=False)
+        return buffer.getvalue()
+
+    def _get_sct(self):
+        """获取 (必要时创建) 复用的 mss 实例，调用方需持有 _sct_lock"""
+        if self._sct is None:
+            self._sct = self._mss.mss()
+        return self._sct
+
+    def _close_sct(self) -> None:
+        """关闭复用的 mss 实例，下次截屏时重新创建"""
+        with self._sct_lock:
+            if self._sct is not None:
+                try:
+                    self._sct.close()
+                except Exception:
+                    pass
+                self._sct = None
+
+    def close(self) -> None:
+        """释放截屏设备上下文、UIA 事件订阅等常驻资源，并恢复系统计时器精度"""
+        if self._has_pywinauto:
+            self._unwatch_structure()
+        with self._dx_lock:
+            if self._dxcam is not None:
+                self._dxcam.release()
+                self._dxcam = None
+            self._dx_last = None
+        if self._gdi is not None:
+            self._gdi.close()
+            self._gdi = None
+        self._close_sct()
+        if self._winmm is not None:
+            self._winmm.timeEndPeriod(1)
+            self._winmm = None
+
     # ==================== 鼠标控制 ====================
 
     def _native_mouse_move(self, x: int, y: int) -> None:
         """原生 API 移动鼠标"""
-        self._user32.SetCursorPos(x, y)
+        self._SetCursorPos(x, y)
+
+    def _send_input(self, *inputs: _INPUT) -> None:
+        """
+        通过一次 SendInput 调用原子地注入一批输入事件
 
-    def _native_mouse_event(self, flags: int, x: int = 0, y: int = 0, data: int = 0) -> None:
+        SendInput 只注入了部分事件时只重试尚未注入的部分，已送达的事件不会重放；
+        重试次数由构造参数 retry_attempts 决定
+        """
+        size = ctypes.sizeof(_INPUT)
+        attempts = max(self._retry_attempts, 1)
+        for attempt in range(attempts):
+            count = len(inputs)
+            if not count:
+                return
+            sent = self._SendInput(count, (_INPUT * count)(*inputs), size)
+            if sent == count:
+                return
+            inputs = inputs[sent:]
+            if attempt < attempts - 1:
+                logger.debug(
+                    f"SendInput 仅注入 {sent}/{count} 个事件，重试剩余事件 {attempt + 1}/{attempts}"
+                )
+                time.sleep(0.01)
+        raise OSError(f"SendInput 重试 {attempts} 次后仍有 {len(inputs)} 个事件未注入")
+
+    def _cursor_at(self, x: int, y: int) -> bool:
+        """光标是否已位于 (x, y)"""
+        if not self._native_available:
+            return False
+        pt = self._cursor_pt
+        return bool(self._GetCursorPos(ctypes.byref(pt))) and pt.x == x and pt.y == y
+
+    def _native_mouse_event(self, flags: int, data: int = 0) -> None:
         """发送原生鼠标事件"""
-        self._user32.mouse_event(flags, x, y, data, 0)
+        self._send_input(_mouse_input(flags, data))
 
-    @retry_on_failure(max_attempts=3)
     def mouse_move(self, x: int, y: int, duration: float = 0.0) -> None:
         """移动鼠标"""
         if duration > 0:
-            # 平滑移动
+            # 平滑移动: 整数插值，按绝对截止时间调度以免 sleep 误差累积
             start = self.get_mouse_position()
             steps = max(int(duration * 60), 1)
+            path = self._interp_move(int(start.x), int(start.y), x, y, steps)
+            frame = duration / steps
 
-            for i in range(1, steps + 1):
-                t = i / steps
-                cur_x = int(start.x + (x - start.x) * t)
-                cur_y = int(start.y + (y - start.y) * t)
-
-                if self._native_available:
-                    self._native_mouse_move(cur_x, cur_y)
-                elif self._has_pyautogui:
-                    self._pyautogui.moveTo(cur_x, cur_y, _pause=False)
+            if self._native_available:
+                move = self._native_mouse_move
+            elif self._has_pyautogui:
+                def move(px: int, py: int) -> None:
+                    self._pyautogui.moveTo(px, py, _pause=False)
+            else:
+                return
 
-                time.sleep(duration / steps)
+            t0 = time.perf_counter()
+            for i, (px, py) in enumerate(path, 1):
+                move(px, py)
+                remaining = t0 + i * frame - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
         else:
             if self._native_available:
                 self._native_mouse_move(x, y)
             elif self._has_pyautogui:
                 self._pyautogui.moveTo(x, y, _pause=False)
 
-    @retry_on_failure(max_attempts=3)
     def mouse_click(
         self,
         x: Optional[int] = None,
@@ -282,7 +990,7 @@ class WindowsController(ComputerController):
         interval: float = 0.1
     ) -> None:
         """鼠标点击"""
-        if x is not None and y is not None:
+        if x is not None and y is not None and not self._cursor_at(x, y):
             self.mouse_move(x, y)
             time.sleep(0.02)  # 短暂等待确保位置更新
 
@@ -302,16 +1010,21 @@ class WindowsController(ComputerController):
             else:
                 down, up = MOUSEEVENTF_MIDDLEDOWN, MOUSEEVENTF_MIDDLEUP
 
+            if interval <= 0:
+                # 所有点击的按下/释放在同一次 SendInput 中原子注入
+                self._send_input(*(
+                    _mouse_input(flag) for _ in range(clicks) for flag in (down, up)
+                ))
+                return
+
             for i in range(clicks):
-                self._native_mouse_event(down)
-                time.sleep(0.01)
-                self._native_mouse_event(up)
+                # 按下与释放在同一次 SendInput 中注入，中间不会被其他输入打断
+                self._send_input(_mouse_input(down), _mouse_input(up))
                 if i < clicks - 1:
                     time.sleep(interval)
         elif self._has_pyautogui:
             self._pyautogui.click(x, y, clicks=clicks, interval=interval, button=button.value)
 
-    @retry_on_failure(max_attempts=3)
     def mouse_down(self, button: MouseButton = MouseButton.LEFT) -> None:
         """按下鼠标"""
         if self._native_available:
@@ -324,7 +1037,6 @@ class WindowsController(ComputerController):
         elif self._has_pyautogui:
             self._pyautogui.mouseDown(button=button.value)
 
-    @retry_on_failure(max_attempts=3)
     def mouse_up(self, button: MouseButton = MouseButton.LEFT) -> None:
         """释放鼠标"""
         if self._native_available:
@@ -337,7 +1049,6 @@ class WindowsController(ComputerController):
         elif self._has_pyautogui:
             self._pyautogui.mouseUp(button=button.value)
 
-    @retry_on_failure(max_attempts=3)
     def mouse_scroll(
         self,
         clicks: int,
@@ -346,7 +1057,7 @@ class WindowsController(ComputerController):
         horizontal: bool = False
     ) -> None:
         """鼠标滚轮"""
-        if x is not None and y is not None:
+        if x is not None and y is not None and not self._cursor_at(x, y):
             self.mouse_move(x, y)
 
         if self._native_available:
@@ -382,47 +1093,19 @@ class WindowsController(ComputerController):
 
     # ==================== 键盘控制 ====================
 
-    def _get_vk_code(self, key: str) -> Optional[int]:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _get_vk_code(key: str) -> Optional[int]:
         """获取虚拟键码"""
-        # Windows 虚拟键码映射
-        vk_map = {
-            # 特殊键
-            'enter': 0x0D, 'return': 0x0D,
-            'tab': 0x09,
-            'space': 0x20, ' ': 0x20,
-            'backspace': 0x08, 'back': 0x08,
-            'delete': 0x2E, 'del': 0x2E,
-            'escape': 0x1B, 'esc': 0x1B,
-
-            # 修饰键
-            'shift': 0x10, 'shiftleft': 0xA0, 'shiftright': 0xA1,
-            'ctrl': 0x11, 'control': 0x11, 'ctrlleft': 0xA2, 'ctrlright': 0xA3,
-            'alt': 0x12, 'altleft': 0xA4, 'altright': 0xA5,
-            'win': 0x5B, 'winleft': 0x5B, 'winright': 0x5C,
-            'command': 0x5B, 'cmd': 0x5B,  # Windows 键作为 Command
-
-            # 功能键
-            'f1': 0x70, 'f2': 0x71, 'f3': 0x72, 'f4': 0x73,
-            'f5': 0x74, 'f6': 0x75, 'f7': 0x76, 'f8': 0x77,
-            'f9': 0x78, 'f10': 0x79, 'f11': 0x7A, 'f12': 0x7B,
-
-            # 方向键
-            'left': 0x25, 'up': 0x26, 'right': 0x27, 'down': 0x28,
-
-            # 其他
-            'home': 0x24, 'end': 0x23,
-            'pageup': 0x21, 'pgup': 0x21,
-            'pagedown': 0x22, 'pgdn': 0x22,
-            'insert': 0x2D,
-            'capslock': 0x14,
-            'numlock': 0x90,
-            'printscreen': 0x2C, 'prtsc': 0x2C,
-        }
+        if len(key) == 1:
+            c = ord(key)
+            if c < 128:
+                return _ASCII_VK[c]
 
         key_lower = key.lower()
 
-        if key_lower in vk_map:
-            return vk_map[key_lower]
+        if key_lower in _VK_MAP:
+            return _VK_MAP[key_lower]
 
         # 单字符
         if len(key) == 1:
@@ -432,30 +1115,29 @@ class WindowsController(ComputerController):
 
     def _native_key_event(self, vk: int, down: bool) -> None:
         """发送原生键盘事件"""
-        KEYEVENTF_KEYUP = 0x0002
-        flags = 0 if down else KEYEVENTF_KEYUP
-        self._user32.keybd_event(vk, 0, flags, 0)
+        self._send_input(_key_input(vk, down))
 
-    @retry_on_failure(max_attempts=3)
     def type_text(self, text: str, interval: float = 0.0) -> None:
         """输入文本"""
-        if self._has_pywinauto:
+        if self._has_pywinauto and self._send_keys is not None:
             # pywinauto 支持更多特殊字符和中文
             self._send_keys(text, pause=interval, with_spaces=True)
         elif self._has_pyautogui:
             self._pyautogui.write(text, interval=interval)
         elif self._native_available:
-            # 原生方式逐字符输入
+            # 原生方式: 无间隔时整段文本一次 SendInput 注入，否则每个字符一次
+            inputs = []
             for char in text:
                 vk = self._get_vk_code(char)
                 if vk:
-                    self._native_key_event(vk, True)
-                    time.sleep(0.01)
-                    self._native_key_event(vk, False)
                     if interval > 0:
+                        self._send_input(_key_input(vk, True), _key_input(vk, False))
                         time.sleep(interval)
+                    else:
+                        inputs.append(_key_input(vk, True))
+                        inputs.append(_key_input(vk, False))
+            self._send_input(*inputs)
 
-    @retry_on_failure(max_attempts=3)
     def key_press(self, key: str) -> None:
         """按键"""
         if self._native_available:
@@ -469,7 +1151,6 @@ class WindowsController(ComputerController):
         if self._has_pyautogui:
             self._pyautogui.press(key)
 
-    @retry_on_failure(max_attempts=3)
     def key_down(self, key: str) -> None:
         """按下按键"""
         if self._native_available:
@@ -481,7 +1162,6 @@ class WindowsController(ComputerController):
         if self._has_pyautogui:
             self._pyautogui.keyDown(key)
 
-    @retry_on_failure(max_attempts=3)
     def key_up(self, key: str) -> None:
         """释放按键"""
         if self._native_available:
@@ -495,6 +1175,16 @@ class WindowsController(ComputerController):
 
     def hotkey(self, *keys: str) -> None:
         """组合键"""
+        if self._native_available and keys:
+            vks = [self._get_vk_code(key) for key in keys]
+            if all(vks):
+                # 按下与逆序释放放在同一批 SendInput 中，事件顺序由系统保证
+                self._send_input(
+                    *[_key_input(vk, True) for vk in vks],
+                    *[_key_input(vk, False) for vk in reversed(vks)],
+                )
+                return
+
         if self._has_pyautogui:
             self._pyautogui.hotkey(*keys)
         else:
@@ -511,14 +1201,10 @@ class WindowsController(ComputerController):
         """获取指定位置的窗口信息"""
         if self._native_available:
             try:
-                from ctypes import create_unicode_buffer, wintypes
-
                 hwnd = self._user32.WindowFromPoint(wintypes.POINT(x, y))
                 if hwnd:
                     # 获取窗口标题
-                    length = self._user32.GetWindowTextLengthW(hwnd) + 1
-                    buffer = create_unicode_buffer(length)
-                    self._user32.GetWindowTextW(hwnd, buffer, length)
+                    self._GetWindowTextW(hwnd, self._wbuf, _TITLE_BUFFER_SIZE)
 
                     # 获取窗口矩形
                     rect = wintypes.RECT()
@@ -526,17 +1212,22 @@ class WindowsController(ComputerController):
 
                     return {
                         "hwnd": hwnd,
-                        "title": buffer.value,
+                        "title": self._wbuf.value,
                         "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
                     }
             except Exception as e:
                 logger.debug(f"获取窗口信息失败: {e}")
 
         if self._has_pywinauto:
+            uia_errors = self._uia_errors
             try:
-                from pywinauto import Desktop
-                windows = Desktop(backend="uia").windows()
-                for win in windows:
+                windows = self._uia_windows()
+            except uia_errors as e:
+                logger.debug(f"枚举 UIA 窗口失败: {e}")
+                windows = []
+            for win in windows:
+                # 单个窗口失效 (已关闭等) 不影响检查其余窗口
+                try:
                     rect = win.rectangle()
                     if rect.left <= x <= rect.right and rect.top <= y <= rect.bottom:
                         return {
@@ -544,8 +1235,8 @@ class WindowsController(ComputerController):
                             "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
                             "class_name": win.class_name(),
                         }
-            except Exception:
-                pass
+                except uia_errors as e:
+                    logger.debug(f"读取 UIA 窗口信息失败: {e}")
 
         return None
 
@@ -553,20 +1244,16 @@ class WindowsController(ComputerController):
         """获取当前活动窗口"""
         if self._native_available:
             try:
-                from ctypes import create_unicode_buffer, wintypes
-
                 hwnd = self._user32.GetForegroundWindow()
                 if hwnd:
-                    length = self._user32.GetWindowTextLengthW(hwnd) + 1
-                    buffer = create_unicode_buffer(length)
-                    self._user32.GetWindowTextW(hwnd, buffer, length)
+                    self._GetWindowTextW(hwnd, self._wbuf, _TITLE_BUFFER_SIZE)
 
                     rect = wintypes.RECT()
                     self._user32.GetWindowRect(hwnd, self._ctypes.byref(rect))
 
                     return {
                         "hwnd": hwnd,
-                        "title": buffer.value,
+                        "title": self._wbuf.value,
                         "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
                     }
             except Exception as e:
@@ -574,8 +1261,7 @@ class WindowsController(ComputerController):
 
         if self._has_pywinauto:
             try:
-                from pywinauto import Desktop
-                win = Desktop(backend="uia").active()
+                win = self._uia_desktop.active()
                 if win:
                     rect = win.rectangle()
                     return {
@@ -583,8 +1269,8 @@ class WindowsController(ComputerController):
                         "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
                         "class_name": win.class_name(),
                     }
-            except Exception:
-                pass
+            except self._uia_errors as e:
+                logger.debug(f"UIA 获取活动窗口失败: {e}")
 
         if self._has_pyautogui:
             try:
@@ -599,98 +1285,265 @@ class WindowsController(ComputerController):
         """聚焦到指定标题的窗口"""
         if self._native_available:
             try:
-                from ctypes import WINFUNCTYPE, create_unicode_buffer, wintypes
-
-                target_hwnd = None
-
-                # 枚举窗口回调
-                WNDENUMPROC = WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
-
-                def enum_callback(hwnd, lparam):
-                    nonlocal target_hwnd
-                    length = self._user32.GetWindowTextLengthW(hwnd) + 1
-                    buffer = create_unicode_buffer(length)
-                    self._user32.GetWindowTextW(hwnd, buffer, length)
-
-                    if title.lower() in buffer.value.lower():
-                        target_hwnd = hwnd
-                        return False  # 停止枚举
+                # 标题完全匹配时一次 FindWindowW 即可，无需枚举
+                hwnd = self._user32.FindWindowW(None, title)
+                if hwnd:
+                    self._user32.SetForegroundWindow(hwnd)
                     return True
 
-                self._user32.EnumWindows(WNDENUMPROC(enum_callback), 0)
-
-                if target_hwnd:
-                    self._user32.SetForegroundWindow(target_hwnd)
-                    return True
+                # 按 Z 序拉取顶层窗口做子串匹配，不经过 EnumWindows 的 Python 回调
+                needle = title.lower()
+                wbuf = self._wbuf
+                get_text = self._GetWindowTextW
+                get_window = self._user32.GetWindow
+                hwnd = self._user32.GetTopWindow(None)
+                while hwnd:
+                    # 无标题窗口直接跳过，不构造 Python 字符串
+                    if get_text(hwnd, wbuf, _TITLE_BUFFER_SIZE) and needle in wbuf.value.lower():
+                        self._user32.SetForegroundWindow(hwnd)
+                        return True
+                    hwnd = get_window(hwnd, 2)  # GW_HWNDNEXT
             except Exception as e:
                 logger.debug(f"聚焦窗口失败: {e}")
 
         if self._has_pywinauto:
+            uia_errors = self._uia_errors
+            needle = title.lower()
             try:
-                from pywinauto import Desktop
-                windows = Desktop(backend="uia").windows()
-                for win in windows:
-                    if title.lower() in win.window_text().lower():
+                windows = self._uia_windows()
+            except uia_errors as e:
+                logger.debug(f"枚举 UIA 窗口失败: {e}")
+                windows = []
+            for win in windows:
+                try:
+                    if needle in win.window_text().lower():
                         win.set_focus()
                         return True
-            except Exception:
-                pass
+                except uia_errors as e:
+                    logger.debug(f"UIA 聚焦窗口失败: {e}")
 
         return False
 
-    def get_ui_elements(self, max_depth: int = 3) -> List[Dict[str, Any]]:
+    def get_ui_elements(
+        self, max_depth: int = 3, max_elements: int = 500, refresh: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         获取当前窗口的UI元素列表
 
-        使用Windows UI Automation获取可交互元素
+        使用Windows UI Automation获取可交互元素。结果会被缓存，直到活动窗口切换、
+        窗口移动/缩放或其子树发生结构变化 (UIA StructureChanged 事件)；
+        控件名称等属性的变化不会使缓存失效，需要时传入 refresh=True
 
         Args:
             max_depth: 递归深度限制
+            max_elements: 最多收集的元素数量，达到后停止遍历
+            refresh: 忽略缓存，重新遍历
         """
         if not self._has_pywinauto:
             return []
 
         elements = []
+        uia_errors = self._uia_errors
         try:
-            from pywinauto import Desktop
-            win = Desktop(backend="uia").active()
+            win = self._uia_desktop.active()
             if win:
-                self._collect_elements(win, elements, depth=0, max_depth=max_depth)
-        except Exception as e:
+                rect = win.rectangle()
+                handle = win.handle
+                key = (
+                    handle, (rect.left, rect.top, rect.right, rect.bottom),
+                    max_depth, max_elements,
+                )
+                if not refresh and not self._ui_cache_dirty and key == self._ui_cache_key:
+                    return list(self._ui_cache)
+
+                # 先订阅 (切换窗口时会取消旧订阅并标记缓存失效)，遍历前再清除标记，
+                # 遍历期间到达的事件会重新标记
+                watching = self._watch_structure(win, handle)
+                self._ui_cache_dirty = False
+
+                try:
+                    self._collect_cached_elements(win, elements, max_depth, max_elements)
+                except uia_errors as e:
+                    # 缓存请求不可用时逐个控件查询
+                    logger.debug(f"UIA 缓存请求失败，逐个查询控件: {e}")
+                    elements.clear()
+                    self._collect_elements(win, elements, max_depth, max_elements)
+
+                # 无法订阅结构变化事件时不缓存，每次重新遍历
+                self._ui_cache = elements
+                self._ui_cache_key = key if watching else None
+                return list(elements)
+        except uia_errors as e:
             logger.debug(f"获取 UI 元素失败: {e}")
 
         return elements
 
+    def _mark_ui_cache_dirty(self) -> None:
+        """结构变化事件回调: 下次 get_ui_elements 重新遍历"""
+        self._ui_cache_dirty = True
+
+    def _watch_structure(self, win, handle: int) -> bool:
+        """在活动窗口上订阅子树结构变化事件 (已订阅同一窗口时直接返回)，失败返回 False"""
+        if self._ui_watch is not None and self._ui_watch[0] == handle:
+            return True
+        self._unwatch_structure()
+        try:
+            from pywinauto.uia_defines import IUIA
+
+            uia = IUIA()
+            element = win.element_info.element
+            handler = _structure_handler_class()(self._mark_ui_cache_dirty)
+            uia.iuia.AddStructureChangedEventHandler(
+                element, uia.tree_scope["subtree"], None, handler
+            )
+        except (ImportError, *self._uia_errors) as e:
+            logger.debug(f"订阅 UIA 结构变化事件失败: {e}")
+            return False
+        self._ui_watch = (handle, element, handler)
+        return True
+
+    def _unwatch_structure(self) -> None:
+        """取消结构变化事件订阅，避免 COM 对象泄漏"""
+        if self._ui_watch is None:
+            return
+        _, element, handler = self._ui_watch
+        self._ui_watch = None
+        self._ui_cache_dirty = True
+        try:
+            from pywinauto.uia_defines import IUIA
+            IUIA().iuia.RemoveStructureChangedEventHandler(element, handler)
+        except self._uia_errors as e:
+            logger.debug(f"取消 UIA 事件订阅失败: {e}")
+
+    @cached_property
+    def _uia_cache_request(self) -> Any:
+        """
+        预取名称/矩形/控件类型/AutomationId 的 UIA CacheRequest
+
+        作用范围为整个子树: 一次跨进程调用即可取回所有属性与树结构。
+        TreeFilter 在 UIA 侧只保留屏幕内、已启用的可交互控件，其余节点不会被封送，
+        被过滤节点下的匹配控件提升为最近的匹配祖先的子节点
+        """
+        from pywinauto.uia_defines import IUIA
+
+        uia = IUIA()
+        dll = uia.UIA_dll
+        request = uia.iuia.CreateCacheRequest()
+        for property_id in (
+            dll.UIA_NamePropertyId,
+            dll.UIA_BoundingRectanglePropertyId,
+            dll.UIA_ControlTypePropertyId,
+            dll.UIA_AutomationIdPropertyId,
+        ):
+            request.AddProperty(property_id)
+        request.TreeScope = uia.tree_scope["subtree"]
+
+        iuia = uia.iuia
+        type_condition = None
+        for type_name in _UIA_INTERACTIVE_TYPES:
+            condition = iuia.CreatePropertyCondition(
+                dll.UIA_ControlTypePropertyId, uia.known_control_types[type_name]
+            )
+            type_condition = (
+                condition if type_condition is None
+                else iuia.CreateOrCondition(type_condition, condition)
+            )
+        request.TreeFilter = iuia.CreateAndCondition(
+            iuia.CreateAndCondition(
+                iuia.CreatePropertyCondition(dll.UIA_IsOffscreenPropertyId, False),
+                iuia.CreatePropertyCondition(dll.UIA_IsEnabledPropertyId, True),
+            ),
+            type_condition,
+        )
+        return request
+
+    def _collect_cached_elements(
+        self,
+        root,
+        elements: List[Dict[str, Any]],
+        max_depth: int,
+        max_elements: int,
+    ) -> None:
+        """
+        通过 UIA 缓存一次取回过滤后的子树，再在本地广度优先收集UI元素
+
+        depth 为过滤后树中的层级 (根窗口为 0)
+        """
+        from pywinauto.uia_defines import IUIA
+
+        control_type_names = IUIA().known_control_type_ids
+        cached_root = root.element_info.element.BuildUpdatedCache(self._uia_cache_request)
+
+        # 循环内用到的方法提前绑定为局部变量
+        append = elements.append
+        queue = deque([(cached_root, 0)])
+        pop, extend = queue.popleft, queue.extend
+        while queue and len(elements) < max_elements:
+            element, depth = pop()
+            rect = element.CachedBoundingRectangle
+            control_type = element.CachedControlType
+            append({
+                "type": control_type_names.get(control_type, control_type),
+                "name": element.CachedName or "",
+                "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
+                "automation_id": element.CachedAutomationId or "",
+                "depth": depth,
+            })
+
+            # 子控件入队 (读取的是本地缓存，不再跨进程)
+            if depth < max_depth:
+                children = element.GetCachedChildren()
+                if children is not None:
+                    extend(
+                        (children.GetElement(i), depth + 1) for i in range(children.Length)
+                    )
+
     def _collect_elements(
         self,
-        control,
+        root,
         elements: List[Dict[str, Any]],
-        depth: int,
-        max_depth: int
+        max_depth: int,
+        max_elements: int,
     ) -> None:
-        """递归收集UI元素"""
-        if depth > max_depth:
-            return
+        """
+        逐个查询控件的广度优先遍历 (UIA 缓存请求不可用时使用)，收集满 max_elements 个后提前结束
 
-        try:
-            rect = control.rectangle()
-
-            # 只收集可见且有意义的元素
-            if rect.width() > 0 and rect.height() > 0:
-                element = {
-                    "type": control.element_info.control_type,
-                    "name": control.window_text(),
-                    "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
-                    "automation_id": getattr(control.element_info, "automation_id", ""),
-                    "depth": depth,
-                }
-                elements.append(element)
-
-            # 递归子控件
-            for child in control.children():
-                self._collect_elements(child, elements, depth + 1, max_depth)
-        except Exception:
-            pass
+        与 _uia_cache_request 的 TreeFilter 保持一致: 根窗口之外只收集屏幕内、已启用的
+        可交互控件，不匹配的控件不收集但继续遍历其子树，depth 为过滤后树中的层级。
+        单个控件读取失败 (多为已失效的元素) 只跳过该控件及其子树，已收集的结果保留
+        """
+        uia_errors = self._uia_errors
+        interactive_types = frozenset(_UIA_INTERACTIVE_TYPES)
+        # 循环内用到的方法提前绑定为局部变量
+        append = elements.append
+        # (控件, 匹配时的层级, 是否为根窗口)
+        queue = deque([(root, 0, True)])
+        pop, extend = queue.popleft, queue.extend
+        while queue and len(elements) < max_elements:
+            control, depth, is_root = pop()
+            try:
+                info = control.element_info
+                if is_root or (
+                    info.control_type in interactive_types and info.enabled and info.visible
+                ):
+                    rect = control.rectangle()
+                    append({
+                        "type": info.control_type,
+                        "name": control.window_text(),
+                        "rect": Rect(rect.left, rect.top, rect.right, rect.bottom),
+                        "automation_id": getattr(info, "automation_id", ""),
+                        "depth": depth,
+                    })
+                    child_depth = depth + 1
+                else:
+                    # 被过滤的控件下的匹配控件提升为最近的匹配祖先的子节点
+                    child_depth = depth
+
+                # 子控件入队
+                if child_depth <= max_depth:
+                    extend((child, child_depth, False) for child in control.children())
+            except uia_errors as e:
+                logger.debug(f"读取 UI 控件失败，跳过: {e}")
 
     def minimize_window(self, hwnd: int = None) -> bool:
         """最小化窗口"""
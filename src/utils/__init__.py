@@ -6,19 +6,9 @@ Utils Module - 工具模块
 - debug: 调试工具
 """
 
-from .debug import (
-    DebugAgent,
-    DebugFrame,
-    DebugSession,
-    DebugViewer,
-    annotate_image,
-    annotate_screenshot,
-    create_debug_agent,
-    quick_screenshot_debug,
-    save_debug_screenshot,
-)
 from .logger import (
     ActionLogAdapter,
+    flush_logs,
     get_action_logger,
     get_logger,
     init_logging,
@@ -32,6 +22,7 @@ __all__ = [
     "get_logger",
     "get_action_logger",
     "init_logging",
+    "flush_logs",
     "setup_logger",
     "set_level",
     "ActionLogAdapter",
@@ -47,3 +38,25 @@ __all__ = [
     "create_debug_agent",
     "quick_screenshot_debug",
 ]
+
+# 调试工具依赖 PIL，按需导入 (PEP 562)，只使用日志时不加载
+_DEBUG_EXPORTS = frozenset({
+    "DebugViewer",
+    "DebugAgent",
+    "DebugFrame",
+    "DebugSession",
+    "save_debug_screenshot",
+    "annotate_screenshot",
+    "annotate_image",
+    "create_debug_agent",
+    "quick_screenshot_debug",
+})
+
+
+def __getattr__(name):
+    if name in _DEBUG_EXPORTS:
+        from . import debug
+        value = getattr(debug, name)
+        globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
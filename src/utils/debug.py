@@ -22,16 +22,22 @@ Debug Tools - 可视化调试工具
 import base64
 import json
 import os
+import queue
+import threading
 import time
 from dataclasses import asdict, dataclass
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
-from ..core.types import Action, ActionResult, Rect, ScreenElement
+from ..core.types import Action, ActionResult, ScreenElement
+from .logger import get_logger
+
+logger = get_logger(__name__)
 
 # ==================== 配置 ====================
 
@@ -49,18 +55,33 @@ ANNOTATION_COLORS = {
     "selected": (255, 255, 0, 200),   # 黄色 (高亮)
 }
 
+# 小写键的颜色表，get_element_color 未命中缓存时只需一次 dict 查找
+_ANNOTATION_COLORS_LOWER = {k.lower(): v for k, v in ANNOTATION_COLORS.items()}
+
+# 调试报告中标注截图的最大尺寸 (页面中的显示宽度远小于原始分辨率)
+REPORT_IMAGE_SIZE = (1280, 720)
+
 LABEL_FONT_SIZE = 12
 BOX_LINE_WIDTH = 2
 
 
+# 写盘队列中通知后台线程退出的标记
+_WRITER_STOP = object()
+
+
 # ==================== 调试数据结构 ====================
 
 @dataclass
 class DebugFrame:
-    """调试帧 - 记录单步执行状态"""
+    """
+    调试帧 - 记录单步执行状态
+
+    截图不内嵌在帧数据中，screenshot_path 为原始截图相对会话目录的文件名，
+    需要时通过 read_screenshot() 读取
+    """
     step: int
     timestamp: float
-    screenshot_base64: str
+    screenshot_path: str
     elements: List[Dict[str, Any]]
     action: Optional[Dict[str, Any]]
     result: Optional[Dict[str, Any]]
@@ -71,8 +92,22 @@ class DebugFrame:
 
     @classmethod
     def from_dict(cls, data: dict) -> "DebugFrame":
+        data = dict(data)
+        # 旧版会话内嵌 base64 截图，不再载入内存
+        if "screenshot_base64" in data:
+            data.pop("screenshot_base64")
+            data.setdefault("screenshot_path", "")
         return cls(**data)
 
+    def read_screenshot(self, session_dir: str) -> Optional[bytes]:
+        """读取原始截图，文件不存在时返回 None"""
+        if not self.screenshot_path:
+            return None
+        path = Path(session_dir) / self.screenshot_path
+        if not path.exists():
+            return None
+        return path.read_bytes()
+
 
 @dataclass
 class DebugSession:
@@ -108,10 +143,57 @@ class DebugSession:
 
 # ==================== 图像标注工具 ====================
 
+@lru_cache(maxsize=1)
+def _get_font() -> ImageFont.ImageFont:
+    """加载标签字体 (只在首次调用时读取字体文件)"""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", LABEL_FONT_SIZE)
+    except OSError:
+        try:
+            return ImageFont.truetype("arial.ttf", LABEL_FONT_SIZE)
+        except OSError:
+            return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1)
+def _get_fpnge():
+    """fpnge 快速 PNG 编码器，未安装时返回 None"""
+    try:
+        import fpnge
+        return fpnge
+    except ImportError:
+        return None
+
+
+def _encode_png(image: Image.Image, compress_level: int) -> bytes:
+    """
+    PNG 编码
+
+    compress_level <= 1 且安装了 fpnge 时使用 fpnge (比 zlib 快数倍，压缩率与 level 1 相近)，
+    否则使用 PIL
+    """
+    if compress_level <= 1:
+        fpnge = _get_fpnge()
+        if fpnge is not None:
+            return fpnge.fromPIL(image)
+
+    buffer = BytesIO()
+    image.save(buffer, format='PNG', compress_level=compress_level)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=1024)
+def _label_size(text: str) -> Tuple[int, int]:
+    """标签文字的宽高，跨帧重复的标签直接复用"""
+    bbox = _get_font().getbbox(text)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+@lru_cache(maxsize=32)
 def get_element_color(element_type: str) -> Tuple[int, int, int, int]:
-    """根据元素类型获取颜色"""
+    """根据元素类型获取颜色 (元素类型种类很少，结果按类型缓存)"""
     element_type = (element_type or "default").lower()
-    return ANNOTATION_COLORS.get(element_type, ANNOTATION_COLORS["default"])
+    return _ANNOTATION_COLORS_LOWER.get(element_type, ANNOTATION_COLORS["default"])
 
 
 def annotate_image(
@@ -134,23 +216,16 @@ def annotate_image(
     Returns:
         标注后的图像
     """
-    # 创建可绘制的副本
-    annotated = image.copy().convert("RGBA")
-    overlay = Image.new("RGBA", annotated.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    # 直接在 RGB 副本上绘制 (convert 总是返回新图像)，不做逐像素的 alpha 混合
+    annotated = image.convert("RGB")
+    draw = ImageDraw.Draw(annotated)
 
-    # 尝试加载字体
-    try:
-        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", LABEL_FONT_SIZE)
-    except OSError:
-        try:
-            font = ImageFont.truetype("arial.ttf", LABEL_FONT_SIZE)
-        except OSError:
-            font = ImageFont.load_default()
+    font = _get_font()
 
     # 绘制每个元素
     for elem in elements:
         rect = elem.rect
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
 
         # 选择颜色
         if elem.label == highlight_label:
@@ -159,20 +234,10 @@ def annotate_image(
         else:
             color = get_element_color(elem.element_type)
             line_width = BOX_LINE_WIDTH
+        rgb = color[:3]
 
         # 绘制边框
-        draw.rectangle(
-            [rect.left, rect.top, rect.right, rect.bottom],
-            outline=color[:3],
-            width=line_width
-        )
-
-        # 绘制半透明填充
-        fill_color = (*color[:3], 30)  # 很淡的填充
-        draw.rectangle(
-            [rect.left, rect.top, rect.right, rect.bottom],
-            fill=fill_color
-        )
+        draw.rectangle((left, top, right, bottom), outline=rgb, width=line_width)
 
         # 绘制标签
         if show_labels:
@@ -181,18 +246,16 @@ def annotate_image(
                 label_text += f" ({elem.confidence:.0%})"
 
             # 标签背景
-            bbox = font.getbbox(label_text)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
+            text_width, text_height = _label_size(label_text)
 
-            label_x = rect.left
-            label_y = rect.top - text_height - 4
+            label_x = left
+            label_y = top - text_height - 4
             if label_y < 0:
-                label_y = rect.bottom + 2
+                label_y = bottom + 2
 
             draw.rectangle(
-                [label_x, label_y, label_x + text_width + 4, label_y + text_height + 4],
-                fill=color[:3]
+                (label_x, label_y, label_x + text_width + 4, label_y + text_height + 4),
+                fill=rgb
             )
 
             draw.text(
@@ -202,14 +265,14 @@ def annotate_image(
                 font=font
             )
 
-    # 合并图层
-    annotated = Image.alpha_composite(annotated, overlay)
-    return annotated.convert("RGB")
+    return annotated
 
 
 def annotate_screenshot(
     screenshot_bytes: bytes,
     elements: List[ScreenElement],
+    compress_level: int = 1,
+    max_size: Optional[Tuple[int, int]] = None,
     **kwargs
 ) -> bytes:
     """
@@ -218,6 +281,9 @@ def annotate_screenshot(
     Args:
         screenshot_bytes: PNG 截图字节
         elements: 元素列表
+        max_size: (宽, 高)，标注后等比缩小到不超过该尺寸再编码；None 保持原始分辨率
+        compress_level: PNG 的 zlib 压缩级别 (0-9)，越低编码越快、体积越大。
+            调试截图用完即弃，默认 1；为 0/1 且安装了 fpnge 时改用 fpnge 编码
         **kwargs: 传递给 annotate_image 的参数
 
     Returns:
@@ -225,16 +291,19 @@ def annotate_screenshot(
     """
     image = Image.open(BytesIO(screenshot_bytes))
     annotated = annotate_image(image, elements, **kwargs)
+    if max_size:
+        # 先在原图坐标上标注，再缩小
+        annotated.thumbnail(max_size, Image.BILINEAR)
 
-    buffer = BytesIO()
-    annotated.save(buffer, format='PNG')
-    return buffer.getvalue()
+    return _encode_png(annotated, compress_level)
 
 
 def save_debug_screenshot(
     screenshot_bytes: bytes,
     elements: List[ScreenElement],
     output_path: str,
+    compress_level: int = 1,
+    max_size: Optional[Tuple[int, int]] = None,
     **kwargs
 ) -> str:
     """
@@ -244,12 +313,16 @@ def save_debug_screenshot(
         screenshot_bytes: PNG 截图字节
         elements: 元素列表
         output_path: 输出路径
+        compress_level: PNG 的 zlib 压缩级别 (0-9)
+        max_size: (宽, 高)，标注后等比缩小到不超过该尺寸；None 保持原始分辨率
         **kwargs: 传递给 annotate_image 的参数
 
     Returns:
         保存的文件路径
     """
-    annotated_bytes = annotate_screenshot(screenshot_bytes, elements, **kwargs)
+    annotated_bytes = annotate_screenshot(
+        screenshot_bytes, elements, compress_level=compress_level, max_size=max_size, **kwargs
+    )
 
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -266,9 +339,14 @@ class DebugViewer:
     """
     调试查看器
 
-    用于可视化调试 AI Agent 的执行过程
+    用于可视化调试 AI Agent 的执行过程。
+    帧截图的标注、PNG 编码与写盘在后台线程完成，不占用 Agent 的执行时间；
+    写盘线程在 start_session 时启动，end_session / close 时写完剩余帧后退出
     """
 
+    # 待写入帧队列的容量，写盘跟不上时 record_frame 会阻塞等待
+    WRITE_QUEUE_SIZE = 32
+
     def __init__(self, output_dir: str = None):
         """
         Args:
@@ -280,6 +358,34 @@ class DebugViewer:
         self._current_session: Optional[DebugSession] = None
         self._frame_count = 0
 
+        self._write_queue: queue.Queue = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+
+    def _start_writer(self) -> None:
+        """启动写盘线程 (已在运行时不重复启动)"""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._writer_loop, name="DebugViewerWriter", daemon=True
+            )
+            self._writer.start()
+
+    def _stop_writer(self) -> None:
+        """通知写盘线程写完队列中剩余的帧后退出，并等待其结束"""
+        if self._writer is not None:
+            self._write_queue.put(_WRITER_STOP)
+            self._writer.join()
+            self._writer = None
+
+    def close(self) -> None:
+        """停止写盘线程 (已记录帧的截图会先写完)"""
+        self._stop_writer()
+
+    def __enter__(self) -> "DebugViewer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     def start_session(self, task: str) -> str:
         """开始新的调试会话"""
         session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -294,6 +400,7 @@ class DebugViewer:
             total_steps=0
         )
         self._frame_count = 0
+        self._start_writer()
 
         # 创建会话目录
         session_dir = self.output_dir / session_id
@@ -303,12 +410,17 @@ class DebugViewer:
 
     def record_frame(
         self,
-        screenshot_base64: str,
+        screenshot_bytes: bytes,
         elements: List[ScreenElement],
         action: Optional[Action] = None,
         result: Optional[ActionResult] = None,
     ) -> None:
-        """记录一帧"""
+        """
+        记录一帧
+
+        Args:
+            screenshot_bytes: PNG 截图字节，原样写入会话目录，帧数据只保存文件名
+        """
         if not self._current_session:
             return
 
@@ -317,7 +429,7 @@ class DebugViewer:
         frame = DebugFrame(
             step=self._frame_count,
             timestamp=time.time(),
-            screenshot_base64=screenshot_base64,
+            screenshot_path=f"step_{self._frame_count:03d}_raw.png",
             elements=[
                 {
                     "label": e.label,
@@ -345,51 +457,79 @@ class DebugViewer:
 
         self._current_session.frames.append(frame)
 
-        # 保存截图
-        self._save_frame_screenshot(frame)
+        # 保存截图 (标注直接使用原始元素，不从帧数据中的字典重建)
+        self._save_frame_screenshot(frame, screenshot_bytes, elements)
 
-    def _save_frame_screenshot(self, frame: DebugFrame) -> None:
-        """保存帧截图"""
+    def _save_frame_screenshot(
+        self,
+        frame: DebugFrame,
+        screenshot_bytes: bytes,
+        elements: List[ScreenElement],
+    ) -> None:
+        """将帧截图交给后台线程保存"""
         if not self._current_session:
             return
 
         session_dir = self.output_dir / self._current_session.session_id
-
-        # 解码截图
-        screenshot_bytes = base64.b64decode(frame.screenshot_base64)
-
-        # 重建元素列表
-        elements = [
-            ScreenElement(
-                label=e["label"],
-                rect=Rect(**e["rect"]),
-                element_type=e["type"],
-                text=e["text"],
-                confidence=e["confidence"]
-            )
-            for e in frame.elements
-        ]
+        self._write_queue.put((session_dir, frame, screenshot_bytes, elements))
+
+    def _writer_loop(self) -> None:
+        """后台线程: 依次保存队列中的帧截图"""
+        while True:
+            item = self._write_queue.get()
+            if item is _WRITER_STOP:
+                self._write_queue.task_done()
+                return
+            session_dir, frame, screenshot_bytes, elements = item
+            try:
+                self._write_frame(session_dir, frame, screenshot_bytes, elements)
+            except Exception as e:
+                logger.error(f"保存调试截图失败 (step {frame.step}): {e}", exc_info=True)
+            finally:
+                self._write_queue.task_done()
+
+    def _write_frame(
+        self,
+        session_dir: Path,
+        frame: DebugFrame,
+        screenshot_bytes: bytes,
+        elements: List[ScreenElement],
+    ) -> None:
+        """保存帧的原始截图与标注截图"""
+        # 原始截图直接写盘，不经过解码与重新编码
+        with open(session_dir / frame.screenshot_path, 'wb') as f:
+            f.write(screenshot_bytes)
 
         # 确定高亮元素
         highlight = None
         if frame.action and frame.action.get("element_label"):
             highlight = frame.action["element_label"]
 
-        # 保存标注截图
+        # 保存标注截图 (报告中显示用，缩小保存；原始分辨率见 *_raw.png)
         output_path = session_dir / f"step_{frame.step:03d}.png"
         save_debug_screenshot(
             screenshot_bytes,
             elements,
             str(output_path),
+            compress_level=1,
+            max_size=REPORT_IMAGE_SIZE,
             highlight_label=highlight,
             show_labels=True
         )
 
+    def flush(self) -> None:
+        """等待所有已记录帧的截图写盘完成"""
+        self._write_queue.join()
+
     def end_session(self, success: bool) -> str:
         """结束调试会话"""
         if not self._current_session:
             return ""
 
+        # 报告引用帧截图，先等后台写盘完成，再停止写盘线程
+        self.flush()
+        self._stop_writer()
+
         self._current_session.end_time = time.time()
         self._current_session.success = success
         self._current_session.total_steps = self._frame_count
@@ -455,18 +595,22 @@ class DebugViewer:
     <h2>📝 执行步骤</h2>
 """
 
+        # 各段先收集到列表，最后一次性拼接 (避免逐帧 += 的平方级复制)
+        parts = [html_content]
         for frame in self._current_session.frames:
             action_info = ""
-            if frame.action:
-                coord_str = str(frame.action.get('coordinate', 'N/A'))
-                label_str = str(frame.action.get('element_label', 'N/A'))
-                text_str = str(frame.action.get('text', ''))
+            action = frame.action
+            if action:
+                lines = [f"<strong>动作:</strong> {action.get('type', 'N/A')}<br>"]
+                lines.extend(
+                    f"<strong>{name}:</strong> {action[key]}<br>"
+                    for key, name in (("coordinate", "坐标"), ("element_label", "元素"), ("text", "文本"))
+                    if action.get(key)
+                )
+                action_body = "\n                    ".join(lines)
                 action_info = f"""
                 <div class="action-info">
-                    <strong>动作:</strong> {frame.action.get('type', 'N/A')}<br>
-                    {"<strong>坐标:</strong> " + coord_str + "<br>" if frame.action.get('coordinate') else ""}
-                    {"<strong>元素:</strong> " + label_str + "<br>" if frame.action.get('element_label') else ""}
-                    {"<strong>文本:</strong> " + text_str + "<br>" if frame.action.get('text') else ""}
+                    {action_body}
                 </div>
                 """
 
@@ -476,7 +620,7 @@ class DebugViewer:
                 result_icon = '✓' if frame.result['success'] else '✗'
                 result_status = f"<span class='{result_class}'>{result_icon}</span>"
 
-            html_content += f"""
+            parts.append(f"""
     <div class="frame">
         <div class="frame-header">
             <span class="step-badge">Step {frame.step}</span>
@@ -486,12 +630,13 @@ class DebugViewer:
         <img src="step_{frame.step:03d}.png" alt="Step {frame.step}">
         {action_info}
     </div>
-"""
+""")
 
-        html_content += """
+        parts.append("""
 </body>
 </html>
-"""
+""")
+        html_content = "".join(parts)
 
         report_path = session_dir / "report.html"
         with open(report_path, 'w', encoding='utf-8') as f:
@@ -549,8 +694,11 @@ class DebugAgent:
                 action, result, screen_state = original_step(task_str)
 
                 if screen_state:
+                    screenshot_bytes = screen_state.screenshot_bytes
+                    if screenshot_bytes is None:
+                        screenshot_bytes = base64.b64decode(screen_state.screenshot_base64)
                     self._viewer.record_frame(
-                        screenshot_base64=screen_state.screenshot_base64,
+                        screenshot_bytes=screenshot_bytes,
                         elements=screen_state.elements,
                         action=action,
                         result=result
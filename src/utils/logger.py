@@ -22,21 +22,33 @@ Computer Control Framework - 日志系统
 特性:
 - 彩色控制台输出
 - JSON 格式文件日志 (可选)
-- 自动日志轮转
+- 自动日志轮转 (ccf.log 记录 ERROR 以下，ERROR 及以上只写入 ccf_error.log)
+- 文件日志经队列由后台线程批量写入，调用方不等待磁盘 IO
 - 结构化 Action 日志
 - 环境变量配置
+- 安装 orjson 时 JSON 日志使用 orjson 序列化
 """
 
+import atexit
+import copy
 import json
 import logging
 import os
+import queue
+import re
 import sys
 import threading
+import time
 from contextlib import contextmanager
-from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from functools import lru_cache
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ==================== 配置常量 ====================
 
@@ -53,6 +65,10 @@ DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 LOG_FILE_MAX_BYTES = int(os.environ.get("CCF_LOG_MAX_BYTES", 10 * 1024 * 1024))  # 10MB
 LOG_FILE_BACKUP_COUNT = int(os.environ.get("CCF_LOG_BACKUP_COUNT", 5))
 
+# 文件日志批量写入: 攒够 LOG_BATCH_SIZE 条、遇到 ERROR 或每隔 LOG_FLUSH_INTERVAL_MS 写入一次
+LOG_BATCH_SIZE = int(os.environ.get("CCF_LOG_BATCH_SIZE", 256))
+LOG_FLUSH_INTERVAL_MS = int(os.environ.get("CCF_LOG_FLUSH_INTERVAL_MS", 500))
+
 # 是否启用文件日志
 ENABLE_FILE_LOG = os.environ.get("CCF_ENABLE_FILE_LOG", "true").lower() == "true"
 
@@ -81,6 +97,33 @@ LEVEL_ICONS = {
 # ==================== 格式化器 ====================
 
 
+class _SecondCache:
+    """
+    按整秒缓存时间戳的格式化结果
+
+    同一秒内的日志记录共用 time.localtime + strftime 的结果，
+    不再为每条记录创建 datetime 对象
+    """
+
+    __slots__ = ("_fmt", "_last")
+
+    def __init__(self, fmt: str):
+        self._fmt = fmt
+        self._last = (None, "")  # (整秒, 格式化结果)，单个属性保证读写原子
+
+    def format(self, created: float) -> str:
+        sec = int(created)
+        last_sec, text = self._last
+        if sec != last_sec:
+            text = time.strftime(self._fmt, time.localtime(sec))
+            self._last = (sec, text)
+        return text
+
+
+# 格式串中的 %(levelname)s 字段 (含宽度/对齐说明)
+_LEVELNAME_FIELD = re.compile(r"%\(levelname\)([-#0 +]*\d*)s")
+
+
 class ColoredFormatter(logging.Formatter):
     """带颜色的控制台日志格式化器"""
 
@@ -95,24 +138,37 @@ class ColoredFormatter(logging.Formatter):
         self.use_colors = use_colors and sys.stdout.isatty()
         self.use_icons = use_icons
 
-    def format(self, record: logging.LogRecord) -> str:
-        # 保存原始级别名
-        original_levelname = record.levelname
+        # 每个级别预先生成一份格式串，级别名 (含颜色/图标) 直接写入格式串，
+        # 格式化时不再改写 record.levelname
+        self._level_styles: Dict[str, logging.PercentStyle] = {}
+        if self.use_colors or self.use_icons:
+            for levelname in LEVEL_ICONS:
+                level_fmt = _LEVELNAME_FIELD.sub(
+                    lambda m, name=levelname: self._decorate(name, m.group(1)), self._fmt
+                )
+                self._level_styles[levelname] = logging.PercentStyle(level_fmt)
+
+    def _decorate(self, levelname: str, spec: str) -> str:
+        """按 %(levelname)s 的宽度/对齐说明生成带颜色/图标的级别名 (已转义 %)"""
+        text = f"%{spec}s" % levelname
 
         if self.use_colors:
-            color = COLORS.get(record.levelname, COLORS["RESET"])
-            record.levelname = f"{color}{record.levelname}{COLORS['RESET']}"
+            text = f"{COLORS[levelname]}{text}{COLORS['RESET']}"
 
         if self.use_icons:
-            icon = LEVEL_ICONS.get(original_levelname, "")
-            record.levelname = f"{icon} {record.levelname}"
+            text = f"{LEVEL_ICONS[levelname]} {text}"
+
+        return text.replace("%", "%%")
 
-        result = super().format(record)
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        style = self._level_styles.get(record.levelname)
+        if style is None:
+            return super().formatMessage(record)
+        return style.format(record)
 
-        # 恢复原始级别名
-        record.levelname = original_levelname
 
-        return result
+# LogRecord 自带的属性名 (其余属性来自 extra 参数)
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
 
 
 class JSONFormatter(logging.Formatter):
@@ -123,9 +179,25 @@ class JSONFormatter(logging.Formatter):
         "module", "function", "line", "exception"
     }
 
+    _IGNORED = _RECORD_ATTRS | STANDARD_FIELDS
+
+    # ActionLogAdapter 记录的额外字段，按固定顺序输出
+    _ACTION_FIELDS = (
+        "event", "task", "step", "action_type", "success", "duration",
+        "coordinate", "element_label", "total_steps", "total_duration",
+    )
+    _ACTION_FIELD_SET = frozenset(_ACTION_FIELDS)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seconds = _SecondCache("%Y-%m-%dT%H:%M:%S")
+
     def format(self, record: logging.LogRecord) -> str:
+        created = record.created
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": "%s.%06d" % (
+                self._seconds.format(created), int((created % 1) * 1_000_000)
+            ),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -140,31 +212,56 @@ class JSONFormatter(logging.Formatter):
             log_data["thread_name"] = record.threadName
 
         # 添加额外字段 (来自 extra 参数)
-        for key, value in record.__dict__.items():
-            if key not in logging.LogRecord.__dict__ and key not in self.STANDARD_FIELDS:
+        attrs = record.__dict__
+        extras = attrs.keys() - self._IGNORED
+        if extras and extras <= self._ACTION_FIELD_SET:
+            # Action 日志: 字段已知，按固定顺序直接读取
+            for key in self._ACTION_FIELDS:
+                if key in extras:
+                    log_data[key] = attrs[key]
+        else:
+            for key in extras:
                 if not key.startswith('_'):
-                    log_data[key] = value
+                    log_data[key] = attrs[key]
 
         # 异常信息
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data, ensure_ascii=False, default=str)
+        return _dumps(log_data)
+
+
+def _dumps(data: dict) -> str:
+    """序列化日志字典；orjson 不支持的值 (如超过 64 位的整数) 回退到标准库 json"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, ensure_ascii=False, default=str)
 
 
 class StructuredFormatter(logging.Formatter):
     """结构化文本格式化器（可读性更好的文件日志）"""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._seconds = _SecondCache(DEFAULT_DATE_FORMAT)
+
     def format(self, record: logging.LogRecord) -> str:
         # 基础信息
-        timestamp = datetime.fromtimestamp(record.created).strftime(DEFAULT_DATE_FORMAT)
+        timestamp = self._seconds.format(record.created)
         base = f"[{timestamp}] [{record.levelname:8}] [{record.name}] {record.getMessage()}"
 
         # 添加额外字段
-        extras = []
-        for key, value in record.__dict__.items():
-            if key not in logging.LogRecord.__dict__ and not key.startswith('_'):
-                extras.append(f"{key}={value}")
+        attrs = record.__dict__
+        extras = [
+            f"{key}={attrs[key]}"
+            for key in sorted(attrs.keys() - _RECORD_ATTRS)
+            if not key.startswith('_')
+        ]
 
         if extras:
             base += f" | {', '.join(extras)}"
@@ -178,6 +275,20 @@ class StructuredFormatter(logging.Formatter):
 
 # ==================== Action 日志适配器 ====================
 
+# action() 的消息模板，按 (有附加消息, 位置类型, 有耗时) 预先生成；参数由 logging 延迟格式化
+_ACTION_LOCATION_FORMATS = {None: "", "coordinate": " @ (%s, %s)", "label": " @ %s"}
+_ACTION_FORMATS = {
+    (has_message, location, has_duration): (
+        "[Step %s] [%s] %s"
+        + (" %s" if has_message else "")
+        + location_fmt
+        + (" (%.3fs)" if has_duration else "")
+    )
+    for has_message in (False, True)
+    for location, location_fmt in _ACTION_LOCATION_FORMATS.items()
+    for has_duration in (False, True)
+}
+
 
 class ActionLogAdapter(logging.LoggerAdapter):
     """
@@ -218,6 +329,10 @@ class ActionLogAdapter(logging.LoggerAdapter):
             self._step_counter += 1
             step = self._step_counter
 
+        level = logging.INFO if success else logging.ERROR
+        if not self.isEnabledFor(level):
+            return
+
         extra = {
             "action_type": action_type,
             "success": success,
@@ -232,45 +347,51 @@ class ActionLogAdapter(logging.LoggerAdapter):
             extra["element_label"] = element_label
 
         # 构建消息
-        level = logging.INFO if success else logging.ERROR
-        status = "✓" if success else "✗"
-        msg = f"[Step {step}] [{action_type}] {status}"
+        args = [step, action_type, "✓" if success else "✗"]
 
         if message:
-            msg += f" {message}"
+            args.append(message)
 
         if coordinate:
-            msg += f" @ ({coordinate[0]}, {coordinate[1]})"
+            location = "coordinate"
+            args += (coordinate[0], coordinate[1])
         elif element_label:
-            msg += f" @ {element_label}"
+            location = "label"
+            args.append(element_label)
+        else:
+            location = None
 
         if duration > 0:
-            msg += f" ({duration:.3f}s)"
+            args.append(duration)
 
-        self.log(level, msg, extra=extra)
+        fmt = _ACTION_FORMATS[bool(message), location, duration > 0]
+        self.log(level, fmt, *args, extra=extra)
 
     def step_start(self, step: int, task: str):
         """记录步骤开始"""
-        self.info(f"[Step {step}] 开始执行: {task}", extra={"step": step, "event": "step_start"})
+        self.info(
+            "[Step %s] 开始执行: %s", step, task, extra={"step": step, "event": "step_start"}
+        )
 
     def step_end(self, step: int, success: bool, duration: float):
         """记录步骤结束"""
         status = "成功" if success else "失败"
         self.info(
-            f"[Step {step}] {status} ({duration:.3f}s)",
+            "[Step %s] %s (%.3fs)", step, status, duration,
             extra={"step": step, "event": "step_end", "success": success, "duration": duration}
         )
 
     def task_start(self, task: str):
         """记录任务开始"""
         self._step_counter = 0
-        self.info(f"=== 任务开始: {task} ===", extra={"event": "task_start", "task": task})
+        self.info("=== 任务开始: %s ===", task, extra={"event": "task_start", "task": task})
 
     def task_end(self, task: str, success: bool, total_steps: int, total_duration: float):
         """记录任务结束"""
         status = "成功" if success else "失败"
         self.info(
-            f"=== 任务{status}: {task} (共 {total_steps} 步, 耗时 {total_duration:.2f}s) ===",
+            "=== 任务%s: %s (共 %s 步, 耗时 %.2fs) ===",
+            status, task, total_steps, total_duration,
             extra={
                 "event": "task_end",
                 "task": task,
@@ -283,10 +404,181 @@ class ActionLogAdapter(logging.LoggerAdapter):
 
 # ==================== Logger 管理 ====================
 
+# 根 logger 名称: get_logger 返回的 logger 均为其子 logger，记录传播到根 logger 统一输出
+ROOT_LOGGER_NAME = "ccf"
+_CHILD_PREFIX = ROOT_LOGGER_NAME + "."
+
 # 全局 logger 缓存
 _loggers: Dict[str, logging.Logger] = {}
 _lock = threading.Lock()
 
+# 文件日志的后台写入线程
+_listeners: List[QueueListener] = []
+
+# 共享的文件日志入队 Handler，按 (日志目录, 是否 JSON) 区分
+_file_handlers: Dict[Tuple[Path, bool], QueueHandler] = {}
+
+# 批量写入缓冲及其定时刷新线程
+_batch_handlers: List["_BatchHandler"] = []
+_flusher: Optional[threading.Thread] = None
+_flush_stop = threading.Event()
+
+
+class _RotatingFileHandler(RotatingFileHandler):
+    """批量写入期间暂缓逐条 flush 的 RotatingFileHandler"""
+
+    deferred = False
+
+    def flush(self):
+        if not self.deferred:
+            super().flush()
+
+
+class _BatchHandler(MemoryHandler):
+    """
+    文件日志的批量缓冲
+
+    整批记录写入文件的缓冲区后只 flush 一次，N 条记录合并为一次系统调用
+    """
+
+    def flush(self):
+        with self.lock:
+            target = self.target
+            if target is None or not self.buffer:
+                return
+            target.deferred = True
+            try:
+                super().flush()
+            finally:
+                target.deferred = False
+                target.flush()
+
+
+def _batched(handler: "_RotatingFileHandler") -> _BatchHandler:
+    """用批量缓冲包装文件 Handler，并确保定时刷新线程已启动 (调用方持有 _lock)"""
+    global _flusher
+
+    batch = _BatchHandler(
+        capacity=max(LOG_BATCH_SIZE, 1),
+        flushLevel=logging.ERROR,
+        target=handler,
+        flushOnClose=True,
+    )
+    batch.setLevel(handler.level)
+    _batch_handlers.append(batch)
+
+    if _flusher is None and LOG_FLUSH_INTERVAL_MS > 0:
+        _flusher = threading.Thread(target=_flush_loop, name="ccf-log-flush", daemon=True)
+        _flusher.start()
+
+    return batch
+
+
+def _below_error(record: logging.LogRecord) -> bool:
+    """主日志文件的过滤器: 只保留 ERROR 以下的记录"""
+    return record.levelno < logging.ERROR
+
+
+def _flush_loop():
+    """定时刷新批量缓冲，低频日志也能及时落盘"""
+    interval = LOG_FLUSH_INTERVAL_MS / 1000
+    while not _flush_stop.wait(interval):
+        for handler in list(_batch_handlers):
+            handler.flush()
+
+
+class _RecordQueueHandler(QueueHandler):
+    """
+    文件日志的入队 Handler
+
+    与标准 QueueHandler 不同，入队时只合并消息参数而不预先格式化，
+    exc_info 原样保留，由监听线程上的 JSON/结构化格式化器输出
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_file_logging():
+    """停止所有后台写入线程，并写完队列和批量缓冲中剩余的记录"""
+    with _lock:
+        listeners = list(_listeners)
+        _listeners.clear()
+
+    for listener in listeners:
+        listener.stop()
+
+    _flush_stop.set()
+    for handler in list(_batch_handlers):
+        handler.flush()
+
+
+atexit.register(_stop_file_logging)
+
+
+@lru_cache(maxsize=None)
+def _ensure_log_dir(log_dir: str) -> Path:
+    """创建日志目录并返回其绝对路径 (每个目录只检查一次)"""
+    log_path = Path(log_dir)
+    log_path.mkdir(parents=True, exist_ok=True)
+    return log_path.resolve()
+
+
+def _get_shared_file_handler(log_dir: str, enable_json: bool) -> QueueHandler:
+    """
+    获取日志目录共用的文件日志 Handler (调用方持有 _lock)
+
+    每个目录只打开一份 ccf.log / ccf_error.log，由一个后台线程批量写入；
+    各 logger 挂载同一个入队 Handler
+    """
+    log_path = _ensure_log_dir(log_dir)
+    key = (log_path, enable_json)
+    handler = _file_handlers.get(key)
+    if handler is not None:
+        return handler
+
+    # 主日志文件（按大小轮转）
+    file_handler = _RotatingFileHandler(
+        log_path / "ccf.log",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(JSONFormatter() if enable_json else StructuredFormatter())
+
+    # 错误日志单独文件
+    error_handler = _RotatingFileHandler(
+        log_path / "ccf_error.log",
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=3,
+        encoding="utf-8"
+    )
+    error_handler.setLevel(logging.ERROR)
+    error_handler.setFormatter(JSONFormatter() if enable_json else StructuredFormatter())
+
+    # 调用方只入队，由后台线程批量写入文件
+    log_queue = queue.SimpleQueue()
+    handler = _RecordQueueHandler(log_queue)
+    # ERROR 及以上只写入 ccf_error.log，主日志不再重复格式化、写入一份
+    main_handler = _batched(file_handler)
+    main_handler.addFilter(_below_error)
+
+    listener = QueueListener(
+        log_queue,
+        main_handler,
+        _batched(error_handler),
+        respect_handler_level=True,
+    )
+    listener.start()
+    _listeners.append(listener)
+
+    _file_handlers[key] = handler
+    return handler
+
 
 def setup_logger(
     name: str,
@@ -299,6 +591,10 @@ def setup_logger(
     """
     配置并返回一个 Logger 实例
 
+    "ccf." 开头的子 logger 不挂载 Handler，记录传播到 "ccf" 根 logger，
+    每条记录只格式化、输出一次 (子 logger 仅 level 参数生效)；
+    其余名称按参数挂载各自的 Handler
+
     Args:
         name: Logger 名称
         level: 日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -310,15 +606,31 @@ def setup_logger(
     Returns:
         配置好的 Logger 实例
     """
+    # 检查缓存 (dict 读取在 GIL 下是原子的，命中时无需加锁)
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
+
+    is_child = name.startswith(_CHILD_PREFIX)
+    if is_child:
+        setup_logger(ROOT_LOGGER_NAME)
+
     with _lock:
-        # 检查缓存
+        # 加锁后再次检查，其他线程可能已完成配置
         if name in _loggers:
             return _loggers[name]
 
         logger = logging.getLogger(name)
 
-        # 避免重复配置
-        if logger.handlers:
+        # 子 logger: 继承根 logger 的级别和 Handler
+        if is_child:
+            if level:
+                logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+            _loggers[name] = logger
+            return logger
+
+        # 避免重复配置 (只认本模块配置过的 logger，不受外部添加的 Handler 影响)
+        if getattr(logger, "_ccf_configured", False):
             _loggers[name] = logger
             return logger
 
@@ -327,51 +639,27 @@ def setup_logger(
         enable_file = enable_file if enable_file is not None else ENABLE_FILE_LOG
         enable_json = enable_json if enable_json is not None else USE_JSON_FORMAT
 
-        logger.setLevel(getattr(logging, level, logging.INFO))
+        logger.setLevel(getattr(logging, level.upper(), logging.INFO))
         logger.propagate = False  # 避免重复日志
 
+        handlers = []
+
         # 控制台 Handler
         if enable_console:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(logging.DEBUG)
             console_handler.setFormatter(ColoredFormatter(use_colors=True))
-            logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
-        # 文件 Handler
+        # 文件 Handler (同一目录的所有 logger 共用)
         if enable_file:
-            log_dir = log_dir or DEFAULT_LOG_DIR
-            log_path = Path(log_dir)
-            log_path.mkdir(parents=True, exist_ok=True)
-
-            # 主日志文件（按大小轮转）
-            log_file = log_path / "ccf.log"
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=LOG_FILE_MAX_BYTES,
-                backupCount=LOG_FILE_BACKUP_COUNT,
-                encoding="utf-8"
-            )
-            file_handler.setLevel(logging.DEBUG)
-
-            if enable_json:
-                file_handler.setFormatter(JSONFormatter())
-            else:
-                file_handler.setFormatter(StructuredFormatter())
-
-            logger.addHandler(file_handler)
-
-            # 错误日志单独文件
-            error_file = log_path / "ccf_error.log"
-            error_handler = RotatingFileHandler(
-                error_file,
-                maxBytes=LOG_FILE_MAX_BYTES,
-                backupCount=3,
-                encoding="utf-8"
-            )
-            error_handler.setLevel(logging.ERROR)
-            error_handler.setFormatter(JSONFormatter() if enable_json else StructuredFormatter())
-            logger.addHandler(error_handler)
+            handlers.append(_get_shared_file_handler(log_dir or DEFAULT_LOG_DIR, enable_json))
+
+        for handler in handlers:
+            logger.addHandler(handler)
 
+        logger._ccf_configured = True
+        logger._ccf_handlers = handlers
         _loggers[name] = logger
         return logger
 
@@ -380,6 +668,9 @@ def get_logger(name: str = None) -> logging.Logger:
     """
     获取 Logger 实例（快捷方式）
 
+    返回 "ccf" 根 logger 下的子 logger: "src.vision.detector" 映射为
+    "ccf.vision.detector"，其他名称加 "ccf." 前缀
+
     Args:
         name: Logger 名称，None 则使用调用者模块名
 
@@ -388,12 +679,18 @@ def get_logger(name: str = None) -> logging.Logger:
     """
     if name is None:
         # 自动获取调用者模块名
-        import inspect
-        frame = inspect.currentframe()
-        if frame and frame.f_back:
-            name = frame.f_back.f_globals.get("__name__", "ccf")
+        name = sys._getframe(1).f_globals.get("__name__", ROOT_LOGGER_NAME)
 
-    return setup_logger(name)
+    return setup_logger(_qualify_name(name))
+
+
+def _qualify_name(name: str) -> str:
+    """将 logger 名称映射到 "ccf" 根 logger 之下"""
+    if name == ROOT_LOGGER_NAME or name.startswith(_CHILD_PREFIX):
+        return name
+    if name == "src" or name.startswith("src."):
+        return ROOT_LOGGER_NAME + name[3:]
+    return _CHILD_PREFIX + name
 
 
 def get_action_logger(name: str = None) -> ActionLogAdapter:
@@ -426,13 +723,22 @@ def init_logging(
     """
     初始化全局日志配置
 
-    在应用启动时调用一次
+    在应用启动时调用一次。若此前创建子 logger 时已按默认值自动配置了
+    "ccf" 根 logger，这里会按传入参数重新配置
     """
     global _initialized
 
     if _initialized:
         return get_logger("ccf")
 
+    with _lock:
+        root_logger = _loggers.pop(ROOT_LOGGER_NAME, None)
+        if root_logger is not None and getattr(root_logger, "_ccf_configured", False):
+            # 只移除本模块挂载的 Handler，共享的文件 Handler 不关闭
+            for handler in root_logger._ccf_handlers:
+                root_logger.removeHandler(handler)
+            root_logger._ccf_configured = False
+
     root_logger = setup_logger(
         "ccf",
         level=level,
@@ -445,6 +751,21 @@ def init_logging(
     return root_logger
 
 
+def flush_logs() -> None:
+    """
+    将已记录的日志全部写入文件
+
+    等待后台线程处理完队列中已有的记录 (停止后重新启动监听线程)，再刷新批量缓冲
+    """
+    with _lock:
+        for listener in _listeners:
+            listener.stop()
+            listener.start()
+
+    for handler in list(_batch_handlers):
+        handler.flush()
+
+
 # ==================== 上下文管理器 ====================
 
 @contextmanager
@@ -457,19 +778,19 @@ def log_context(logger: logging.Logger, operation: str, **extra):
             # 执行操作
             ctx["result"] = "success"
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     context = {"operation": operation, **extra}
 
     logger.debug(f"开始: {operation}", extra=context)
 
     try:
         yield context
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         context["duration"] = duration
         context["success"] = True
         logger.debug(f"完成: {operation} ({duration:.3f}s)", extra=context)
     except Exception as e:
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
         context["duration"] = duration
         context["success"] = False
         context["error"] = str(e)
@@ -479,29 +800,50 @@ def log_context(logger: logging.Logger, operation: str, **extra):
 
 # ==================== 便捷函数 ====================
 
+# 便捷函数共用的 "ccf" logger，首次调用时创建
+_ccf_logger: Optional[logging.Logger] = None
+
+
+def _get_ccf_logger() -> logging.Logger:
+    global _ccf_logger
+    if _ccf_logger is None:
+        _ccf_logger = get_logger("ccf")
+    return _ccf_logger
+
+
 def debug(msg: str, *args, **kwargs):
     """快捷 debug 日志"""
-    get_logger("ccf").debug(msg, *args, **kwargs)
+    logger = _get_ccf_logger()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args, **kwargs)
 
 
 def info(msg: str, *args, **kwargs):
     """快捷 info 日志"""
-    get_logger("ccf").info(msg, *args, **kwargs)
+    logger = _get_ccf_logger()
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(msg, *args, **kwargs)
 
 
 def warning(msg: str, *args, **kwargs):
     """快捷 warning 日志"""
-    get_logger("ccf").warning(msg, *args, **kwargs)
+    logger = _get_ccf_logger()
+    if logger.isEnabledFor(logging.WARNING):
+        logger.warning(msg, *args, **kwargs)
 
 
 def error(msg: str, *args, **kwargs):
     """快捷 error 日志"""
-    get_logger("ccf").error(msg, *args, **kwargs)
+    logger = _get_ccf_logger()
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error(msg, *args, **kwargs)
 
 
 def critical(msg: str, *args, **kwargs):
     """快捷 critical 日志"""
-    get_logger("ccf").critical(msg, *args, **kwargs)
+    logger = _get_ccf_logger()
+    if logger.isEnabledFor(logging.CRITICAL):
+        logger.critical(msg, *args, **kwargs)
 
 
 def set_level(level: Union[str, int]):
@@ -3,14 +3,51 @@ Accessibility Detector - 辅助功能检测器
 
 使用系统辅助功能API获取UI元素
 目前只支持macOS
+
+安装 pyobjc (ApplicationServices) 时在进程内直接调用 AXUIElement API
+(常驻的系统级 AXUIElement，多个属性批量读取)；否则回退到 osascript 子进程
 """
 
+import copy
+import re
 import subprocess
-from typing import List
+import time
+from dataclasses import replace
+from typing import List, Optional, Tuple
 
 from ..core.types import Rect, ScreenElement
 from .detector import ElementDetector
 
+# osascript 输出的菜单栏项目: "name,x,y,w,h;" (name 可能含逗号，由回溯匹配末尾四个数字)
+_MENU_ITEM_RE = re.compile(r"([^;]*),(-?\d+),(-?\d+),(-?\d+),(-?\d+);")
+
+# 合并脚本输出中窗口位置与菜单栏项目之间的分隔符
+_SCRIPT_SEPARATOR = "~~SEP~~"
+
+# 前台窗口位置和菜单栏项目，合并为一个脚本只启动一次 osascript
+_FRONT_APP_SCRIPT = '''
+tell application "System Events"
+    set frontApp to first application process whose frontmost is true
+
+    set winLine to ""
+    try
+        set winPos to position of front window of frontApp
+        set winLine to ((item 1 of winPos) as text) & "," & (item 2 of winPos)
+    end try
+
+    set menuLine to ""
+    try
+        repeat with menuItem in menu bar items of menu bar 1 of frontApp
+            set itemPos to position of menuItem
+            set itemSize to size of menuItem
+            set menuLine to menuLine & (name of menuItem as text) & "," & (item 1 of itemPos) & "," & (item 2 of itemPos) & "," & (item 1 of itemSize) & "," & (item 2 of itemSize) & ";"
+        end repeat
+    end try
+
+    return winLine & "%s" & menuLine
+end tell
+''' % _SCRIPT_SEPARATOR
+
 
 class AccessibilityDetector(ElementDetector):
     """
@@ -19,7 +56,24 @@ class AccessibilityDetector(ElementDetector):
     使用macOS Accessibility API获取屏幕元素
     """
 
+    # 检测结果缓存时长 (秒)；窗口控制按钮和菜单栏在相邻帧之间很少变化。0 表示不缓存
+    CACHE_TTL = 0.5
+
     def __init__(self):
+        # 尝试导入 ApplicationServices (pyobjc)
+        try:
+            import ApplicationServices
+            self._ax = ApplicationServices
+            self._ax_system = ApplicationServices.AXUIElementCreateSystemWide()
+        except ImportError:
+            self._ax = None
+            self._ax_system = None
+
+        # 检测结果缓存，前台应用变化 (可获取 PID 时) 或超过 CACHE_TTL 后重新查询
+        self._cache: Optional[List[ScreenElement]] = None
+        self._cache_pid: Optional[int] = None
+        self._cache_expires = 0.0
+
         self._check_accessibility()
 
     def _check_accessibility(self):
@@ -27,131 +81,233 @@ class AccessibilityDetector(ElementDetector):
         # 在实际使用时会在第一次调用时检查
         pass
 
-    def detect(self, image_bytes: bytes) -> List[ScreenElement]:
+    def detect(
+        self, image_bytes: bytes, label_offset: Optional[int] = None
+    ) -> List[ScreenElement]:
         """
         使用辅助功能API检测元素
 
         注意：这个方法不使用图片，而是直接查询系统
+
+        Args:
+            image_bytes: 截图 (未使用)
+            label_offset: 指定时元素依次标记为 "~{label_offset}", "~{label_offset + 1}", ...；
+                None 时保留 "window_close" / "menu_0" 等描述性标签
         """
+        now = time.monotonic()
+
+        # 前台应用每次检测只查询一次，PID 用于判断缓存是否失效
+        app = pid = None
+        if self._ax is not None:
+            app = self._ax_front_app()
+            pid = self._ax_pid(app) if app is not None else None
+
+        elements = self._cache
+        if elements is None or now >= self._cache_expires or pid != self._cache_pid:
+            if self._ax is None:
+                elements = self._osascript_elements()
+            elif app is None:
+                elements = []
+            else:
+                # 窗口控制按钮 + 菜单栏
+                elements = self._ax_window_controls(app) + self._ax_menu_bar_items(app)
+
+            self._cache = elements
+            self._cache_pid = pid
+            self._cache_expires = now + self.CACHE_TTL
+
+        # 返回副本，调用方修改元素不影响缓存
+        if label_offset is None:
+            return [copy.copy(elem) for elem in elements]
+        return [
+            replace(elem, label=f"~{label_offset + i}") for i, elem in enumerate(elements)
+        ]
+
+    # ==================== AXUIElement ====================
+
+    def _ax_attr(self, element, attribute: str):
+        """读取 AX 属性，失败返回 None"""
+        err, value = self._ax.AXUIElementCopyAttributeValue(element, attribute, None)
+        return value if err == self._ax.kAXErrorSuccess else None
+
+    def _ax_attrs(self, element, attributes: Tuple[str, ...]) -> Optional[list]:
+        """一次 IPC 读取多个 AX 属性，读取失败的属性为 None"""
+        ax = self._ax
+        err, values = ax.AXUIElementCopyMultipleAttributeValues(element, attributes, 0, None)
+        if err != ax.kAXErrorSuccess or values is None:
+            return None
+        return [
+            None if isinstance(value, ax.AXValueRef)
+            and ax.AXValueGetType(value) == ax.kAXValueAXErrorType else value
+            for value in values
+        ]
+
+    def _ax_rect(self, element) -> Optional[Rect]:
+        """读取 AX 元素的位置和尺寸"""
+        ax = self._ax
+        values = self._ax_attrs(element, (ax.kAXPositionAttribute, ax.kAXSizeAttribute))
+        return self._ax_values_rect(*values) if values else None
+
+    def _ax_values_rect(self, position, size) -> Optional[Rect]:
+        """由 AXPosition / AXSize 值构造 Rect"""
+        if position is None or size is None:
+            return None
+
+        ax = self._ax
+        _, point = ax.AXValueGetValue(position, ax.kAXValueCGPointType, None)
+        _, extent = ax.AXValueGetValue(size, ax.kAXValueCGSizeType, None)
+        x, y = int(point.x), int(point.y)
+        return Rect(x, y, x + int(extent.width), y + int(extent.height))
+
+    def _ax_front_app(self):
+        """获取前台应用的 AX 元素，失败返回 None"""
+        try:
+            return self._ax_attr(self._ax_system, self._ax.kAXFocusedApplicationAttribute)
+        except Exception:
+            return None
+
+    def _ax_pid(self, app) -> Optional[int]:
+        """前台应用 PID，用于在切换应用时使缓存失效"""
+        try:
+            err, pid = self._ax.AXUIElementGetPid(app, None)
+        except Exception:
+            return None
+        return pid if err == self._ax.kAXErrorSuccess else None
+
+    def _ax_window_controls(self, app) -> List[ScreenElement]:
+        """通过 AX API 读取前台窗口的控制按钮（红黄绿）的实际位置"""
         elements = []
 
-        # 获取窗口控制按钮
-        window_controls = self._get_window_controls()
-        elements.extend(window_controls)
+        try:
+            ax = self._ax
+            window = self._ax_attr(app, ax.kAXFocusedWindowAttribute)
+            buttons = window and self._ax_attrs(window, (
+                ax.kAXCloseButtonAttribute,
+                ax.kAXMinimizeButtonAttribute,
+                ax.kAXZoomButtonAttribute,
+            ))
+
+            for name, button in zip(("close", "minimize", "fullscreen"), buttons or ()):
+                rect = button and self._ax_rect(button)
+                if rect:
+                    elements.append(ScreenElement(
+                        label=f"window_{name}",
+                        rect=rect,
+                        element_type="window_control",
+                        text=name
+                    ))
 
-        # 获取菜单栏
-        menu_items = self._get_menu_bar_items()
-        elements.extend(menu_items)
+        except Exception:
+            pass
 
         return elements
 
-    def _get_window_controls(self) -> List[ScreenElement]:
-        """获取窗口控制按钮（红黄绿）"""
+    def _ax_menu_bar_items(self, app) -> List[ScreenElement]:
+        """通过 AX API 遍历前台应用的菜单栏，每个项目一次 IPC 读取标题、位置和尺寸"""
         elements = []
 
         try:
-            # 使用AppleScript获取窗口信息
-            script = '''
-            tell application "System Events"
-                set frontApp to first application process whose frontmost is true
-                tell frontApp
-                    set win to front window
-                    set winPos to position of win
-                    return winPos
-                end tell
-            end tell
-            '''
-
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                # 解析窗口位置
-                pos_str = result.stdout.strip()
-                if pos_str:
-                    parts = pos_str.split(', ')
-                    if len(parts) >= 2:
-                        x = int(parts[0])
-                        y = int(parts[1])
-
-                        # 窗口控制按钮通常在左上角
-                        # macOS标准位置：关闭(红)、最小化(黄)、全屏(绿)
-                        button_size = 12
-                        button_spacing = 8
-                        button_y = y + 12
-                        button_x_start = x + 12
-
-                        buttons = [
-                            ("close", button_x_start, button_y, (255, 95, 86)),
-                            ("minimize", button_x_start + button_size + button_spacing, button_y, (255, 189, 46)),
-                            ("fullscreen", button_x_start + 2 * (button_size + button_spacing), button_y, (39, 201, 63)),
-                        ]
-
-                        for name, bx, by, _color in buttons:
-                            elements.append(ScreenElement(
-                                label=f"window_{name}",
-                                rect=Rect(bx, by, bx + button_size, by + button_size),
-                                element_type="window_control",
-                                text=name
-                            ))
+            ax = self._ax
+            menu_bar = self._ax_attr(app, ax.kAXMenuBarAttribute)
+            items = menu_bar and self._ax_attr(menu_bar, ax.kAXChildrenAttribute)
+            attributes = (ax.kAXTitleAttribute, ax.kAXPositionAttribute, ax.kAXSizeAttribute)
+
+            for i, item in enumerate(items or ()):
+                values = self._ax_attrs(item, attributes)
+                if not values:
+                    continue
+                title, position, size = values
+                rect = self._ax_values_rect(position, size)
+                if rect is None:
+                    continue
+                elements.append(ScreenElement(
+                    label=f"menu_{i}",
+                    rect=rect,
+                    element_type="menu_item",
+                    text=title or ""
+                ))
 
         except Exception:
             pass
 
         return elements
 
-    def _get_menu_bar_items(self) -> List[ScreenElement]:
-        """获取菜单栏项目"""
-        elements = []
+    # ==================== 窗口控制按钮 / 菜单栏 ====================
+
+    @staticmethod
+    def _window_control_elements(x: int, y: int) -> List[ScreenElement]:
+        """根据窗口左上角位置生成窗口控制按钮（红黄绿）"""
+        # 窗口控制按钮通常在左上角
+        # macOS标准位置：关闭(红)、最小化(黄)、全屏(绿)
+        button_size = 12
+        button_spacing = 8
+        button_y = y + 12
+        button_x_start = x + 12
+
+        buttons = [
+            ("close", button_x_start, button_y, (255, 95, 86)),
+            ("minimize", button_x_start + button_size + button_spacing, button_y, (255, 189, 46)),
+            ("fullscreen", button_x_start + 2 * (button_size + button_spacing), button_y, (39, 201, 63)),
+        ]
+
+        return [
+            ScreenElement(
+                label=f"window_{name}",
+                rect=Rect(bx, by, bx + button_size, by + button_size),
+                element_type="window_control",
+                text=name
+            )
+            for name, bx, by, _color in buttons
+        ]
 
-        try:
-            script = '''
-            tell application "System Events"
-                set menuBarItems to menu bar items of menu bar 1 of (first application process whose frontmost is true)
-                set result to ""
-                repeat with item in menuBarItems
-                    set itemName to name of item
-                    set itemPos to position of item
-                    set itemSize to size of item
-                    set result to result & itemName & "," & (item 1 of itemPos) & "," & (item 2 of itemPos) & "," & (item 1 of itemSize) & "," & (item 2 of itemSize) & ";"
-                end repeat
-                return result
-            end tell
-            '''
+    # ==================== osascript (无 pyobjc 时) ====================
 
+    def _osascript_elements(self) -> List[ScreenElement]:
+        """一次 osascript 调用同时获取前台窗口位置和菜单栏项目"""
+        try:
             result = subprocess.run(
-                ['osascript', '-e', script],
+                ['osascript', '-e', _FRONT_APP_SCRIPT],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
+        except (OSError, subprocess.SubprocessError):
+            return []
 
-            if result.returncode == 0:
-                items_str = result.stdout.strip()
-                if items_str:
-                    for i, item_data in enumerate(items_str.split(';')):
-                        if item_data:
-                            parts = item_data.split(',')
-                            if len(parts) >= 5:
-                                name = parts[0]
-                                x = int(parts[1])
-                                y = int(parts[2])
-                                w = int(parts[3])
-                                h = int(parts[4])
-
-                                elements.append(ScreenElement(
-                                    label=f"menu_{i}",
-                                    rect=Rect(x, y, x + w, y + h),
-                                    element_type="menu_item",
-                                    text=name
-                                ))
+        if result.returncode != 0:
+            return []
 
-        except Exception:
-            pass
+        # 窗口位置 "x,y" + 分隔符 + 菜单栏项目 "name,x,y,w,h;..."
+        win_line, _, menu_line = result.stdout.rstrip("\n").partition(_SCRIPT_SEPARATOR)
+
+        elements = []
+
+        parts = win_line.split(',')
+        if len(parts) >= 2:
+            try:
+                elements = self._window_control_elements(int(parts[0]), int(parts[1]))
+            except ValueError:
+                pass
+
+        elements.extend(self._parse_menu_bar_items(menu_line))
+        return elements
+
+    @staticmethod
+    def _parse_menu_bar_items(items_str: str) -> List[ScreenElement]:
+        """解析菜单栏项目"""
+        elements = []
+
+        for i, match in enumerate(_MENU_ITEM_RE.finditer(items_str)):
+            name, x, y, w, h = match.groups()
+            x = int(x)
+            y = int(y)
+
+            elements.append(ScreenElement(
+                label=f"menu_{i}",
+                rect=Rect(x, y, x + int(w), y + int(h)),
+                element_type="menu_item",
+                text=name
+            ))
 
         return elements
 
@@ -178,20 +334,13 @@ class HybridDetector(ElementDetector):
 
         合并视觉检测和辅助功能检测的结果
         """
-        elements = []
-
         # 视觉检测
-        visual_elements = self.visual_detector.detect(image_bytes)
-        elements.extend(visual_elements)
+        elements = list(self.visual_detector.detect(image_bytes))
 
-        # 辅助功能检测
+        # 辅助功能检测，编号接在视觉检测之后，避免冲突
         if self.accessibility_detector:
-            a11y_elements = self.accessibility_detector.detect(image_bytes)
-
-            # 重新编号，避免与视觉检测冲突
-            base_index = len(elements)
-            for i, elem in enumerate(a11y_elements):
-                elem.label = f"~{base_index + i}"
-                elements.append(elem)
+            elements += self.accessibility_detector.detect(
+                image_bytes, label_offset=len(elements)
+            )
 
         return elements
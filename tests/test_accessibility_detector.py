@@ -0,0 +1,154 @@
+"""
+辅助功能检测器测试 (osascript 回退路径)
+
+运行方式:
+    pytest tests/test_accessibility_detector.py -v
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.types import Rect
+from src.vision.accessibility_detector import (
+    _SCRIPT_SEPARATOR,
+    AccessibilityDetector,
+)
+
+
+class FakeOsascript:
+    """替代 subprocess.run，返回固定的 osascript 输出并记录调用次数"""
+    
+    def __init__(self, stdout: str, returncode: int = 0):
+        self.stdout = stdout
+        self.returncode = returncode
+        self.calls = 0
+    
+    def __call__(self, cmd, **kwargs):
+        self.calls += 1
+        assert cmd[0] == "osascript"
+        return subprocess.CompletedProcess(cmd, self.returncode, self.stdout, "")
+
+
+@pytest.fixture
+def detector():
+    detector = AccessibilityDetector()
+    # 测试 osascript 回退路径，即使安装了 pyobjc 也不走 AXUIElement
+    detector._ax = None
+    return detector
+
+
+def _stub(monkeypatch, stdout: str, returncode: int = 0) -> FakeOsascript:
+    fake = FakeOsascript(stdout, returncode)
+    monkeypatch.setattr(subprocess, "run", fake)
+    return fake
+
+
+class TestOsascriptParsing:
+    """osascript 输出解析测试"""
+    
+    def test_well_formed_output(self, detector, monkeypatch):
+        """测试窗口位置与菜单栏项目都完整"""
+        _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;File,40,0,35,24;\n")
+        
+        elements = detector.detect(b"")
+        
+        assert [e.label for e in elements] == [
+            "window_close", "window_minimize", "window_fullscreen", "menu_0", "menu_1",
+        ]
+        assert elements[0].rect == Rect(112, 62, 124, 74)
+        assert elements[3].text == "Apple"
+        assert elements[4].rect == Rect(40, 0, 75, 24)
+        assert elements[4].element_type == "menu_item"
+    
+    def test_malformed_menu_items_skipped(self, detector, monkeypatch):
+        """测试格式错误的菜单项被跳过，编号保持连续"""
+        _stub(
+            monkeypatch,
+            f"0,0{_SCRIPT_SEPARATOR}"
+            "bad;Edit,x,0,1,1;Window,1,2,3;View,-5,0,40,24;Help,1,2,3,4",
+        )
+        
+        menus = [e for e in detector.detect(b"") if e.element_type == "menu_item"]
+        
+        assert [(e.label, e.text) for e in menus] == [("menu_0", "View")]
+        assert menus[0].rect == Rect(-5, 0, 35, 24)
+    
+    def test_menu_title_with_comma(self, detector, monkeypatch):
+        """测试标题含逗号的菜单项保留完整标题"""
+        _stub(monkeypatch, f"{_SCRIPT_SEPARATOR}Apple,0,0,30,24;Foo, Bar,40,0,35,24;")
+        
+        menus = detector.detect(b"")
+        
+        assert [(e.label, e.text) for e in menus] == [("menu_0", "Apple"), ("menu_1", "Foo, Bar")]
+        assert menus[1].rect == Rect(40, 0, 75, 24)
+    
+    @pytest.mark.parametrize("win_line", ["", "abc,def", "100"])
+    def test_missing_window_half(self, detector, monkeypatch, win_line):
+        """测试没有前台窗口 (或位置无法解析) 时只返回菜单栏项目"""
+        _stub(monkeypatch, f"{win_line}{_SCRIPT_SEPARATOR}Apple,0,0,30,24;")
+        
+        elements = detector.detect(b"")
+        
+        assert [e.label for e in elements] == ["menu_0"]
+    
+    def test_osascript_failure(self, detector, monkeypatch):
+        """测试 osascript 返回非零时没有元素"""
+        _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;", returncode=1)
+        
+        assert detector.detect(b"") == []
+
+
+class TestDetectCache:
+    """检测结果缓存测试"""
+    
+    def test_cache_hit_within_ttl(self, detector, monkeypatch):
+        """测试 CACHE_TTL 内重复检测不再启动 osascript"""
+        fake = _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;")
+        
+        first = detector.detect(b"")
+        second = detector.detect(b"")
+        
+        assert fake.calls == 1
+        assert first == second
+    
+    def test_cache_expires(self, detector, monkeypatch):
+        """测试超过 CACHE_TTL 后重新查询"""
+        fake = _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;")
+        detector.CACHE_TTL = 0
+        
+        detector.detect(b"")
+        detector.detect(b"")
+        
+        assert fake.calls == 2
+    
+    def test_label_offset_does_not_mutate_cache(self, detector, monkeypatch):
+        """测试 label_offset 返回重新编号的副本，缓存中的描述性标签不变"""
+        fake = _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;")
+        
+        numbered = detector.detect(b"", label_offset=5)
+        plain = detector.detect(b"")
+        
+        assert fake.calls == 1
+        assert [e.label for e in numbered] == ["~5", "~6", "~7", "~8"]
+        assert [e.label for e in plain] == [
+            "window_close", "window_minimize", "window_fullscreen", "menu_0",
+        ]
+        assert [e.label for e in detector._cache] == [e.label for e in plain]
+    
+    def test_returned_copies_do_not_mutate_cache(self, detector, monkeypatch):
+        """测试修改返回的元素不影响缓存"""
+        _stub(monkeypatch, f"100,50{_SCRIPT_SEPARATOR}Apple,0,0,30,24;")
+        
+        detector.detect(b"")[0].label = "~1"
+        
+        assert detector.detect(b"")[0].label == "window_close"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -98,6 +98,51 @@ class TestCreateAsyncAgent:
         assert isinstance(agent, AsyncComputerAgent)
 
 
+class CountingController:
+    """记录截屏次数的控制器替身"""
+    
+    def __init__(self):
+        self.screenshot_calls = 0
+    
+    def screenshot(self):
+        self.screenshot_calls += 1
+        return b"\x89PNG-frame-%d" % self.screenshot_calls
+    
+    def get_screen_size(self):
+        return Size(1920, 1080)
+
+
+class TestCaptureScreenState:
+    """屏幕状态捕获测试"""
+    
+    def test_sync_capture_screenshots_once(self):
+        """测试同步 Agent 只截屏一次并填充 screenshot_bytes"""
+        import base64
+        from src.ai_interface import ComputerAgent
+        
+        controller = CountingController()
+        agent = ComputerAgent(SimpleClickBrain([]), controller=controller)
+        
+        state = agent.capture_screen_state()
+        
+        assert controller.screenshot_calls == 1
+        assert state.screenshot_bytes == b"\x89PNG-frame-1"
+        assert base64.b64decode(state.screenshot_base64) == state.screenshot_bytes
+    
+    def test_async_capture_screenshots_once(self):
+        """测试异步 Agent 只截屏一次并填充 screenshot_bytes"""
+        import base64
+        
+        controller = CountingController()
+        agent = AsyncComputerAgent(MockAsyncBrain(), controller=controller)
+        
+        state = asyncio.run(agent.capture_screen_state())
+        
+        assert controller.screenshot_calls == 1
+        assert state.screenshot_bytes == b"\x89PNG-frame-1"
+        assert base64.b64decode(state.screenshot_base64) == state.screenshot_bytes
+
+
 class MockAsyncBrain(AsyncAIBrain):
     """测试用的模拟异步 Brain"""
     
@@ -17,6 +17,7 @@ from src.core.types import (
     Point,
     Size,
     Rect,
+    RawScreenshot,
     MouseButton,
     Action,
     ActionType,
@@ -93,6 +94,59 @@ class TestRect:
         assert pct_r.bottom == 0.5
 
 
+class TestRawScreenshot:
+    """RawScreenshot (format="raw") 测试"""
+    
+    def test_encode_image_raw(self):
+        """测试 PIL 图像转换为 BGRA 原始像素"""
+        from PIL import Image
+        from src.platforms.windows import WindowsController
+        
+        img = Image.new("RGB", (3, 2), (10, 20, 30))
+        raw = WindowsController._encode_image(img, "raw")
+        
+        assert isinstance(raw, RawScreenshot)
+        assert (raw.width, raw.height) == (3, 2)
+        assert raw.pixel_format == "BGRA"
+        assert raw.stride == raw.width * 4
+        assert len(raw.data) == raw.stride * raw.height
+        assert raw.data[:4] == bytes([30, 20, 10, 255])
+    
+    def test_sck_raw_region_crop(self):
+        """测试截屏流帧按区域裁剪后的 stride 与数据长度"""
+        from src.platforms.macos import MacOSController
+        
+        width, height, stride = 4, 3, 20  # 每行带 4 字节填充
+        data = bytes(
+            (y * stride + i) % 256 for y in range(height) for i in range(stride)
+        )
+        
+        class Stream:
+            scale = 2.0
+            
+            def frame(self):
+                return data, width, height, stride
+        
+        full = MacOSController._sck_raw_screenshot(Stream(), None)
+        assert len(full.data) == full.stride * full.height
+        
+        # 逻辑坐标 (0.5, 0.5)-(1.5, 1.5) 对应像素 (1, 1)-(3, 3)
+        raw = MacOSController._sck_raw_screenshot(Stream(), Rect(0.5, 0.5, 1.5, 1.5))
+        assert (raw.width, raw.height) == (2, 2)
+        assert raw.stride == 8
+        assert len(raw.data) == raw.stride * raw.height
+        assert raw.data[:8] == data[stride + 4:stride + 12]
+        
+        # 部分超出帧的区域裁剪到帧内: 像素 (2, 2)-(4, 3)
+        raw = MacOSController._sck_raw_screenshot(Stream(), Rect(1, 1, 20, 20))
+        assert (raw.width, raw.height, raw.stride) == (2, 1, 8)
+        assert raw.data == data[2 * stride + 8:2 * stride + 16]
+        
+        # 与帧没有交集
+        with pytest.raises(ValueError):
+            MacOSController._sck_raw_screenshot(Stream(), Rect(10, 10, 20, 20))
+
+
 class TestScreenElement:
     """ScreenElement 类测试"""
     
@@ -210,6 +264,14 @@ class TestScreenState:
         assert point is not None
         assert point.x == 50  # 中心点
         assert point.y == 50
+    
+    def test_positional_fields(self):
+        """测试按位置构造时字段顺序不变"""
+        state = ScreenState("raw", "annotated")
+        
+        assert state.screenshot_base64 == "raw"
+        assert state.annotated_screenshot_base64 == "annotated"
+        assert state.screenshot_bytes is None
 
 
 class TestActionResult:
@@ -0,0 +1,159 @@
+"""
+调试查看器测试
+
+运行方式:
+    pytest tests/test_debug.py -v
+"""
+
+import io
+import os
+import sys
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from PIL import Image
+
+from src.core.types import Rect, ScreenElement
+from src.utils import debug
+from src.utils.debug import DebugFrame, DebugViewer
+
+
+def _png_bytes(width: int = 64, height: int = 48) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _frame(**overrides) -> DebugFrame:
+    data = {
+        "step": 1,
+        "timestamp": 0.0,
+        "screenshot_path": "step_001_raw.png",
+        "elements": [],
+        "action": None,
+        "result": None,
+        "duration": 0,
+    }
+    data.update(overrides)
+    return DebugFrame(**data)
+
+
+class TestDebugFrame:
+    """DebugFrame 测试"""
+    
+    def test_read_screenshot(self, tmp_path):
+        """测试从会话目录读取原始截图"""
+        png = _png_bytes()
+        (tmp_path / "step_001_raw.png").write_bytes(png)
+        
+        assert _frame().read_screenshot(str(tmp_path)) == png
+    
+    def test_read_screenshot_missing(self, tmp_path):
+        """测试截图缺失或未记录时返回 None"""
+        assert _frame().read_screenshot(str(tmp_path)) is None
+        assert _frame(screenshot_path="").read_screenshot(str(tmp_path)) is None
+    
+    def test_from_dict_drops_legacy_base64(self):
+        """测试旧版会话中内嵌的 base64 截图不再载入"""
+        data = _frame().to_dict()
+        del data["screenshot_path"]
+        data["screenshot_base64"] = "aGVsbG8="
+        
+        frame = DebugFrame.from_dict(data)
+        
+        assert frame.screenshot_path == ""
+        assert not hasattr(frame, "screenshot_base64")
+        assert "screenshot_base64" in data  # 不修改传入的字典
+    
+    def test_from_dict_roundtrip(self):
+        """测试新版帧数据往返"""
+        frame = _frame(step=3, screenshot_path="step_003_raw.png")
+        assert DebugFrame.from_dict(frame.to_dict()) == frame
+
+
+class TestDebugViewer:
+    """DebugViewer 测试"""
+    
+    def test_record_frame_writes_raw(self, tmp_path):
+        """测试 record_frame 原样写入 step_NNN_raw.png"""
+        viewer = DebugViewer(str(tmp_path))
+        session_id = viewer.start_session("test")
+        png = _png_bytes()
+        elements = [ScreenElement(label="~1", rect=Rect(1, 2, 20, 30))]
+        
+        viewer.record_frame(png, elements)
+        viewer.record_frame(png, elements)
+        viewer.flush()
+        
+        session_dir = tmp_path / session_id
+        frames = viewer._current_session.frames
+        assert [f.screenshot_path for f in frames] == [
+            "step_001_raw.png", "step_002_raw.png"
+        ]
+        assert (session_dir / "step_001_raw.png").read_bytes() == png
+        assert frames[1].read_screenshot(str(session_dir)) == png
+        viewer.close()
+    
+    def test_record_frame_without_session(self, tmp_path):
+        """测试未开始会话时不记录"""
+        viewer = DebugViewer(str(tmp_path))
+        viewer.record_frame(_png_bytes(), [])
+        viewer.flush()
+        
+        assert list(tmp_path.iterdir()) == []
+        # 未开始会话时不启动写盘线程
+        assert viewer._writer is None
+    
+    def test_end_session_waits_for_writer(self, tmp_path):
+        """测试 end_session 返回前后台线程已写完原始与标注截图"""
+        viewer = DebugViewer(str(tmp_path))
+        session_id = viewer.start_session("test")
+        elements = [ScreenElement(label="~1", rect=Rect(1, 2, 20, 30))]
+        
+        viewer.record_frame(_png_bytes(), elements)
+        assert viewer.end_session(True) == session_id
+        
+        session_dir = tmp_path / session_id
+        assert (session_dir / "step_001.png").is_file()
+        assert (session_dir / "step_001_raw.png").is_file()
+        assert (session_dir / "session.json").is_file()
+        # 会话结束后写盘线程退出
+        assert viewer._writer is None
+    
+    def test_close_stops_writer(self, tmp_path):
+        """测试 close 写完剩余帧后停止写盘线程"""
+        with DebugViewer(str(tmp_path)) as viewer:
+            session_id = viewer.start_session("test")
+            writer = viewer._writer
+            viewer.record_frame(_png_bytes(), [])
+        
+        assert not writer.is_alive()
+        assert viewer._writer is None
+        assert (tmp_path / session_id / "step_001.png").is_file()
+        
+        # close 之后仍可开始新会话
+        viewer.start_session("again")
+        assert viewer._writer.is_alive()
+        viewer.close()
+    
+    def test_write_failure_is_logged(self, tmp_path, monkeypatch):
+        """测试写盘失败通过日志记录而不中断后台线程"""
+        viewer = DebugViewer(str(tmp_path))
+        viewer.start_session("test")
+        errors = []
+        monkeypatch.setattr(debug.logger, "error", lambda msg, *a, **k: errors.append(msg))
+        
+        viewer.record_frame(b"not a png", [])
+        viewer.flush()
+        
+        assert len(errors) == 1
+        assert "step 1" in errors[0]
+        assert viewer._writer.is_alive()
+        viewer.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+鼠标平滑移动路径插值测试
+
+运行方式:
+    pytest tests/test_interp.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.platforms import _interp
+from src.platforms._interp import HAS_NUMBA, _interp_move_py, interp_move
+
+# (sx, sy, ex, ey, steps)，包含负方向与不能整除的位移
+CASES = [
+    (0, 0, 100, 50, 10),
+    (100, 200, 0, 0, 7),
+    (500, 300, 480, 333, 3),
+    (-10, 5, -3, -20, 4),
+    (10, 10, 10, 10, 5),
+    (0, 0, 1, -1, 1),
+]
+
+
+class TestInterpMove:
+    """interp_move 测试"""
+    
+    @pytest.mark.parametrize("case", CASES)
+    def test_python_path(self, case):
+        """测试纯 Python 实现: 不含起点、含终点，向下取整"""
+        sx, sy, ex, ey, steps = case
+        path = _interp_move_py(*case)
+        
+        assert len(path) == steps
+        assert tuple(path[-1]) == (ex, ey)
+        assert tuple(path[0]) == (sx + (ex - sx) // steps, sy + (ey - sy) // steps)
+    
+    def test_steps_at_least_one(self):
+        """测试 steps 小于 1 时按 1 处理"""
+        assert [tuple(p) for p in interp_move(0, 0, 5, -5, 0)] == [(5, -5)]
+    
+    def test_returns_python_ints(self):
+        """测试返回的坐标为 Python int，可直接传给 ctypes"""
+        path = interp_move(0, 0, -30, 40, 6)
+        assert all(type(v) is int for point in path for v in point)
+    
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba 未安装")
+    @pytest.mark.parametrize("case", CASES)
+    def test_jit_matches_python(self, case):
+        """测试 numba 编译版本与纯 Python 实现结果一致 (含负位移)"""
+        jit_path = _interp._interp_move_jit(*case).tolist()
+        assert [list(p) for p in _interp_move_py(*case)] == jit_path
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
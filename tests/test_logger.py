@@ -10,6 +10,7 @@ import logging
 import tempfile
 import os
 import sys
+from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -22,7 +23,10 @@ from src.utils.logger import (
     StructuredFormatter,
     ActionLogAdapter,
     log_context,
+    init_logging,
+    flush_logs,
 )
+from src.utils import logger as logger_module
 
 
 class TestColoredFormatter:
@@ -65,6 +69,26 @@ class TestColoredFormatter:
         assert "Error message" in result
 
 
+    def test_format_icons(self):
+        """测试级别图标，且不改写 record.levelname"""
+        formatter = ColoredFormatter(use_colors=False, use_icons=True)
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.ERROR,
+            pathname="",
+            lineno=0,
+            msg="Error message",
+            args=(),
+            exc_info=None
+        )
+
+        result = formatter.format(record)
+        assert "❌ ERROR   " in result
+        assert "Error message" in result
+        assert record.levelname == "ERROR"
+
+
 class TestJSONFormatter:
     """JSON 格式化器测试"""
     
@@ -116,6 +140,81 @@ class TestJSONFormatter:
         
         assert data.get("custom_field") == "custom_value"
 
+    def test_standard_attrs_not_duplicated(self):
+        """测试 LogRecord 自带属性不作为额外字段输出"""
+        import json
+
+        formatter = JSONFormatter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=0,
+            msg="Test %s",
+            args=("arg",),
+            exc_info=None
+        )
+        record._private = "hidden"
+
+        data = json.loads(formatter.format(record))
+
+        assert data["message"] == "Test arg"
+        for key in ("msg", "args", "levelno", "created", "_private"):
+            assert key not in data
+
+    def test_action_fields_order(self):
+        """测试 Action 日志字段按固定顺序输出"""
+        import json
+
+        formatter = JSONFormatter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=0,
+            msg="Test",
+            args=(),
+            exc_info=None
+        )
+        record.coordinate = (100, 200)
+        record.duration = 0.05
+        record.success = True
+        record.action_type = "click"
+        record.step = 3
+
+        data = json.loads(formatter.format(record))
+        keys = list(data)
+
+        assert keys[-5:] == ["step", "action_type", "success", "duration", "coordinate"]
+        assert data["coordinate"] == [100, 200]
+
+    def test_non_native_values(self):
+        """测试非 JSON 原生类型的字段"""
+        import json
+
+        formatter = JSONFormatter()
+
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname="",
+            lineno=0,
+            msg="Test",
+            args=(),
+            exc_info=None
+        )
+        record.big_number = 2 ** 70
+        record.path = Path("a/b")
+        record.mapping = {1: "one"}
+
+        data = json.loads(formatter.format(record))
+
+        assert data["big_number"] == 2 ** 70
+        assert data["path"] == str(Path("a/b"))
+        assert data["mapping"] == {"1": "one"}
+
 
 class TestActionLogAdapter:
     """Action 日志适配器测试"""
@@ -166,7 +265,16 @@ class TestGetLogger:
         logger = get_logger("test.module")
         
         assert isinstance(logger, logging.Logger)
-        assert logger.name == "test.module"
+        assert logger.name == "ccf.test.module"
+
+    def test_get_logger_propagates_to_root(self):
+        """测试子 logger 不挂载 Handler，传播到 ccf 根 logger"""
+        logger = get_logger("src.test.propagate")
+
+        assert logger.name == "ccf.test.propagate"
+        assert logger.handlers == []
+        assert logger.propagate is True
+        assert logger.parent is logging.getLogger("ccf")
     
     def test_get_logger_cached(self):
         """测试 Logger 缓存"""
@@ -212,6 +320,81 @@ class TestSetupLogger:
         assert len(console_handlers) >= 1
 
 
+class TestFileSplit:
+    """主日志与错误日志分流测试"""
+    
+    def test_error_only_in_error_log(self, tmp_path):
+        """测试 ERROR 只写入 ccf_error.log，INFO 只写入 ccf.log"""
+        logger = setup_logger(
+            "test.split",
+            level="DEBUG",
+            log_dir=str(tmp_path),
+            enable_file=True,
+            enable_json=True,
+            enable_console=False
+        )
+        
+        logger.info("split info message")
+        logger.error("split error message")
+        flush_logs()
+        
+        main_log = (tmp_path / "ccf.log").read_text(encoding="utf-8")
+        error_log = (tmp_path / "ccf_error.log").read_text(encoding="utf-8")
+        
+        assert "split info message" in main_log
+        assert "split error message" not in main_log
+        assert "split error message" in error_log
+        assert "split info message" not in error_log
+    
+    def test_flush_batched_records(self, tmp_path):
+        """测试不足一批的低级别记录在 flush_logs 后落盘"""
+        logger = setup_logger(
+            "test.batch",
+            level="DEBUG",
+            log_dir=str(tmp_path),
+            enable_file=True,
+            enable_console=False
+        )
+        
+        for i in range(3):
+            logger.debug(f"batched record {i}")
+        flush_logs()
+        
+        lines = (tmp_path / "ccf.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+        assert all("batched record" in line for line in lines)
+
+
+class TestInitLogging:
+    """全局日志初始化测试"""
+    
+    def test_init_after_child_logger(self, tmp_path, monkeypatch):
+        """测试子 logger 已自动配置根 logger 后，init_logging 的参数仍然生效"""
+        monkeypatch.setattr(logger_module, "_initialized", False)
+        root = logging.getLogger("ccf")
+        log_dir = tmp_path / "logs"
+        
+        get_logger("src.x")
+        try:
+            result = init_logging(level="DEBUG", log_dir=str(log_dir))
+            
+            assert result is root
+            assert root.level == logging.DEBUG
+            assert log_dir.is_dir()
+            # 旧的文件 Handler 被替换，不会叠加
+            file_handlers = [
+                h for h in root.handlers
+                if isinstance(h, logger_module._RecordQueueHandler)
+            ]
+            assert file_handlers == [
+                logger_module._file_handlers[(log_dir.resolve(), True)]
+            ]
+        finally:
+            # 恢复默认配置，避免影响其他测试
+            logger_module._initialized = False
+            init_logging()
+
+
 class TestLogContext:
     """日志上下文测试"""
     